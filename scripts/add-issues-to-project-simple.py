@@ -4,11 +4,13 @@ Script simplificado para agregar issues al proyecto
 Usa la API REST de GitHub Projects
 """
 
-import subprocess
 import sys
-import json
 import time
 
+from gh_client import gh_json, iter_issues
+from planning import parse_issue_metadata
+from section_doc import Section, update_document
+
 # Colores
 GREEN = '\033[0;32m'
 YELLOW = '\033[1;33m'
@@ -19,18 +21,13 @@ NC = '\033[0m'
 PROJECT_NUMBER = 2
 OWNER = "alex9abril"
 REPO = "alex9abril/localia-admin"
+DOC_PATH = "docs/AGREGAR-ISSUES-PROYECTO.md"
 
 def get_project_info():
     """Obtener información del proyecto usando la API REST"""
     try:
         # Obtener proyectos del usuario
-        result = subprocess.run(
-            ['gh', 'api', f'users/{OWNER}/projects'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        projects = json.loads(result.stdout)
+        projects = gh_json(['api', f'users/{OWNER}/projects'])
         
         # Buscar el proyecto número 2
         for project in projects:
@@ -43,19 +40,68 @@ def get_project_info():
         return None
 
 def get_all_issues():
-    """Obtener todas las issues"""
+    """Obtener todas las issues con su semana (el body no se conserva)"""
     try:
-        result = subprocess.run(
-            ['gh', 'issue', 'list', '--repo', REPO, '--state', 'all', '--json', 'number,title,body'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return json.loads(result.stdout)
+        issues = []
+        for issue in iter_issues(REPO, 'number,title,body'):
+            issue['week'] = parse_issue_metadata(issue.pop('body'))['week']
+            issues.append(issue)
+        return issues
     except Exception as e:
         print(f"{RED}❌ Error: {e}{NC}")
         return []
 
+def build_instructions(issues_by_week, weeks):
+    """Partes del documento de instrucciones: texto fijo + secciones por semana
+    
+    Cada semana aporta dos secciones (listado y "Método Rápido") generadas en
+    la misma pasada; su hash depende sólo de las issues de esa semana.
+    """
+    header = f"""# 📋 Instrucciones para Agregar Issues al Proyecto
+
+## 🔗 Enlace al Proyecto
+https://github.com/users/{OWNER}/projects/{PROJECT_NUMBER}
+
+## 📝 Pasos para Agregar Issues
+
+1. Ve a tu proyecto: https://github.com/users/{OWNER}/projects/{PROJECT_NUMBER}
+2. Haz clic en "Add item" (o presiona `Ctrl+Space`)
+3. Busca cada issue por número o título
+4. Agrégala al proyecto
+
+## 📊 Issues por Semana
+
+"""
+    body = [header]
+    quick = ["""
+## 🚀 Método Rápido
+
+Puedes copiar y pegar estos números de issues en la búsqueda del proyecto:
+
+"""]
+    
+    for week in weeks:
+        week_issues = [(issue['number'], issue['title']) for issue in issues_by_week[week]]
+        
+        def render_week(week=week, week_issues=week_issues):
+            lines = [f"### Semana {week} ({len(week_issues)} issues)\n\n"]
+            lines += [
+                f"- [#{number}](https://github.com/{REPO}/issues/{number}) - {title}\n"
+                for number, title in week_issues
+            ]
+            lines.append("\n")
+            return ''.join(lines)
+        
+        def render_quick(week=week, week_issues=week_issues):
+            numbers = ', '.join(f"#{number}" for number, _ in week_issues)
+            return f"**Semana {week}:**\n{numbers}\n\n"
+        
+        body.append(Section(f"semana-{week}", week_issues, render_week))
+        # Los números no dependen de los títulos: renombrar no toca esta sección
+        quick.append(Section(f"rapido-semana-{week}", [n for n, _ in week_issues], render_quick))
+    
+    return body + quick
+
 def main():
     print(f"{GREEN}🚀 Agregando issues al proyecto de GitHub{NC}\n")
     print(f"{YELLOW}⚠️  Nota: GitHub Projects requiere agregar issues manualmente desde la interfaz web{NC}\n")
@@ -65,26 +111,18 @@ def main():
     issues = get_all_issues()
     print(f"{GREEN}✅ Encontradas {len(issues)} issues{NC}\n")
     
-    # Organizar por semana
-    issues_by_week = {1: [], 2: [], 3: [], 4: []}
+    # Organizar por semana (cualquier número de semanas)
+    issues_by_week = {}
     
     for issue in issues:
-        body = issue.get('body', '')
-        if '## Semana' in body:
-            lines = body.split('\n')
-            for i, line in enumerate(lines):
-                if '## Semana' in line and i + 1 < len(lines):
-                    try:
-                        week = int(lines[i + 1].strip())
-                        if week in issues_by_week:
-                            issues_by_week[week].append(issue)
-                            break
-                    except ValueError:
-                        pass
+        week = issue['week']
+        if week is not None:
+            issues_by_week.setdefault(week, []).append(issue)
+    weeks = sorted(issues_by_week)
     
     # Generar reporte
     print(f"{BLUE}📊 Issues organizadas por semana:{NC}\n")
-    for week in [1, 2, 3, 4]:
+    for week in weeks:
         print(f"{YELLOW}📅 Semana {week}: {len(issues_by_week[week])} issues{NC}")
         for issue in issues_by_week[week][:5]:  # Mostrar primeras 5
             print(f"   - #{issue['number']}: {issue['title'][:50]}")
@@ -93,50 +131,13 @@ def main():
         print()
     
     # Generar archivo con instrucciones
-    instructions = f"""# 📋 Instrucciones para Agregar Issues al Proyecto
-
-## 🔗 Enlace al Proyecto
-https://github.com/users/{OWNER}/projects/{PROJECT_NUMBER}
-
-## 📝 Pasos para Agregar Issues
-
-1. Ve a tu proyecto: https://github.com/users/{OWNER}/projects/{PROJECT_NUMBER}
-2. Haz clic en "Add item" (o presiona `Ctrl+Space`)
-3. Busca cada issue por número o título
-4. Agrégala al proyecto
-
-## 📊 Issues por Semana
-
-"""
-    
-    for week in [1, 2, 3, 4]:
-        instructions += f"### Semana {week} ({len(issues_by_week[week])} issues)\n\n"
-        for issue in issues_by_week[week]:
-            instructions += f"- [#{issue['number']}](https://github.com/{REPO}/issues/{issue['number']}) - {issue['title']}\n"
-        instructions += "\n"
-    
-    instructions += f"""
-## 🚀 Método Rápido
-
-Puedes copiar y pegar estos números de issues en la búsqueda del proyecto:
-
-**Semana 1:**
-{', '.join([f"#{i['number']}" for i in issues_by_week[1]])}
-
-**Semana 2:**
-{', '.join([f"#{i['number']}" for i in issues_by_week[2]])}
-
-**Semana 3:**
-{', '.join([f"#{i['number']}" for i in issues_by_week[3]])}
-
-**Semana 4:**
-{', '.join([f"#{i['number']}" for i in issues_by_week[4]])}
-"""
-    
-    with open("docs/AGREGAR-ISSUES-PROYECTO.md", 'w', encoding='utf-8') as f:
-        f.write(instructions)
+    rendered, reused, written = update_document(DOC_PATH, build_instructions(issues_by_week, weeks))
     
-    print(f"{GREEN}✅ Archivo generado: docs/AGREGAR-ISSUES-PROYECTO.md{NC}")
+    if written:
+        print(f"{GREEN}✅ Archivo generado: {DOC_PATH} "
+              f"({rendered} secciones regeneradas, {reused} sin cambios){NC}")
+    else:
+        print(f"{GREEN}✅ {DOC_PATH} ya estaba al día{NC}")
     print(f"\n{BLUE}💡 Siguiente paso:{NC}")
     print(f"   1. Abre: docs/AGREGAR-ISSUES-PROYECTO.md")
     print(f"   2. Sigue las instrucciones para agregar las issues manualmente")
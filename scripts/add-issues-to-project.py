@@ -4,11 +4,22 @@ Script para agregar issues al proyecto de GitHub
 Requiere: GitHub CLI (gh) instalado y autenticado
 """
 
-import subprocess
 import sys
-import json
 import time
 
+from gh_client import (
+    CircuitOpenError,
+    GhError,
+    get_issue_node_ids,
+    get_project,
+    get_project_issue_ids,
+    is_duplicate_error,
+    is_stale_id_error,
+    iter_issues,
+    run_gh,
+)
+from planning import WriteQueue, parse_issue_metadata
+
 # Colores
 GREEN = '\033[0;32m'
 YELLOW = '\033[1;33m'
@@ -20,19 +31,11 @@ PROJECT_NUMBER = 2  # Número del proyecto
 OWNER = "alex9abril"
 REPO = "alex9abril/localia-admin"
 
-def get_project_id():
-    """Obtener el ID del proyecto"""
+def get_project_id(refresh=False):
+    """Obtener el ID del proyecto (de la caché de IDs si ya se buscó)"""
     try:
-        # Obtener información del proyecto
-        result = subprocess.run(
-            ['gh', 'api', 'graphql', '-f', f'query={{user(login:"{OWNER}"){{projectV2(number:{PROJECT_NUMBER}){{id}}}}}}'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        data = json.loads(result.stdout)
-        project_id = data['data']['user']['projectV2']['id']
-        return project_id
+        project = get_project(OWNER, PROJECT_NUMBER, refresh=refresh)
+        return project['id'] if project else None
     except Exception as e:
         print(f"{RED}❌ Error obteniendo ID del proyecto: {e}{NC}")
         return None
@@ -40,33 +43,16 @@ def get_project_id():
 def get_issues_by_week():
     """Obtener todas las issues y organizarlas por semana"""
     try:
-        # Obtener todas las issues abiertas
-        result = subprocess.run(
-            ['gh', 'issue', 'list', '--repo', REPO, '--state', 'all', '--json', 'number,title,body'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        issues = json.loads(result.stdout)
-        
         # Organizar por semana basándose en el body
         issues_by_week = {1: [], 2: [], 3: [], 4: []}
         
-        for issue in issues:
-            body = issue.get('body', '')
-            # Buscar "## Semana" en el body
-            if '## Semana' in body:
-                lines = body.split('\n')
-                for i, line in enumerate(lines):
-                    if '## Semana' in line and i + 1 < len(lines):
-                        week_str = lines[i + 1].strip()
-                        try:
-                            week = int(week_str)
-                            if week in issues_by_week:
-                                issues_by_week[week].append(issue)
-                                break
-                        except ValueError:
-                            pass
+        # Las issues se decodifican una por una; el body se descarta en cuanto
+        # se leen sus metadatos para no retenerlo en memoria
+        for issue in iter_issues(REPO, 'id,number,title,body'):
+            issue['meta'] = parse_issue_metadata(issue.pop('body'))
+            week = issue['meta']['week']
+            if week in issues_by_week:
+                issues_by_week[week].append(issue)
         
         return issues_by_week
     except Exception as e:
@@ -89,45 +75,33 @@ def add_issue_to_project(project_id, issue_id):
         }}
         """
         
-        result = subprocess.run(
-            ['gh', 'api', 'graphql', '-f', f'query={mutation}'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        # addProjectV2ItemById es idempotente: se puede reintentar sin duplicar
+        run_gh(['api', 'graphql', '-f', f'query={mutation}'])
         return True, None
-    except subprocess.CalledProcessError as e:
+    except CircuitOpenError:
+        raise
+    except GhError as e:
         # Si la issue ya está en el proyecto, ignorar el error
-        if "already exists" in e.stderr.lower() or "already added" in e.stderr.lower():
+        if is_duplicate_error(e):
             return True, "ya existe"
         return False, e.stderr
     except Exception as e:
         return False, str(e)
 
 def get_issue_node_id(issue_number):
-    """Obtener el node ID de una issue"""
+    """Obtener el node ID de una issue (de la caché de IDs si ya se buscó)"""
     try:
-        query = f"""
-        {{
-            repository(owner: "{OWNER}", name: "localia-admin") {{
-                issue(number: {issue_number}) {{
-                    id
-                }}
-            }}
-        }}
-        """
-        
-        result = subprocess.run(
-            ['gh', 'api', 'graphql', '-f', f'query={query}'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        data = json.loads(result.stdout)
-        return data['data']['repository']['issue']['id']
+        return get_issue_node_ids(REPO, [issue_number]).get(issue_number)
+    except CircuitOpenError:
+        raise
     except Exception as e:
         return None
 
+def project_not_found():
+    """Avisar que no se encontró el proyecto y salir"""
+    print(f"{RED}❌ No se pudo obtener el ID del proyecto{NC}")
+    sys.exit(1)
+
 def main():
     print(f"{GREEN}🚀 Agregando issues al proyecto de GitHub{NC}\n")
     
@@ -135,8 +109,7 @@ def main():
     print(f"{BLUE}📋 Obteniendo información del proyecto...{NC}")
     project_id = get_project_id()
     if not project_id:
-        print(f"{RED}❌ No se pudo obtener el ID del proyecto{NC}")
-        sys.exit(1)
+        project_not_found()
     
     print(f"{GREEN}✅ Proyecto encontrado: {project_id}{NC}\n")
     
@@ -150,22 +123,53 @@ def main():
     total_issues = sum(len(issues) for issues in issues_by_week.values())
     print(f"{GREEN}✅ Encontradas {total_issues} issues organizadas por semana{NC}\n")
     
+    # Leer de una vez qué issues ya están en el proyecto
+    print(f"{BLUE}📋 Obteniendo items del proyecto...{NC}")
+    try:
+        try:
+            existing = get_project_issue_ids(project_id)
+        except GhError as e:
+            if not is_stale_id_error(e):
+                raise
+            # El ID guardado ya no existe (proyecto recreado): buscarlo de nuevo
+            project_id = get_project_id(refresh=True)
+            if not project_id:
+                project_not_found()
+            existing = get_project_issue_ids(project_id)
+    except GhError as e:
+        print(f"{RED}❌ Error obteniendo items del proyecto: {e}{NC}")
+        sys.exit(1)
+    # El proyecto puede tener issues de otros repositorios: sólo cuentan las de éste
+    present = sum(1 for issues in issues_by_week.values() for issue in issues if issue['id'] in existing)
+    print(f"{GREEN}✅ {present} issues ya están en el proyecto{NC}\n")
+    
     # Agregar issues al proyecto
     added = 0
     skipped = 0
     errors = 0
     
+    queue = WriteQueue()
     for week, issues in issues_by_week.items():
-        print(f"{YELLOW}📅 Semana {week}: {len(issues)} issues{NC}")
+        pending = [issue for issue in issues if issue['id'] not in existing]
+        skipped += len(issues) - len(pending)
+        print(f"{YELLOW}📅 Semana {week}: {len(issues)} issues ({len(issues) - len(pending)} ya en el proyecto){NC}")
+        for issue in pending:
+            queue.push(issue, issue['meta'])
+    
+    # Lo más urgente primero (prioridad, semana), alternando desarrolladores: si
+    # la corrida se corta por rate limits, el tablero ya tiene lo importante
+    print(f"\n{BLUE}📝 Agregando {len(queue)} issues por prioridad...{NC}")
+    while queue:
+        issue = queue.pop()
+        issue_number = issue['number']
+        issue_title = issue['title']
+        meta = issue['meta']
         
-        for issue in issues:
-            issue_number = issue['number']
-            issue_title = issue['title']
-            
-            print(f"   📝 Agregando: #{issue_number} - {issue_title[:50]}...")
-            
+        print(f"   📝 [S{meta['week']} {meta['priority'] or '-'}] Agregando: #{issue_number} - {issue_title[:50]}...")
+        
+        try:
             # Obtener node ID de la issue
-            issue_node_id = get_issue_node_id(issue_number)
+            issue_node_id = issue.get('id') or get_issue_node_id(issue_number)
             if not issue_node_id:
                 print(f"   {RED}❌ No se pudo obtener node ID{NC}")
                 errors += 1
@@ -173,22 +177,27 @@ def main():
             
             # Agregar al proyecto
             success, message = add_issue_to_project(project_id, issue_node_id)
-            
-            if success:
-                if message == "ya existe":
-                    print(f"   {YELLOW}⚠️  Ya existe en el proyecto{NC}")
-                    skipped += 1
-                else:
-                    print(f"   {GREEN}✅ Agregada{NC}")
-                    added += 1
+        except CircuitOpenError as e:
+            print(f"   {RED}❌ {e}. Deteniendo; vuelve a ejecutar más tarde.{NC}")
+            print(f"   {YELLOW}⏸️  Quedan {len(queue)} issues de menor prioridad sin agregar{NC}")
+            errors += 1
+            break
+        
+        if success:
+            if message == "ya existe":
+                print(f"   {YELLOW}⚠️  Ya existe en el proyecto{NC}")
+                skipped += 1
             else:
-                print(f"   {RED}❌ Error: {message}{NC}")
-                errors += 1
-            
-            # Pausa para no sobrecargar la API
-            time.sleep(0.5)
+                print(f"   {GREEN}✅ Agregada{NC}")
+                added += 1
+        else:
+            print(f"   {RED}❌ Error: {message}{NC}")
+            errors += 1
         
-        print()
+        # Pausa para no sobrecargar la API
+        time.sleep(0.5)
+    
+    print()
     
     # Resumen
     print(f"{GREEN}✨ Proceso completado{NC}")
@@ -5,12 +5,21 @@ Requiere: GitHub CLI (gh) instalado y autenticado
 """
 
 import csv
-import subprocess
 import sys
-import json
 import time
 from pathlib import Path
 
+from gh_client import (
+    CircuitOpenError,
+    GhError,
+    get_issue_node_ids,
+    get_label_ids,
+    is_stale_id_error,
+    iter_issues,
+    run_gh,
+)
+from planning import WriteQueue, parse_csv_metadata
+
 # Colores
 GREEN = '\033[0;32m'
 YELLOW = '\033[1;33m'
@@ -23,39 +32,50 @@ REPO = "alex9abril/localia-admin"
 def get_all_issues():
     """Obtener todas las issues del repositorio"""
     try:
-        result = subprocess.run(
-            ['gh', 'issue', 'list', '--repo', REPO, '--state', 'all', '--json', 'number,title'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return json.loads(result.stdout)
+        # 'id' es el node ID que usa la mutación de labels
+        return list(iter_issues(REPO, 'id,number,title'))
     except Exception as e:
         print(f"{RED}❌ Error obteniendo issues: {e}{NC}")
         return []
 
-def add_labels_to_issue(issue_number, labels):
-    """Agregar labels a una issue"""
+def add_labels_to_issue(issue, labels):
+    """Agregar labels a una issue con una sola mutación
+    
+    Los IDs de los labels salen de la caché de IDs; los labels que no existen
+    se omiten. Si GitHub rechaza un ID guardado, se vuelven a buscar y se
+    reintenta una vez. Agregar un label que ya tiene es un no-op.
+    """
     if not labels or not labels.strip():
         return True, "sin labels"
     
     label_list = [l.strip() for l in labels.split(',') if l.strip()]
     
-    for label in label_list:
+    def apply(refresh):
+        label_ids = get_label_ids(REPO, label_list, refresh=refresh)
+        if not label_ids:
+            return False
+        node_id = issue['id']
+        if refresh:
+            node_id = get_issue_node_ids(REPO, [issue['number']], refresh=True).get(issue['number'], node_id)
+        ids = ', '.join(f'"{label_id}"' for label_id in label_ids.values())
+        mutation = (f'mutation {{ addLabelsToLabelable(input: {{labelableId: "{node_id}", labelIds: [{ids}]}}) '
+                    f'{{ clientMutationId }} }}')
+        run_gh(['api', 'graphql', '-f', f'query={mutation}'])
+        return True
+    
+    try:
         try:
-            subprocess.run(
-                ['gh', 'issue', 'edit', str(issue_number), '--add-label', label, '--repo', REPO],
-                capture_output=True,
-                check=True
-            )
-        except subprocess.CalledProcessError as e:
-            # Si el label no existe, continuar
-            stderr_str = e.stderr.decode('utf-8') if isinstance(e.stderr, bytes) else str(e.stderr)
-            if "label" in stderr_str.lower() and "not found" in stderr_str.lower():
-                continue
-            return False, stderr_str
+            applied = apply(refresh=False)
+        except GhError as e:
+            if not is_stale_id_error(e):
+                raise
+            applied = apply(refresh=True)
+    except CircuitOpenError:
+        raise
+    except GhError as e:
+        return False, e.stderr
     
-    return True, None
+    return (True, None) if applied else (True, "sin labels")
 
 def main():
     print(f"{GREEN}🚀 Agregando labels a las issues{NC}\n")
@@ -71,7 +91,7 @@ def main():
     print(f"{GREEN}✅ Encontradas {len(all_issues)} issues{NC}\n")
     
     # Crear diccionario de issues por título
-    issues_by_title = {issue['title']: issue['number'] for issue in all_issues}
+    issues_by_title = {issue['title']: issue for issue in all_issues}
     
     # Leer CSV y agregar labels
     print(f"{BLUE}📋 Leyendo CSV y agregando labels...{NC}\n")
@@ -80,33 +100,40 @@ def main():
     not_found = 0
     errors = 0
     
+    # Lo más urgente primero (prioridad, semana), alternando desarrolladores
     with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+        queue = WriteQueue((row, parse_csv_metadata(row)) for row in csv.DictReader(f))
+    
+    while queue:
+        row = queue.pop()
+        title = row['Title'].strip()
+        labels = row['Labels'].strip()
         
-        for row in reader:
-            title = row['Title'].strip()
-            labels = row['Labels'].strip()
+        if title in issues_by_title:
+            issue = issues_by_title[title]
+            print(f"{YELLOW}📝 Actualizando #{issue['number']}: {title[:50]}...{NC}")
+            
+            try:
+                success, message = add_labels_to_issue(issue, labels)
+            except CircuitOpenError as e:
+                print(f"{RED}❌ {e}. Deteniendo; vuelve a ejecutar más tarde.{NC}")
+                errors += 1
+                break
             
-            if title in issues_by_title:
-                issue_number = issues_by_title[title]
-                print(f"{YELLOW}📝 Actualizando #{issue_number}: {title[:50]}...{NC}")
-                
-                success, message = add_labels_to_issue(issue_number, labels)
-                
-                if success:
-                    if message == "sin labels":
-                        print(f"   {YELLOW}⚠️  Sin labels para agregar{NC}")
-                    else:
-                        print(f"   {GREEN}✅ Labels agregados: {labels}{NC}")
-                    updated += 1
+            if success:
+                if message == "sin labels":
+                    print(f"   {YELLOW}⚠️  Sin labels para agregar{NC}")
                 else:
-                    print(f"   {RED}❌ Error: {message}{NC}")
-                    errors += 1
+                    print(f"   {GREEN}✅ Labels agregados: {labels}{NC}")
+                updated += 1
             else:
-                print(f"{YELLOW}⚠️  Issue no encontrada: {title[:50]}...{NC}")
-                not_found += 1
-            
-            time.sleep(0.2)
+                print(f"   {RED}❌ Error: {message}{NC}")
+                errors += 1
+        else:
+            print(f"{YELLOW}⚠️  Issue no encontrada: {title[:50]}...{NC}")
+            not_found += 1
+        
+        time.sleep(0.2)
     
     # Resumen
     print(f"\n{GREEN}✨ Proceso completado{NC}")
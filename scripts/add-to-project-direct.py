@@ -3,11 +3,22 @@
 Script para agregar issues directamente al proyecto usando GraphQL API
 """
 
-import subprocess
 import sys
-import json
 import time
 
+from gh_client import (
+    CircuitOpenError,
+    GhError,
+    get_issue_node_ids,
+    get_project,
+    get_project_issue_ids,
+    is_duplicate_error,
+    is_stale_id_error,
+    iter_issues,
+    run_gh,
+)
+from planning import WriteQueue, parse_issue_metadata
+
 # Colores
 GREEN = '\033[0;32m'
 YELLOW = '\033[1;33m'
@@ -20,64 +31,27 @@ OWNER = "alex9abril"
 REPO_NAME = "localia-admin"
 REPO = f"{OWNER}/{REPO_NAME}"
 
-def get_project_id():
-    """Obtener el ID del proyecto usando GraphQL"""
-    query = f"""
-    {{
-      user(login: "{OWNER}") {{
-        projectV2(number: {PROJECT_NUMBER}) {{
-          id
-          title
-        }}
-      }}
-    }}
-    """
-    
+def get_project_id(refresh=False):
+    """Obtener el ID y título del proyecto (de la caché de IDs si ya se buscó)"""
     try:
-        result = subprocess.run(
-            ['gh', 'api', 'graphql', '-f', f'query={query}'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        data = json.loads(result.stdout)
-        project = data.get('data', {}).get('user', {}).get('projectV2')
+        project = get_project(OWNER, PROJECT_NUMBER, refresh=refresh)
         if project:
             return project.get('id'), project.get('title')
         return None, None
+    except CircuitOpenError:
+        raise
     except Exception as e:
         print(f"{RED}❌ Error obteniendo proyecto: {e}{NC}")
-        print(f"{YELLOW}   Output: {result.stdout if 'result' in locals() else 'N/A'}{NC}")
-        print(f"{YELLOW}   Error: {result.stderr if 'result' in locals() else 'N/A'}{NC}")
         return None, None
 
 def get_issue_node_id(issue_number):
-    """Obtener el node ID de una issue"""
-    query = f"""
-    {{
-      repository(owner: "{OWNER}", name: "{REPO_NAME}") {{
-        issue(number: {issue_number}) {{
-          id
-          title
-        }}
-      }}
-    }}
-    """
-    
+    """Obtener el node ID de una issue (de la caché de IDs si ya se buscó)"""
     try:
-        result = subprocess.run(
-            ['gh', 'api', 'graphql', '-f', f'query={query}'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        data = json.loads(result.stdout)
-        issue = data.get('data', {}).get('repository', {}).get('issue')
-        if issue:
-            return issue.get('id'), issue.get('title')
-        return None, None
+        return get_issue_node_ids(REPO, [issue_number]).get(issue_number)
+    except CircuitOpenError:
+        raise
     except Exception as e:
-        return None, None
+        return None
 
 def add_issue_to_project(project_id, issue_node_id):
     """Agregar issue al proyecto"""
@@ -95,36 +69,41 @@ def add_issue_to_project(project_id, issue_node_id):
     """
     
     try:
-        result = subprocess.run(
-            ['gh', 'api', 'graphql', '-f', f'query={mutation}'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        # addProjectV2ItemById es idempotente: se puede reintentar sin duplicar
+        run_gh(['api', 'graphql', '-f', f'query={mutation}'])
         return True, None
-    except subprocess.CalledProcessError as e:
-        stderr = e.stderr if hasattr(e, 'stderr') else str(e)
+    except CircuitOpenError:
+        raise
+    except GhError as e:
         # Si ya existe, no es un error
-        if "already" in stderr.lower() or "duplicate" in stderr.lower():
+        if is_duplicate_error(e):
             return True, "ya existe"
-        return False, stderr
+        return False, e.stderr
     except Exception as e:
         return False, str(e)
 
 def get_all_issues():
-    """Obtener todas las issues"""
+    """Obtener todas las issues con sus metadatos (el body no se conserva)"""
     try:
-        result = subprocess.run(
-            ['gh', 'issue', 'list', '--repo', REPO, '--state', 'all', '--json', 'number,title,body'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return json.loads(result.stdout)
+        # 'id' es el node ID: evita una consulta extra por issue
+        issues = []
+        for issue in iter_issues(REPO, 'id,number,title,body'):
+            issue['meta'] = parse_issue_metadata(issue.pop('body'))
+            issues.append(issue)
+        return issues
     except Exception as e:
         print(f"{RED}❌ Error: {e}{NC}")
         return []
 
+def project_not_found():
+    """Explicar por qué no se encontró el proyecto y salir"""
+    print(f"{RED}❌ No se pudo obtener el ID del proyecto{NC}")
+    print(f"{YELLOW}💡 Verifica que:{NC}")
+    print(f"   1. El proyecto existe: https://github.com/users/{OWNER}/projects/{PROJECT_NUMBER}")
+    print(f"   2. Tienes permisos para acceder al proyecto")
+    print(f"   3. El proyecto es de tipo 'Project (beta)'")
+    sys.exit(1)
+
 def main():
     print(f"{GREEN}🚀 Agregando issues al proyecto de GitHub{NC}\n")
     
@@ -133,12 +112,7 @@ def main():
     project_id, project_title = get_project_id()
     
     if not project_id:
-        print(f"{RED}❌ No se pudo obtener el ID del proyecto{NC}")
-        print(f"{YELLOW}💡 Verifica que:{NC}")
-        print(f"   1. El proyecto existe: https://github.com/users/{OWNER}/projects/{PROJECT_NUMBER}")
-        print(f"   2. Tienes permisos para acceder al proyecto")
-        print(f"   3. El proyecto es de tipo 'Project (beta)'")
-        sys.exit(1)
+        project_not_found()
     
     print(f"{GREEN}✅ Proyecto encontrado: {project_title} (ID: {project_id[:20]}...){NC}\n")
     
@@ -151,28 +125,60 @@ def main():
         print(f"{YELLOW}⚠️  No hay issues para agregar{NC}")
         sys.exit(0)
     
-    # Agregar issues al proyecto
-    print(f"{BLUE}📝 Agregando issues al proyecto...{NC}\n")
+    # Leer de una vez qué issues ya están en el proyecto
+    print(f"{BLUE}📋 Obteniendo items del proyecto...{NC}")
+    try:
+        try:
+            existing = get_project_issue_ids(project_id)
+        except GhError as e:
+            if not is_stale_id_error(e):
+                raise
+            # El ID guardado ya no existe (proyecto recreado): buscarlo de nuevo
+            project_id, project_title = get_project_id(refresh=True)
+            if not project_id:
+                project_not_found()
+            existing = get_project_issue_ids(project_id)
+    except GhError as e:
+        print(f"{RED}❌ Error obteniendo items del proyecto: {e}{NC}")
+        sys.exit(1)
+    skipped = sum(1 for issue in issues if issue['id'] in existing)
+    pending = [issue for issue in issues if issue['id'] not in existing]
+    print(f"{GREEN}✅ {skipped} ya están en el proyecto, {len(pending)} por agregar{NC}\n")
+    
+    if not pending:
+        print(f"{GREEN}✨ El proyecto ya tiene todas las issues{NC}")
+        sys.exit(0)
+    
+    # Agregar issues al proyecto: lo más urgente primero (prioridad, semana),
+    # alternando desarrolladores, por si la corrida se corta a la mitad
+    print(f"{BLUE}📝 Agregando issues al proyecto por prioridad...{NC}\n")
     
     added = 0
-    skipped = 0
     errors = 0
     
-    for i, issue in enumerate(issues, 1):
+    queue = WriteQueue((issue, issue['meta']) for issue in pending)
+    for i in range(1, len(pending) + 1):
+        issue = queue.pop()
         issue_number = issue['number']
         issue_title = issue['title']
         
-        print(f"[{i}/{len(issues)}] 📝 #{issue_number}: {issue_title[:50]}...", end=" ")
+        print(f"[{i}/{len(pending)}] 📝 #{issue_number}: {issue_title[:50]}...", end=" ")
         
-        # Obtener node ID de la issue
-        issue_node_id, _ = get_issue_node_id(issue_number)
-        if not issue_node_id:
-            print(f"{RED}❌ No se pudo obtener node ID{NC}")
+        try:
+            # Obtener node ID de la issue
+            issue_node_id = issue.get('id') or get_issue_node_id(issue_number)
+            if not issue_node_id:
+                print(f"{RED}❌ No se pudo obtener node ID{NC}")
+                errors += 1
+                continue
+            
+            # Agregar al proyecto
+            success, message = add_issue_to_project(project_id, issue_node_id)
+        except CircuitOpenError as e:
+            print(f"{RED}❌ {e}. Deteniendo; vuelve a ejecutar más tarde.{NC}")
+            print(f"{YELLOW}⏸️  Quedan {len(queue)} issues de menor prioridad sin agregar{NC}")
             errors += 1
-            continue
-        
-        # Agregar al proyecto
-        success, message = add_issue_to_project(project_id, issue_node_id)
+            break
         
         if success:
             if message == "ya existe":
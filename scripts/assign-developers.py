@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Asignación automática de desarrolladores por capacidad
+Lee las horas estimadas de cada tarea y la capacidad semanal de cada
+desarrollador, respeta las habilidades que exigen los labels
+(backend/mobile/web) y reparte la carga con bin packing (greedy + búsqueda
+local). El resultado se escribe en la columna Developer del CSV de
+importación o en la sección "Desarrollador" del body de cada issue.
+
+Uso (desde la raíz del repo):
+    python3 scripts/assign-developers.py [--target csv|issues] [--dry-run]
+"""
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+
+from gh_client import CircuitOpenError, GhError, iter_issues, run_gh
+from planning import (
+    SECTION_DEVELOPER,
+    assign_developers,
+    format_duration,
+    parse_csv_metadata,
+    parse_issue_metadata,
+    required_skills,
+    set_body_section,
+)
+
+# Colores
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+RED = '\033[0;31m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+REPO = "alex9abril/localia-admin"
+CSV_PATH = Path("docs/github-projects-import.csv")
+
+# Perfil por defecto; se puede reemplazar con --developers archivo.json
+DEVELOPERS = {
+    'Dev1': {'skills': ['backend'], 'capacity': 40},
+    'Dev2': {'skills': ['mobile'], 'capacity': 40},
+    'Dev3': {'skills': ['web'], 'capacity': 40},
+}
+
+# Tareas de todo el equipo (documentación, testing): no se reasignan
+SHARED_DEVELOPER = 'All'
+
+
+def load_developers(path):
+    """Perfiles {nombre: {'skills': [...], 'capacity': horas}} desde JSON"""
+    if not path:
+        return DEVELOPERS
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {
+        name: {'skills': list(profile.get('skills', [])), 'capacity': float(profile.get('capacity', 40))}
+        for name, profile in data.items()
+    }
+
+
+def make_assign_task(task_id, meta, labels, keep_assigned, developers):
+    return {
+        'id': task_id,
+        'week': meta['week'],
+        'hours': meta['estimate'],
+        'skills': required_skills(labels),
+        'developer': meta['developer'],
+        'pinned': keep_assigned and meta['developer'] in developers,
+    }
+
+
+def _field_spans(record):
+    """Posiciones (inicio, fin) de cada campo de un registro CSV crudo"""
+    spans = []
+    start = 0
+    quoted = False
+    for i, char in enumerate(record):
+        if char == '"':
+            quoted = not quoted
+        elif char == ',' and not quoted:
+            spans.append((start, i))
+            start = i + 1
+    spans.append((start, len(record.rstrip('\r\n'))))
+    return spans
+
+
+def read_csv_records(path):
+    """Filas del CSV junto con su texto crudo, para reescribir sólo lo que cambie"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        lines = f.readlines()
+    reader = csv.reader(lines)
+    header = next(reader)
+    records = []
+    consumed = reader.line_num
+    for values in reader:
+        raw = ''.join(lines[consumed:reader.line_num])
+        consumed = reader.line_num
+        records.append((dict(zip(header, values)), raw))
+    return header, ''.join(lines[:1]), records
+
+
+def replace_csv_field(raw, index, value):
+    """Cambiar un campo del registro crudo conservando el estilo de comillas"""
+    start, end = _field_spans(raw)[index]
+    if raw[start:end].startswith('"') or any(c in value for c in ',"\n'):
+        value = '"' + value.replace('"', '""') + '"'
+    return raw[:start] + value + raw[end:]
+
+
+def assign_csv(args, developers):
+    if not CSV_PATH.exists():
+        print(f"{RED}❌ No se encontró el archivo: {CSV_PATH}{NC}")
+        sys.exit(1)
+
+    header, header_raw, records = read_csv_records(CSV_PATH)
+    if 'Developer' not in header:
+        print(f"{RED}❌ El CSV no tiene columna Developer{NC}")
+        sys.exit(1)
+
+    tasks = []
+    titles = {}
+    for i, (row, _) in enumerate(records):
+        meta = parse_csv_metadata(row)
+        if not (row.get('Title') or '').strip() or meta['developer'] == SHARED_DEVELOPER:
+            continue
+        tasks.append(make_assign_task(i, meta, row.get('Labels', ''), args.keep_assigned, developers))
+        titles[i] = row['Title'].strip()
+
+    result = assign_developers(tasks, developers)
+    print_report(result, titles, developers)
+
+    changed = [task for task in tasks if result['assignment'][task['id']] != task['developer']]
+    print(f"{BLUE}✏️  {len(changed)} filas cambian de desarrollador{NC}")
+    if args.dry_run or not changed:
+        return
+
+    column = header.index('Developer')
+    parts = [header_raw]
+    for i, (_, raw) in enumerate(records):
+        developer = result['assignment'].get(i)
+        if developer is not None and developer != records[i][0].get('Developer', '').strip():
+            raw = replace_csv_field(raw, column, developer)
+        parts.append(raw)
+    with open(CSV_PATH, 'w', encoding='utf-8', newline='') as f:
+        f.write(''.join(parts))
+    print(f"{GREEN}✅ Actualizado: {CSV_PATH}{NC}")
+
+
+def assign_issues(args, developers):
+    print(f"{BLUE}📋 Obteniendo issues...{NC}")
+    issues = {}
+    tasks = []
+    for issue in iter_issues(REPO, 'number,title,body,labels'):
+        meta = parse_issue_metadata(issue['body'])
+        if meta['week'] is None or meta['developer'] == SHARED_DEVELOPER:
+            continue
+        labels = [label['name'] for label in issue['labels']]
+        tasks.append(make_assign_task(issue['number'], meta, labels, args.keep_assigned, developers))
+        issues[issue['number']] = issue
+    print(f"{GREEN}✅ {len(tasks)} issues con semana asignada{NC}\n")
+
+    result = assign_developers(tasks, developers)
+    print_report(result, {number: issue['title'] for number, issue in issues.items()}, developers)
+
+    changed = [task for task in tasks if result['assignment'][task['id']] != task['developer']]
+    print(f"{BLUE}✏️  {len(changed)} issues cambian de desarrollador{NC}")
+    if args.dry_run:
+        return
+
+    updated = errors = 0
+    for task in changed:
+        number = task['id']
+        developer = result['assignment'][number]
+        body = set_body_section(issues[number]['body'], SECTION_DEVELOPER, developer)
+        try:
+            # Editar es idempotente: reintentar no duplica nada
+            run_gh(['issue', 'edit', str(number), '--repo', REPO, '--body', body])
+            print(f"{GREEN}✅ #{number} → {developer}{NC}")
+            updated += 1
+        except CircuitOpenError as e:
+            print(f"{RED}❌ {e}. Deteniendo; vuelve a ejecutar más tarde.{NC}")
+            errors += 1
+            break
+        except GhError as e:
+            print(f"{RED}❌ #{number}: {e.stderr[:100]}{NC}")
+            errors += 1
+
+    print(f"\n{GREEN}✅ Issues actualizadas: {updated}{NC}")
+    print(f"{RED}❌ Errores: {errors}{NC}")
+
+
+def print_report(result, titles, developers):
+    """Carga por semana y desarrollador frente a su capacidad"""
+    weeks = sorted({week for week, _ in result['loads']}, key=lambda week: (week is None, week or 0))
+    print(f"{BLUE}📊 Carga por semana (horas asignadas / capacidad):{NC}\n")
+    for week in weeks:
+        label = f"Semana {week}" if week is not None else "Sin semana"
+        cells = []
+        for dev in developers:
+            load = result['loads'].get((week, dev), 0.0)
+            capacity = developers[dev]['capacity']
+            color = RED if load > capacity + 1e-9 else GREEN
+            cells.append(f"{color}{dev} {load:.0f}/{capacity:.0f}h{NC}")
+        print(f"   {label}: " + '  '.join(cells))
+    print()
+
+    for week, dev, load, capacity in result['overloaded']:
+        print(f"{YELLOW}⚠️  Semana {week}: {dev} excede su capacidad por "
+              f"{format_duration(load - capacity)}{NC}")
+    for task_id in result['unskilled']:
+        print(f"{YELLOW}⚠️  Ningún desarrollador tiene las habilidades de: {titles.get(task_id, task_id)}{NC}")
+    print(f"{GREEN}✅ Búsqueda local: {result['moves']} movimientos{NC}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Asignar desarrolladores por capacidad y habilidades")
+    parser.add_argument('--target', choices=['csv', 'issues'], default='csv',
+                        help="Dónde leer y escribir las asignaciones")
+    parser.add_argument('--developers', help="JSON con {nombre: {skills, capacity}} por desarrollador")
+    parser.add_argument('--keep-assigned', action='store_true',
+                        help="No mover las tareas que ya tienen un desarrollador válido")
+    parser.add_argument('--dry-run', action='store_true', help="Sólo mostrar el reporte")
+    args = parser.parse_args()
+
+    print(f"{GREEN}🚀 Asignando desarrolladores por capacidad{NC}\n")
+    developers = load_developers(args.developers)
+
+    if args.target == 'csv':
+        assign_csv(args, developers)
+    else:
+        try:
+            assign_issues(args, developers)
+        except GhError as e:
+            print(f"{RED}❌ Error obteniendo issues: {e}{NC}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Benchmark de consultas e índices de database/schema.sql contra un PostgreSQL local
+Ejecuta un catálogo de consultas representativas (negocios cercanos,
+repartidores disponibles, historial de pedidos, ...) con
+EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) y reporta por consulta:
+- Latencia p50/p95/p99 (tiempo de planeación + ejecución medido por el servidor)
+- Bloques de buffer leídos de caché y de disco
+- Sequential scans sobre tablas grandes e índices esperados que el plan no usa
+
+Cada iteración usa parámetros distintos, muestreados de los datos cargados
+(por ejemplo con scripts/generate-bulk-data.py). Con --json se guarda la
+corrida (planes, índices existentes y hash del esquema) y con --compare se
+compara contra una corrida anterior para ver el efecto de un cambio de esquema.
+
+Uso (desde la raíz del repo):
+    python3 scripts/benchmark-queries.py --dsn postgres://postgres@localhost/localia --json antes.json
+    python3 scripts/benchmark-queries.py --dsn postgres://postgres@localhost/localia --compare antes.json
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Colores
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+RED = '\033[0;31m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+SCHEMA_PATH = Path("database/schema.sql")
+
+# Mismo centro y dispersión que scripts/generate-bulk-data.py (CDMX)
+CENTER_LON = -99.1332
+CENTER_LAT = 19.4326
+SPREAD = 0.25
+
+SAMPLE_SIZE = 200
+MARKER = '@@benchmark'
+OPEN_ORDER_STATUSES = ('pending', 'confirmed', 'preparing', 'ready')
+
+
+def sql_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def sql_point(rng):
+    lon = CENTER_LON + rng.uniform(-SPREAD, SPREAD)
+    lat = CENTER_LAT + rng.uniform(-SPREAD, SPREAD)
+    return f"point({lon:.6f}, {lat:.6f})"
+
+
+def sql_in(values):
+    return '(' + ', '.join(sql_literal(value) for value in values) + ')'
+
+
+# Catálogo: nombre → SQL con {parámetros}, muestras que necesita, cómo armar los
+# parámetros y los índices que deberían servirla (basta con que use uno)
+QUERIES = [
+    {
+        'name': 'nearby_businesses',
+        'sql': """SELECT id, name, category, location <-> {point} AS distance
+FROM core.businesses
+WHERE is_active AND accepts_orders
+ORDER BY location <-> {point}
+LIMIT 20""",
+        'needs': [],
+        'params': lambda s, rng: {'point': sql_point(rng)},
+        'indexes': ['idx_businesses_location'],
+    },
+    {
+        'name': 'businesses_in_radius',
+        'sql': """SELECT id, name, category
+FROM core.businesses
+WHERE location <@ circle({point}, 0.02) AND is_active
+LIMIT 100""",
+        'needs': [],
+        'params': lambda s, rng: {'point': sql_point(rng)},
+        'indexes': ['idx_businesses_location'],
+    },
+    {
+        'name': 'businesses_by_tag',
+        'sql': """SELECT id, name, rating_average
+FROM core.businesses
+WHERE tags @> ARRAY[{tag}]::TEXT[] AND is_active
+ORDER BY rating_average DESC
+LIMIT 20""",
+        'needs': ['tags'],
+        'params': lambda s, rng: {'tag': sql_literal(rng.choice(s['tags']))},
+        'indexes': ['idx_businesses_tags', 'idx_businesses_rating'],
+    },
+    {
+        'name': 'top_rated_in_category',
+        'sql': """SELECT id, name, rating_average
+FROM core.businesses
+WHERE category = {category} AND is_active
+ORDER BY rating_average DESC
+LIMIT 20""",
+        'needs': ['categories'],
+        'params': lambda s, rng: {'category': sql_literal(rng.choice(s['categories']))},
+        'indexes': ['idx_businesses_category', 'idx_businesses_rating'],
+    },
+    {
+        'name': 'available_repartidores_near',
+        'sql': """SELECT id, user_id, vehicle_type, current_location <-> {point} AS distance
+FROM core.repartidores
+WHERE is_available = TRUE AND is_active AND current_location IS NOT NULL
+ORDER BY current_location <-> {point}
+LIMIT 10""",
+        'needs': [],
+        'params': lambda s, rng: {'point': sql_point(rng)},
+        'indexes': ['idx_repartidores_current_location', 'idx_repartidores_is_available'],
+    },
+    {
+        'name': 'business_menu',
+        'sql': """SELECT p.id, p.name, p.price, c.name AS category
+FROM catalog.products p
+LEFT JOIN catalog.product_categories c ON c.id = p.category_id
+WHERE p.business_id = {business_id} AND p.is_available
+ORDER BY p.display_order, p.name""",
+        'needs': ['businesses'],
+        'params': lambda s, rng: {'business_id': sql_literal(rng.choice(s['businesses']))},
+        'indexes': ['idx_products_is_available', 'idx_products_business_id'],
+    },
+    {
+        'name': 'client_order_history',
+        'sql': """SELECT id, business_id, status, total_amount, created_at
+FROM orders.orders
+WHERE client_id = {client_id}
+ORDER BY created_at DESC
+LIMIT 20""",
+        'needs': ['clients'],
+        'params': lambda s, rng: {'client_id': sql_literal(rng.choice(s['clients']))},
+        'indexes': ['idx_orders_client_id'],
+    },
+    {
+        'name': 'business_open_orders',
+        'sql': f"""SELECT id, client_id, status, total_amount, created_at
+FROM orders.orders
+WHERE business_id = {{business_id}} AND status IN {sql_in(OPEN_ORDER_STATUSES)}
+ORDER BY created_at""",
+        'needs': ['order_businesses'],
+        'params': lambda s, rng: {'business_id': sql_literal(rng.choice(s['order_businesses']))},
+        'indexes': ['idx_orders_business_id', 'idx_orders_status'],
+    },
+    {
+        'name': 'business_order_stats',
+        'sql': """SELECT status, COUNT(*), SUM(total_amount)
+FROM orders.orders
+WHERE business_id = {business_id} AND created_at >= {since}::TIMESTAMP - INTERVAL '30 days'
+GROUP BY status""",
+        'needs': ['order_businesses', 'order_dates'],
+        'params': lambda s, rng: {
+            'business_id': sql_literal(rng.choice(s['order_businesses'])),
+            'since': sql_literal(rng.choice(s['order_dates'])),
+        },
+        'indexes': ['idx_orders_business_id'],
+    },
+    {
+        'name': 'recent_orders',
+        'sql': """SELECT id, business_id, status, total_amount, created_at
+FROM orders.orders
+WHERE created_at < {before}
+ORDER BY created_at DESC
+LIMIT 50""",
+        'needs': ['order_dates'],
+        'params': lambda s, rng: {'before': sql_literal(rng.choice(s['order_dates']))},
+        'indexes': ['idx_orders_created_at'],
+    },
+    {
+        'name': 'orders_near_point',
+        'sql': """SELECT id, status, delivery_location
+FROM orders.orders
+WHERE delivery_location <@ circle({point}, 0.005)
+LIMIT 50""",
+        'needs': [],
+        'params': lambda s, rng: {'point': sql_point(rng)},
+        'indexes': ['idx_orders_delivery_location'],
+    },
+]
+
+# Muestras de parámetros: nombre → (tabla, expresión); se toman con TABLESAMPLE
+# y, si la tabla es tan chica que la muestra sale vacía, con un LIMIT simple
+SAMPLES = {
+    'businesses': ('core.businesses', 'id::TEXT'),
+    'categories': ('core.businesses', 'category'),
+    'tags': ('core.businesses', 'unnest(tags)'),
+    'clients': ('orders.orders', 'client_id::TEXT'),
+    'order_businesses': ('orders.orders', 'business_id::TEXT'),
+    'order_dates': ('orders.orders', 'created_at::TEXT'),
+}
+
+
+class PsqlError(RuntimeError):
+    pass
+
+
+def run_psql(dsn, script, timeout=None):
+    """Ejecutar un script en un solo psql (salida sin alinear ni encabezados)"""
+    try:
+        result = subprocess.run(
+            ['psql', dsn, '-X', '-q', '-A', '-t', '-F', '\t', '-v', 'ON_ERROR_STOP=1', '-f', '-'],
+            input=script, capture_output=True, text=True, timeout=timeout,
+        )
+    except FileNotFoundError:
+        raise PsqlError("psql no está instalado")
+    except subprocess.TimeoutExpired:
+        raise PsqlError(f"psql no terminó en {timeout:.0f}s")
+    if result.returncode != 0:
+        raise PsqlError(result.stderr.strip() or f"psql terminó con código {result.returncode}")
+    return result.stdout
+
+
+def load_samples(dsn, needed):
+    samples = {}
+    for name in needed:
+        table, expression = SAMPLES[name]
+        values = []
+        for source in (f"{table} TABLESAMPLE SYSTEM (1)", table):
+            output = run_psql(dsn, f"SELECT DISTINCT {expression} FROM "
+                                   f"(SELECT * FROM {source} LIMIT {SAMPLE_SIZE * 5}) s LIMIT {SAMPLE_SIZE};")
+            values = [line for line in output.splitlines() if line]
+            if len(values) >= 10:
+                break
+        samples[name] = values
+    return samples
+
+
+def server_info(dsn):
+    """Versión del servidor, índices existentes y filas estimadas por tabla"""
+    output = run_psql(dsn, f"""SELECT 'version', version();
+\\echo {MARKER}
+SELECT schemaname || '.' || indexname FROM pg_indexes
+WHERE schemaname NOT IN ('pg_catalog', 'information_schema') ORDER BY 1;
+\\echo {MARKER}
+SELECT n.nspname || '.' || c.relname, c.reltuples::BIGINT FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE c.relkind = 'r' AND n.nspname IN ('core', 'catalog', 'orders') ORDER BY 1;
+""")
+    version, indexes, tables = (part.strip().splitlines() for part in output.split(MARKER))
+    return {
+        'version': version[0].split('\t', 1)[-1] if version else '',
+        'indexes': indexes,
+        'tables': {name: int(rows) for name, rows in (line.split('\t') for line in tables)},
+    }
+
+
+def percentile(sorted_values, pct):
+    """Percentil por rango más cercano sobre valores ya ordenados"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def walk_plan(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from walk_plan(child)
+
+
+def analyze_plan(plan, seq_scan_rows):
+    """Scans del plan (tipo, tabla, índice) y sequential scans sobre tablas grandes"""
+    scans = set()
+    indexes = set()
+    seq_scans = []
+    for node in walk_plan(plan):
+        node_type = node.get('Node Type', '')
+        if 'Index Name' in node:
+            indexes.add(node['Index Name'])
+        if 'Relation Name' not in node:
+            continue
+        scans.add(f"{node_type} {node['Relation Name']}" +
+                  (f" ({node['Index Name']})" if 'Index Name' in node else ''))
+        if node_type == 'Seq Scan':
+            loops = node.get('Actual Loops', 1) or 1
+            examined = (node.get('Actual Rows', 0) + node.get('Rows Removed by Filter', 0)) * loops
+            if examined >= seq_scan_rows:
+                seq_scans.append({'relation': node['Relation Name'], 'rows': examined,
+                                  'filter': node.get('Filter', '')})
+    return scans, indexes, seq_scans
+
+
+def explain_script(sql_texts, timing):
+    options = 'ANALYZE, BUFFERS, FORMAT JSON' + ('' if timing else ', TIMING OFF')
+    lines = ["SET statement_timeout = '60s';"]
+    for sql in sql_texts:
+        lines.append(f"\\echo {MARKER}")
+        lines.append(f"EXPLAIN ({options})\n{sql};")
+    return '\n'.join(lines) + '\n'
+
+
+def parse_explain_output(output):
+    return [json.loads(part)[0] for part in output.split(MARKER)[1:] if part.strip()]
+
+
+def run_query(dsn, query, samples, rng, args):
+    """Calentamiento + iteraciones con parámetros distintos en una sola sesión"""
+    params = [query['params'](samples, rng) for _ in range(args.warmup + args.iterations)]
+    sql_texts = [query['sql'].format(**values) for values in params]
+
+    # Las iteraciones medidas van con TIMING OFF (menos sobrecarga por nodo);
+    # el plan que se guarda sale de una corrida extra con tiempos por nodo
+    results = parse_explain_output(run_psql(dsn, explain_script(sql_texts, timing=False), args.timeout))
+    results = results[args.warmup:]
+    detail = parse_explain_output(run_psql(dsn, explain_script(sql_texts[-1:], timing=True), args.timeout))[0]
+
+    latencies = sorted(r['Planning Time'] + r['Execution Time'] for r in results)
+    scans = set()
+    used_indexes = set()
+    seq_scans = {}
+    hit = read = 0
+    for result in results:
+        plan_scans, plan_indexes, plan_seq = analyze_plan(result['Plan'], args.seq_scan_rows)
+        scans |= plan_scans
+        used_indexes |= plan_indexes
+        for scan in plan_seq:
+            previous = seq_scans.get(scan['relation'])
+            if previous is None or scan['rows'] > previous['rows']:
+                seq_scans[scan['relation']] = scan
+        hit += result['Plan'].get('Shared Hit Blocks', 0)
+        read += result['Plan'].get('Shared Read Blocks', 0)
+
+    expected = query['indexes']
+    return {
+        'query': query['name'],
+        'iterations': len(results),
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': latencies[-1],
+        'planning_ms': sum(r['Planning Time'] for r in results) / len(results),
+        'shared_hit_blocks': hit / len(results),
+        'shared_read_blocks': read / len(results),
+        'rows': detail['Plan'].get('Actual Rows', 0),
+        'scans': sorted(scans),
+        'indexes_used': sorted(used_indexes),
+        'seq_scans': sorted(seq_scans.values(), key=lambda scan: -scan['rows']),
+        'missing_index': bool(expected) and not used_indexes & set(expected),
+        'expected_indexes': expected,
+        'sql': sql_texts[-1],
+        'plan': detail,
+    }
+
+
+def print_report(rows):
+    header = f"{'Consulta':<28} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'hit':>8} {'read':>8}  Scans"
+    print(f"\n{BLUE}📊 Resultados{NC}\n")
+    print(header)
+    print('-' * len(header))
+    for row in rows:
+        color = RED if row['seq_scans'] or row['missing_index'] else GREEN
+        print(f"{color}{row['query']:<28} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} "
+              f"{row['shared_hit_blocks']:>8.0f} {row['shared_read_blocks']:>8.0f}  "
+              f"{'; '.join(row['scans'])}{NC}")
+    print()
+    for row in rows:
+        for scan in row['seq_scans']:
+            filter_text = f" (filtro: {scan['filter']})" if scan['filter'] else ''
+            print(f"{YELLOW}⚠️  {row['query']}: Seq Scan sobre {scan['relation']} "
+                  f"({scan['rows']:,.0f} filas){filter_text}{NC}")
+        if row['missing_index']:
+            print(f"{YELLOW}⚠️  {row['query']}: no usa {' ni '.join(row['expected_indexes'])}{NC}")
+
+
+def compare_runs(baseline, rows, info, threshold):
+    """Diferencias contra una corrida anterior; regresa cuántas consultas empeoraron"""
+    before_rows = {row['query']: row for row in baseline['queries']}
+    print(f"\n{BLUE}🔍 Comparación contra {baseline.get('label', 'corrida anterior')} "
+          f"({baseline.get('created_at', '?')}){NC}\n")
+    if baseline.get('schema_sha256') != info['schema_sha256']:
+        print(f"{YELLOW}📝 database/schema.sql cambió entre las corridas{NC}")
+    before_indexes = set(baseline['server'].get('indexes', []))
+    after_indexes = set(info['server']['indexes'])
+    for name in sorted(after_indexes - before_indexes):
+        print(f"{GREEN}   + índice {name}{NC}")
+    for name in sorted(before_indexes - after_indexes):
+        print(f"{RED}   - índice {name}{NC}")
+
+    header = f"{'Consulta':<28} {'p50 antes':>10} {'p50 ahora':>10} {'p95 antes':>10} {'p95 ahora':>10} {'Δ p95':>8}"
+    print()
+    print(header)
+    print('-' * len(header))
+    regressions = 0
+    for row in rows:
+        before = before_rows.get(row['query'])
+        if before is None:
+            print(f"{BLUE}{row['query']:<28} {'(nueva)':>10}{NC}")
+            continue
+        delta = (row['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100 if before['p95_ms'] else 0.0
+        # Diferencias menores a medio milisegundo son ruido aunque el porcentaje sea alto
+        slower = delta > threshold and row['p95_ms'] - before['p95_ms'] > 0.5
+        faster = delta < -threshold and before['p95_ms'] - row['p95_ms'] > 0.5
+        regressions += slower
+        color = RED if slower else (GREEN if faster else NC)
+        print(f"{color}{row['query']:<28} {before['p50_ms']:>10.2f} {row['p50_ms']:>10.2f} "
+              f"{before['p95_ms']:>10.2f} {row['p95_ms']:>10.2f} {delta:>+7.0f}%{NC}")
+        if before['scans'] != row['scans']:
+            print(f"   {YELLOW}plan cambió: {'; '.join(before['scans'])} → {'; '.join(row['scans'])}{NC}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de consultas e índices contra PostgreSQL local")
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL'),
+                        help="Cadena de conexión de psql; también DATABASE_URL")
+    parser.add_argument('--iterations', type=int, default=30, help="Iteraciones medidas por consulta (default: 30)")
+    parser.add_argument('--warmup', type=int, default=3, help="Iteraciones de calentamiento (default: 3)")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla de los parámetros (misma semilla = mismas consultas)")
+    parser.add_argument('--only', help="Consultas a ejecutar, separadas por coma")
+    parser.add_argument('--seq-scan-rows', type=int, default=1000,
+                        help="Marcar Seq Scans que recorren al menos estas filas (default: 1000)")
+    parser.add_argument('--timeout', type=float, default=600, help="Timeout por consulta en segundos")
+    parser.add_argument('--label', help="Nombre de la corrida (ej. 'antes-indice-orders')")
+    parser.add_argument('--json', dest='json_path', help="Guardar la corrida en un archivo JSON")
+    parser.add_argument('--compare', help="JSON de una corrida anterior para comparar")
+    parser.add_argument('--threshold', type=float, default=20,
+                        help="Porcentaje de aumento del p95 que cuenta como regresión (default: 20)")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="Salir con código 1 si alguna consulta empeoró")
+    args = parser.parse_args()
+
+    if not args.dsn:
+        print(f"{RED}❌ Indica la base con --dsn o DATABASE_URL{NC}")
+        sys.exit(1)
+
+    queries = QUERIES
+    if args.only:
+        wanted = {name.strip() for name in args.only.split(',')}
+        queries = [query for query in QUERIES if query['name'] in wanted]
+        if not queries:
+            print(f"{RED}❌ Ninguna consulta coincide con: {args.only}{NC}")
+            sys.exit(1)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print(f"{GREEN}🚀 Benchmark de consultas contra {args.dsn.split('@')[-1]}{NC}\n")
+    try:
+        info = {
+            'label': args.label or time.strftime('%Y%m%d-%H%M%S'),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'schema_sha256': hashlib.sha256(SCHEMA_PATH.read_bytes()).hexdigest() if SCHEMA_PATH.exists() else None,
+            'server': server_info(args.dsn),
+        }
+        print(f"{BLUE}🐘 {info['server']['version']}{NC}")
+        for table, rows in sorted(info['server']['tables'].items()):
+            if rows > 0:
+                print(f"   {table}: ~{rows:,} filas")
+
+        needed = sorted({name for query in queries for name in query['needs']})
+        samples = load_samples(args.dsn, needed)
+    except PsqlError as e:
+        print(f"{RED}❌ {e}{NC}")
+        sys.exit(1)
+
+    rng = random.Random(args.seed)
+    rows = []
+    print(f"\n{BLUE}⏱️  {args.iterations} iteraciones (+{args.warmup} de calentamiento) por consulta{NC}\n")
+    for query in queries:
+        empty = [name for name in query['needs'] if not samples.get(name)]
+        if empty:
+            print(f"{YELLOW}⏭️  {query['name']}: sin datos para {', '.join(empty)}{NC}")
+            continue
+        started = time.monotonic()
+        try:
+            row = run_query(args.dsn, query, samples, rng, args)
+        except PsqlError as e:
+            print(f"{RED}❌ {query['name']}: {str(e)[:200]}{NC}")
+            continue
+        rows.append(row)
+        print(f"{GREEN}✅ {query['name']}: p95 {row['p95_ms']:.2f} ms ({time.monotonic() - started:.1f}s){NC}")
+
+    if not rows:
+        print(f"{RED}❌ No se completó ninguna consulta{NC}")
+        sys.exit(1)
+
+    print_report(rows)
+
+    regressions = 0
+    if baseline:
+        regressions = compare_runs(baseline, rows, info, args.threshold)
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(dict(info, queries=rows), indent=2, ensure_ascii=False),
+                                        encoding='utf-8')
+        print(f"\n{GREEN}✅ Corrida guardada en: {args.json_path}{NC}")
+
+    if regressions:
+        print(f"\n{RED}❌ {regressions} consultas empeoraron más de {args.threshold:.0f}%{NC}")
+        if args.fail_on_regression:
+            sys.exit(1)
+    print(f"\n{GREEN}✨ Proceso completado{NC}")
+
+
+if __name__ == "__main__":
+    main()
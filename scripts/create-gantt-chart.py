@@ -1,15 +1,27 @@
 #!/usr/bin/env python3
 """
 Script para generar un diagrama de Gantt del proyecto LOCALIA
-Genera archivos en formato Mermaid y CSV para importar en herramientas de Gantt
+Genera archivos en formato Mermaid y CSV para importar en herramientas de Gantt,
+además de un SVG paginado (docs/gantt/) que no depende de Mermaid
 """
 
 import csv
-import json
-import subprocess
+import io
 from pathlib import Path
 from datetime import datetime, timedelta
 
+import gantt_svg
+from gh_client import iter_issues
+from planning import (
+    format_duration,
+    make_task,
+    parse_csv_metadata,
+    parse_issue_metadata,
+    schedule_tasks,
+    working_offset_to_date,
+    working_offset_to_datetime,
+)
+
 # Colores
 GREEN = '\033[0;32m'
 YELLOW = '\033[1;33m'
@@ -18,120 +30,144 @@ NC = '\033[0m'
 
 REPO = "alex9abril/localia-admin"
 START_DATE = datetime(2025, 1, 13)  # Lunes de la semana 1 (ajusta según tu fecha de inicio)
+CSV_PATH = Path("docs/github-projects-import.csv")
+SVG_DIR = Path("docs/gantt")
+WEEKS = [1, 2, 3, 4]
+DEVELOPERS = ['Dev1', 'Dev2', 'Dev3']
 
 def get_issues_by_week():
     """Obtener issues organizadas por semana y desarrollador"""
     try:
-        result = subprocess.run(
-            ['gh', 'issue', 'list', '--repo', REPO, '--state', 'all', '--json', 'number,title,body'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        issues = json.loads(result.stdout)
-        
-        issues_by_week_dev = {
-            1: {'Dev1': [], 'Dev2': [], 'Dev3': []},
-            2: {'Dev1': [], 'Dev2': [], 'Dev3': []},
-            3: {'Dev1': [], 'Dev2': [], 'Dev3': []},
-            4: {'Dev1': [], 'Dev2': [], 'Dev3': []}
-        }
-        
-        for issue in issues:
-            body = issue.get('body', '')
-            week = None
-            developer = None
-            
-            # Extraer semana y desarrollador del body
-            lines = body.split('\n')
-            for i, line in enumerate(lines):
-                if '## Semana' in line and i + 1 < len(lines):
-                    try:
-                        week = int(lines[i + 1].strip())
-                    except ValueError:
-                        pass
-                if '## Desarrollador' in line and i + 1 < len(lines):
-                    developer = lines[i + 1].strip()
-            
-            if week and developer and week in issues_by_week_dev:
-                if developer in issues_by_week_dev[week]:
-                    issues_by_week_dev[week][developer].append(issue)
+        # Decodificar en streaming y quedarse sólo con los metadatos del body
+        issues = []
+        for issue in iter_issues(REPO, 'number,title,body'):
+            issue['meta'] = parse_issue_metadata(issue.pop('body'))
+            issues.append(issue)
         
-        return issues_by_week_dev
+        return group_issues_by_week_dev(issues)
     except Exception as e:
         print(f"Error: {e}")
         return None
 
+def group_issues_by_week_dev(issues):
+    """Agrupar issues (con 'meta' ya leído) por semana y desarrollador"""
+    issues_by_week_dev = {week: {dev: [] for dev in DEVELOPERS} for week in WEEKS}
+    
+    for issue in issues:
+        week = issue['meta']['week']
+        developer = issue['meta']['developer']
+        
+        if week and developer and week in issues_by_week_dev:
+            if developer in issues_by_week_dev[week]:
+                issues_by_week_dev[week][developer].append(issue)
+    
+    return issues_by_week_dev
+
 def calculate_week_dates(week_number):
     """Calcular fechas de inicio y fin de una semana"""
     start = START_DATE + timedelta(weeks=week_number - 1)
     end = start + timedelta(days=4)  # Viernes
     return start, end
 
-def generate_mermaid_gantt(issues_by_week_dev):
+def load_csv_metadata():
+    """Leer estimaciones y dependencias del CSV de importación, indexadas por título"""
+    if not CSV_PATH.exists():
+        return {}
+    with open(CSV_PATH, 'r', encoding='utf-8') as f:
+        return {
+            row['Title'].strip(): parse_csv_metadata(row)
+            for row in csv.DictReader(f)
+            if row.get('Title', '').strip()
+        }
+
+def build_schedule(issues_by_week_dev):
+    """Calendarizar las issues por dependencias y carga de cada desarrollador
+    
+    El body de la issue manda; el CSV completa estimación y dependencias faltantes.
+    Las dependencias del CSV se refieren a títulos y se traducen a números de issue.
+    """
+    csv_meta = load_csv_metadata()
+    issues = [
+        issue
+        for week in issues_by_week_dev.values()
+        for dev_issues in week.values()
+        for issue in dev_issues
+    ]
+    numbers_by_title = {issue['title'].strip().lower(): issue['number'] for issue in issues}
+    
+    tasks = []
+    for issue in issues:
+        meta = dict(issue['meta'])
+        fallback = csv_meta.get(issue['title'].strip())
+        if fallback:
+            if not meta['estimate']:
+                meta['estimate'] = fallback['estimate']
+            if not meta['depends_on']:
+                meta['depends_on'] = fallback['depends_on']
+        meta['depends_on'] = [
+            numbers_by_title.get(ref.strip().lower(), ref) if isinstance(ref, str) else ref
+            for ref in meta['depends_on']
+        ]
+        tasks.append(make_task(issue['number'], issue['title'], meta))
+    
+    return schedule_tasks(tasks, START_DATE, developers=DEVELOPERS)
+
+def generate_mermaid_gantt(issues_by_week_dev, schedule):
     """Generar diagrama de Gantt en formato Mermaid"""
+    # Inicio y fin explícitos con hora: redondear a días completos haría que
+    # tareas consecutivas se encimaran y no coincidieran con el SVG
     mermaid = """gantt
     title LOCALIA - Plan de Desarrollo 4 Semanas
-    dateFormat YYYY-MM-DD
-    section Semana 1
+    dateFormat YYYY-MM-DD HH:mm
+    axisFormat %d/%m
+    excludes weekends
 """
     
-    # Semana 1
-    start1, end1 = calculate_week_dates(1)
-    for dev in ['Dev1', 'Dev2', 'Dev3']:
-        issues = issues_by_week_dev[1][dev]
-        for issue in issues[:5]:  # Limitar para que no sea muy largo
-            title = issue['title'].replace('"', "'")[:40]
-            mermaid += f"    {title} :{dev.lower()}, {start1.strftime('%Y-%m-%d')}, 5d\n"
-    
-    mermaid += "\n    section Semana 2\n"
-    start2, end2 = calculate_week_dates(2)
-    for dev in ['Dev1', 'Dev2', 'Dev3']:
-        issues = issues_by_week_dev[2][dev]
-        for issue in issues[:5]:
-            title = issue['title'].replace('"', "'")[:40]
-            mermaid += f"    {title} :{dev.lower()}, {start2.strftime('%Y-%m-%d')}, 5d\n"
-    
-    mermaid += "\n    section Semana 3\n"
-    start3, end3 = calculate_week_dates(3)
-    for dev in ['Dev1', 'Dev2', 'Dev3']:
-        issues = issues_by_week_dev[3][dev]
-        for issue in issues[:5]:
-            title = issue['title'].replace('"', "'")[:40]
-            mermaid += f"    {title} :{dev.lower()}, {start3.strftime('%Y-%m-%d')}, 5d\n"
-    
-    mermaid += "\n    section Semana 4\n"
-    start4, end4 = calculate_week_dates(4)
-    for dev in ['Dev1', 'Dev2', 'Dev3']:
-        issues = issues_by_week_dev[4][dev]
-        for issue in issues[:5]:
-            title = issue['title'].replace('"', "'")[:40]
-            mermaid += f"    {title} :{dev.lower()}, {start4.strftime('%Y-%m-%d')}, 5d\n"
+    for week in WEEKS:
+        mermaid += f"\n    section Semana {week}\n"
+        for dev in DEVELOPERS:
+            issues = issues_by_week_dev[week][dev]
+            for issue in issues[:5]:  # Limitar para que no sea muy largo
+                entry = schedule['tasks'][issue['number']]
+                title = issue['title'].replace('"', "'")[:40]
+                start = working_offset_to_datetime(START_DATE, entry['start_hours'])
+                end = working_offset_to_datetime(START_DATE, entry['finish_hours'], end=True)
+                tags = 'crit, ' if entry['critical'] else ''
+                mermaid += (f"    {title} :{tags}t{issue['number']}, "
+                            f"{start.strftime('%Y-%m-%d %H:%M')}, {end.strftime('%Y-%m-%d %H:%M')}\n")
     
     return mermaid
 
-def generate_csv_gantt(issues_by_week_dev):
+def generate_csv_gantt(issues_by_week_dev, schedule):
     """Generar CSV para importar en herramientas de Gantt (ProjectLibre, MS Project, etc.)"""
     rows = []
     
-    for week in [1, 2, 3, 4]:
-        start, end = calculate_week_dates(week)
-        for dev in ['Dev1', 'Dev2', 'Dev3']:
-            issues = issues_by_week_dev[week][dev]
-            for issue in issues:
-                rows.append({
-                    'Task Name': issue['title'],
-                    'Start Date': start.strftime('%Y-%m-%d'),
-                    'End Date': end.strftime('%Y-%m-%d'),
-                    'Duration': '5 days',
-                    'Developer': dev,
-                    'Week': week,
-                    'Issue Number': issue['number']
-                })
+    for task_id in schedule['order']:
+        entry = schedule['tasks'][task_id]
+        rows.append({
+            'Task Name': entry['title'],
+            'Start Date': entry['start'].strftime('%Y-%m-%d'),
+            'End Date': entry['end'].strftime('%Y-%m-%d'),
+            'Duration': format_duration(entry['duration_hours']),
+            'Developer': entry['developer'],
+            'Week': entry['week'],
+            'Issue Number': task_id,
+            'Predecessors': ','.join(str(dep) for dep in entry['depends_on']),
+            'Critical': 'Yes' if entry['critical'] else 'No'
+        })
     
     return rows
 
-def generate_detailed_gantt_markdown(issues_by_week_dev):
+def generate_svg_gantt(schedule):
+    """Generar los SVG del Gantt: [(ruta, contenido)] con la vista general y las páginas"""
+    title = "LOCALIA - Plan de Desarrollo"
+    tasks = schedule['tasks'].values()
+    outputs = [(SVG_DIR / "overview.svg", gantt_svg.render_overview(tasks, START_DATE, DEVELOPERS, title=f"{title} - vista general"))]
+    for page, svg in gantt_svg.render_pages(tasks, START_DATE, DEVELOPERS, title=title):
+        outputs.append((SVG_DIR / f"page-{page:03d}.svg", svg))
+    return outputs
+
+def generate_detailed_gantt_markdown(issues_by_week_dev, schedule, svg_paths=()):
     """Generar un documento Markdown con el Gantt detallado"""
     md = """# 📊 Diagrama de Gantt - LOCALIA MVP (4 Semanas)
 
@@ -139,31 +175,58 @@ def generate_detailed_gantt_markdown(issues_by_week_dev):
 
 """
     
-    for week in [1, 2, 3, 4]:
+    for week in WEEKS:
         start, end = calculate_week_dates(week)
         md += f"### Semana {week}: {start.strftime('%d/%m/%Y')} - {end.strftime('%d/%m/%Y')}\n\n"
         
-        for dev in ['Dev1', 'Dev2', 'Dev3']:
+        for dev in DEVELOPERS:
             issues = issues_by_week_dev[week][dev]
             if issues:
                 md += f"#### {dev}\n\n"
-                for issue in issues:
-                    md += f"- **#{issue['number']}** {issue['title']}\n"
+                for issue in sorted(issues, key=lambda i: schedule['tasks'][i['number']]['start_hours']):
+                    entry = schedule['tasks'][issue['number']]
+                    crit = " 🔴" if entry['critical'] else ""
+                    md += (f"- **#{issue['number']}** {issue['title']} "
+                           f"({entry['start'].strftime('%d/%m')} - {entry['end'].strftime('%d/%m')}){crit}\n")
                 md += "\n"
     
+    md += "## 🔴 Ruta Crítica\n\n"
+    if schedule['critical_path']:
+        for task_id in schedule['critical_path']:
+            entry = schedule['tasks'][task_id]
+            md += f"1. **#{task_id}** {entry['title']} ({entry['developer']}, {format_duration(entry['duration_hours'])})\n"
+    else:
+        md += "Sin dependencias registradas.\n"
+    md += "\n"
+    
     md += """
 ## 📈 Diagrama de Gantt (Mermaid)
 
 ```mermaid
 """
-    md += generate_mermaid_gantt(issues_by_week_dev)
+    md += generate_mermaid_gantt(issues_by_week_dev, schedule)
     md += "```\n\n"
     
+    if svg_paths:
+        # El Mermaid sólo muestra 5 tareas por desarrollador y semana; el SVG las muestra todas
+        overview, pages = svg_paths[0], svg_paths[1:]
+        md += "## 🖼️ Diagrama de Gantt (SVG)\n\n"
+        md += f"![Gantt - vista general]({SVG_DIR.name}/{overview.name})\n\n"
+        md += "Todas las tareas, una fila por tarea:\n\n"
+        for index, path in enumerate(pages, 1):
+            md += f"- [Página {index} de {len(pages)}]({SVG_DIR.name}/{path.name})\n"
+        md += "\n"
+    
     md += """
 ## 📝 Notas
 
 - Cada semana tiene 5 días laborables (Lunes a Viernes)
 - Las tareas están distribuidas entre 3 desarrolladores
+- Las fechas se calculan con las secciones "Estimación" y "Dependencias" de cada issue
+  (o las columnas `Estimate` y `Depends On` del CSV); sin estimación, las horas libres
+  de la semana se reparten entre las tareas del desarrollador
+- Las tareas marcadas con 🔴 están en la ruta crítica: no tienen holgura considerando
+  las dependencias, la semana planeada y que cada desarrollador hace una tarea a la vez
 - Total: 4 semanas = 20 días laborables
 - Horas estimadas: 160h por desarrollador = 480h totales
 
@@ -175,6 +238,45 @@ def generate_detailed_gantt_markdown(issues_by_week_dev):
     
     return md
 
+def write_gantt_outputs(issues_by_week_dev, schedule, only_changed=True):
+    """Escribir los archivos del Gantt; devuelve las rutas escritas
+    
+    Con only_changed=True no se reescriben los archivos cuyo contenido no cambió.
+    Las páginas SVG que sobran de una corrida anterior se borran.
+    """
+    buffer = io.StringIO(newline='')
+    writer = csv.DictWriter(buffer, fieldnames=['Task Name', 'Start Date', 'End Date', 'Duration', 'Developer', 'Week', 'Issue Number', 'Predecessors', 'Critical'])
+    writer.writeheader()
+    writer.writerows(generate_csv_gantt(issues_by_week_dev, schedule))
+    svg_outputs = generate_svg_gantt(schedule)
+    
+    outputs = [
+        # 1. Mermaid Gantt
+        (Path("docs/gantt.mmd"), generate_mermaid_gantt(issues_by_week_dev, schedule)),
+        # 2. CSV para importar
+        (Path("docs/gantt-import.csv"), buffer.getvalue()),
+        # 3. Markdown detallado
+        (Path("docs/GANTT-CHART.md"), generate_detailed_gantt_markdown(
+            issues_by_week_dev, schedule, [path for path, _ in svg_outputs])),
+        # 4. SVG: vista general y páginas
+        *svg_outputs,
+    ]
+    
+    SVG_DIR.mkdir(parents=True, exist_ok=True)
+    current = {path for path, _ in svg_outputs}
+    for stale in SVG_DIR.glob("page-*.svg"):
+        if stale not in current:
+            stale.unlink()
+    
+    written = []
+    for path, content in outputs:
+        if only_changed and path.exists() and path.read_text(encoding='utf-8') == content:
+            continue
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            f.write(content)
+        written.append(path)
+    return written
+
 def main():
     print(f"{GREEN}🚀 Generando diagrama de Gantt{NC}\n")
     
@@ -188,34 +290,30 @@ def main():
     total = sum(len(issues) for week in issues_by_week_dev.values() for issues in week.values())
     print(f"{GREEN}✅ Procesando {total} issues{NC}\n")
     
+    # Calendarizar por dependencias y carga
+    print(f"{BLUE}🗓️  Calendarizando tareas...{NC}")
+    schedule = build_schedule(issues_by_week_dev)
+    if schedule['cycles']:
+        print(f"{YELLOW}⚠️  Dependencias circulares ignoradas en: {', '.join(f'#{t}' for t in schedule['cycles'])}{NC}")
+    for task_id, ref in schedule['unknown_dependencies']:
+        print(f"{YELLOW}⚠️  #{task_id}: dependencia desconocida '{ref}'{NC}")
+    print(f"{GREEN}✅ Ruta crítica: {len(schedule['critical_path'])} tareas, "
+          f"{format_duration(schedule['makespan'])} en total{NC}\n")
+    
     # Generar archivos
     print(f"{BLUE}📝 Generando archivos...{NC}")
-    
-    # 1. Mermaid Gantt
-    mermaid_content = generate_mermaid_gantt(issues_by_week_dev)
-    Path("docs/gantt.mmd").write_text(mermaid_content, encoding='utf-8')
-    print(f"{GREEN}✅ Creado: docs/gantt.mmd{NC}")
-    
-    # 2. CSV para importar
-    csv_rows = generate_csv_gantt(issues_by_week_dev)
-    with open("docs/gantt-import.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['Task Name', 'Start Date', 'End Date', 'Duration', 'Developer', 'Week', 'Issue Number'])
-        writer.writeheader()
-        writer.writerows(csv_rows)
-    print(f"{GREEN}✅ Creado: docs/gantt-import.csv{NC}")
-    
-    # 3. Markdown detallado
-    md_content = generate_detailed_gantt_markdown(issues_by_week_dev)
-    Path("docs/GANTT-CHART.md").write_text(md_content, encoding='utf-8')
-    print(f"{GREEN}✅ Creado: docs/GANTT-CHART.md{NC}")
+    for path in write_gantt_outputs(issues_by_week_dev, schedule, only_changed=False):
+        print(f"{GREEN}✅ Creado: {path}{NC}")
     
     print(f"\n{GREEN}✨ Proceso completado{NC}")
     print(f"\n{BLUE}💡 Archivos generados:{NC}")
     print(f"   1. docs/gantt.mmd - Para visualizar en GitHub o editores Markdown")
     print(f"   2. docs/gantt-import.csv - Para importar en ProjectLibre, MS Project, etc.")
     print(f"   3. docs/GANTT-CHART.md - Documento completo con el Gantt")
+    print(f"   4. {SVG_DIR}/ - SVG con todas las tareas (vista general y páginas)")
     print(f"\n{BLUE}📅 Fecha de inicio del proyecto: {START_DATE.strftime('%d/%m/%Y')}{NC}")
-    print(f"{BLUE}📅 Fecha de fin del proyecto: {(START_DATE + timedelta(weeks=4, days=-1)).strftime('%d/%m/%Y')}{NC}")
+    end_hours = max(schedule['makespan'] - 1e-9, 0)
+    print(f"{BLUE}📅 Fecha de fin del proyecto: {working_offset_to_date(START_DATE, end_hours).strftime('%d/%m/%Y')}{NC}")
 
 if __name__ == "__main__":
     main()
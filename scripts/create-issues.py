@@ -5,11 +5,25 @@ Requiere: GitHub CLI (gh) instalado y autenticado
 """
 
 import csv
+import re
 import subprocess
 import sys
-import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
 from pathlib import Path
 
+from gh_client import (
+    PERMANENT,
+    CircuitOpenError,
+    GhError,
+    add_sub_issues,
+    find_recent_issue_by_title,
+    get_issue_node_ids,
+    is_stale_id_error,
+    run_gh,
+)
+from planning import WriteQueue, parse_csv_metadata, write_priority_key
+
 # Colores para output
 GREEN = '\033[0;32m'
 YELLOW = '\033[1;33m'
@@ -17,6 +31,9 @@ RED = '\033[0;31m'
 BLUE = '\033[0;34m'
 NC = '\033[0m'  # No Color
 
+# Issues que se crean en paralelo (el backoff de gh_client absorbe los rate limits)
+CREATE_WORKERS = 4
+
 def check_gh_installed():
     """Verificar que GitHub CLI está instalado"""
     try:
@@ -40,37 +57,209 @@ def check_gh_auth():
         return False
 
 def create_issue(title, body, labels, repo):
-    """Crear una issue en GitHub"""
+    """Crear una issue en GitHub
+    
+    Crear no es idempotente: antes de cada reintento se verifica si la issue
+    ya quedó creada para no duplicarla.
+    """
+    cmd = ['issue', 'create',
+           '--title', title,
+           '--body', body,
+           '--repo', repo]
+    
+    # Agregar labels si existen
+    label_args = []
+    if labels and labels.strip():
+        # Separar labels por coma
+        label_list = [l.strip() for l in labels.split(',') if l.strip()]
+        for label in label_list:
+            label_args.extend(['--label', label])
+    
+    # Sólo una issue creada después de este momento puede ser nuestro intento
+    started = datetime.now(timezone.utc)
+    
+    def check_landed():
+        return find_recent_issue_by_title(repo, title, started, body=body)
+    
     try:
-        # Preparar comando
-        cmd = ['gh', 'issue', 'create',
-               '--title', title,
-               '--body', body,
-               '--repo', repo]
-        
-        # Agregar labels si existen
-        if labels and labels.strip():
-            # Separar labels por coma
-            label_list = [l.strip() for l in labels.split(',') if l.strip()]
-            for label in label_list:
-                cmd.extend(['--label', label])
-        
-        # Crear issue
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return True, result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        # Si falla por labels, intentar sin labels
-        if 'label' in e.stderr.lower():
+        url = run_gh(cmd + label_args, idempotent=False, check_landed=check_landed)
+        return True, url.strip()
+    except CircuitOpenError:
+        raise
+    except GhError as e:
+        # Si falla porque un label no existe, intentar sin labels
+        if label_args and e.kind == PERMANENT and 'label' in e.stderr.lower():
             try:
-                cmd = ['gh', 'issue', 'create',
-                       '--title', title,
-                       '--body', body,
-                       '--repo', repo]
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-                return True, result.stdout.strip() + " (sin labels - agrégalos manualmente)"
-            except:
-                return False, e.stderr.strip()
-        return False, e.stderr.strip()
+                url = run_gh(cmd, idempotent=False, check_landed=check_landed)
+                return True, url.strip() + " (sin labels - agrégalos manualmente)"
+            except CircuitOpenError:
+                raise
+            except GhError as retry_error:
+                return False, retry_error.stderr
+        return False, e.stderr
+
+def issue_number_from_url(url):
+    """Número de issue a partir de la URL que imprime `gh issue create`"""
+    match = re.search(r'/issues/(\d+)', url or '')
+    return int(match.group(1)) if match else None
+
+def parent_reference(row):
+    """Columna opcional Parent: título de otra fila o '#N' de una issue existente"""
+    return (row.get('Parent') or '').strip()
+
+def duplicate_titles(rows):
+    """Títulos que aparecen en más de una fila
+    
+    El título identifica la fila (columna Parent, números creados), así que
+    deben ser únicos.
+    """
+    seen = set()
+    duplicates = []
+    for row in rows:
+        title = row['Title'].strip()
+        if title in seen and title not in duplicates:
+            duplicates.append(title)
+        seen.add(title)
+    return duplicates
+
+def hierarchy_levels(rows):
+    """Agrupar las filas por profundidad (semana → feature → tarea)
+    
+    Cada nivel se crea después del anterior para que los padres existan antes
+    que sus hijos. Devuelve (niveles, títulos en un ciclo); a estos últimos se
+    les ignora el padre.
+    """
+    by_title = {row['Title'].strip(): row for row in rows}
+    depth = {}
+    cyclic = []
+    
+    def resolve(title, visiting):
+        if title in depth:
+            return depth[title]
+        parent = parent_reference(by_title[title])
+        if parent in visiting or parent == title:
+            cyclic.append(title)
+            depth[title] = 0
+        elif parent in by_title:
+            visiting.add(title)
+            depth[title] = resolve(parent, visiting) + 1
+            visiting.discard(title)
+        else:
+            depth[title] = 0
+        return depth[title]
+    
+    levels = []
+    for row in rows:
+        level = resolve(row['Title'].strip(), set())
+        while len(levels) <= level:
+            levels.append([])
+        levels[level].append(row)
+    return levels, cyclic
+
+def hierarchy_children(rows, cyclic):
+    """Filas hijas de cada título del CSV (sólo padres que también están en el CSV)"""
+    titles = {row['Title'].strip() for row in rows}
+    children = {}
+    for row in rows:
+        title = row['Title'].strip()
+        parent = parent_reference(row)
+        if parent in titles and parent != title and title not in cyclic:
+            children.setdefault(parent, []).append(row)
+    return children
+
+def inherited_priority_keys(levels, children):
+    """Clave (prioridad, semana) de cada fila: la más urgente entre ella y sus descendientes
+    
+    Una hija no puede crearse antes que su padre, así que un padre Low con una
+    tarea High debajo sube a la prioridad de la tarea.
+    """
+    keys = {}
+    for level_rows in reversed(levels):
+        for row in level_rows:
+            title = row['Title'].strip()
+            keys[title] = min([write_priority_key(parse_csv_metadata(row))] +
+                              [keys[child['Title'].strip()] for child in children.get(title, [])])
+    return keys
+
+def collect_links(rows, numbers, cyclic):
+    """Pares (número padre, número hijo) a vincular y padres que no se encontraron"""
+    links = []
+    missing = []
+    for row in rows:
+        title = row['Title'].strip()
+        parent = parent_reference(row)
+        if not parent or title in cyclic or title not in numbers:
+            continue
+        match = re.fullmatch(r'#(\d+)', parent)
+        parent_number = int(match.group(1)) if match else numbers.get(parent)
+        if parent_number is None:
+            missing.append((title, parent))
+        else:
+            links.append((parent_number, numbers[title]))
+    return links, missing
+
+def link_sub_issues(repo, links, replace_parent=False):
+    """Vincular sub-issues con pocas llamadas: node IDs y mutaciones por lotes
+    
+    Con replace_parent=True un hijo que ya tenía padre se mueve al nuevo.
+    Devuelve (vinculadas, errores).
+    """
+    node_ids = get_issue_node_ids(repo, [number for link in links for number in link])
+    pairs = []
+    errors = 0
+    for parent, child in links:
+        if parent in node_ids and child in node_ids:
+            pairs.append((node_ids[parent], node_ids[child]))
+        else:
+            print(f"{RED}❌ No se pudo obtener el node ID de #{parent} o #{child}{NC}")
+            errors += 1
+    
+    failures = add_sub_issues(pairs, replace_parent=replace_parent)
+    numbers_by_id = {node_id: number for number, node_id in node_ids.items()}
+    stale = [pair for pair, error in failures if is_stale_id_error(error)]
+    dropped = 0
+    if stale:
+        # IDs de la caché que GitHub ya no reconoce: buscarlos de nuevo y reintentar una vez
+        stale_links = [(numbers_by_id[parent], numbers_by_id[child]) for parent, child in stale]
+        fresh = get_issue_node_ids(repo, [number for link in stale_links for number in link], refresh=True)
+        numbers_by_id.update({node_id: number for number, node_id in fresh.items()})
+        retry = [(fresh[parent], fresh[child]) for parent, child in stale_links if parent in fresh and child in fresh]
+        dropped = len(stale) - len(retry)
+        failures = [(pair, error) for pair, error in failures if not is_stale_id_error(error)]
+        failures += add_sub_issues(retry, replace_parent=replace_parent)
+    for (parent, child), error in failures:
+        print(f"{RED}❌ #{numbers_by_id[child]} → #{numbers_by_id[parent]}: {error.stderr[:100]}{NC}")
+    return len(pairs) - len(failures) - dropped, errors + len(failures) + dropped
+
+def build_issue_body(row):
+    """Body de la issue a partir de una fila del CSV"""
+    week = row['Week'].strip()
+    developer = row['Developer'].strip()
+    priority = row['Priority'].strip()
+    estimate = (row.get('Estimate') or '').strip()
+    depends_on = (row.get('Depends On') or '').strip()
+    
+    # Secciones opcionales para el calendarizador del Gantt
+    planning_sections = ""
+    if estimate:
+        planning_sections += f"\n## Estimación\n{estimate}\n"
+    if depends_on:
+        planning_sections += f"\n## Dependencias\n{depends_on}\n"
+    
+    return f"""## Descripción
+{row['Body'].strip()}
+
+## Semana
+{week}
+
+## Desarrollador
+{developer}
+
+## Prioridad
+{priority}
+{planning_sections}
+---
+*Creado automáticamente desde el plan de proyecto*"""
 
 def main():
     print(f"{GREEN}🚀 Creando issues para LOCALIA Project{NC}\n")
@@ -96,61 +285,104 @@ def main():
     skipped = 0
     
     # Leer CSV
+    rows = []
     with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            title = row['Title'].strip()
-            body_text = row['Body'].strip()
-            labels = row['Labels'].strip()
-            week = row['Week'].strip()
-            developer = row['Developer'].strip()
-            priority = row['Priority'].strip()
-            
+        for row in csv.DictReader(f):
             # Validar campos requeridos
-            if not title or not body_text:
+            if not row['Title'].strip() or not row['Body'].strip():
                 print(f"{YELLOW}⚠️  Saltando línea vacía o inválida{NC}")
                 skipped += 1
                 continue
+            rows.append(row)
+    
+    duplicates = duplicate_titles(rows)
+    if duplicates:
+        print(f"{RED}❌ Títulos repetidos en el CSV (cada fila debe tener un título único):{NC}")
+        for title in duplicates:
+            print(f"   - {title}")
+        sys.exit(1)
+    
+    levels, cyclic = hierarchy_levels(rows)
+    for title in cyclic:
+        print(f"{YELLOW}⚠️  Jerarquía circular: '{title}' se creará sin padre{NC}")
+    children = hierarchy_children(rows, cyclic)
+    keys = inherited_priority_keys(levels, children)
+    
+    # Lo más urgente (prioridad, semana) se crea primero alternando desarrolladores;
+    # cada hija entra a la cola cuando su padre ya se creó
+    queue = WriteQueue()
+    for row in (levels[0] if levels else []):
+        queue.push(row, parse_csv_metadata(row), keys[row['Title'].strip()])
+    
+    numbers = {}  # título -> número de issue creada
+    stopped = False
+    attempted = 0
+    with ThreadPoolExecutor(max_workers=CREATE_WORKERS) as pool:
+        running = {}
+        while running or (queue and not stopped):
+            # Pedir trabajo a la cola sólo cuando hay un worker libre: así el
+            # orden lo decide la prioridad, no el orden de envío
+            while len(running) < CREATE_WORKERS and not stopped:
+                row = queue.pop()
+                if row is None:
+                    break
+                title = row['Title'].strip()
+                attempted += 1
+                running[pool.submit(create_issue, title, build_issue_body(row), row['Labels'].strip(), repo)] = row
             
-            # Crear body completo
-            full_body = f"""## Descripción
-{body_text}
-
-## Semana
-{week}
-
-## Desarrollador
-{developer}
-
-## Prioridad
-{priority}
-
----
-*Creado automáticamente desde el plan de proyecto*"""
-            
-            # Crear issue
-            print(f"{YELLOW}📝 Creando: {title}{NC}")
-            success, message = create_issue(title, full_body, labels, repo)
-            
-            if success:
-                print(f"{GREEN}✅ Creada: {title}{NC}")
-                if "sin labels" in message:
-                    print(f"   {YELLOW}⚠️  {message}{NC}")
-                created += 1
-            else:
-                print(f"{RED}❌ Error: {title}{NC}")
-                print(f"   {message}")
-                errors += 1
-            
-            # Pausa para no sobrecargar la API
-            time.sleep(0.3)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                row = running.pop(future)
+                title = row['Title'].strip()
+                try:
+                    success, message = future.result()
+                except CircuitOpenError as e:
+                    if not stopped:
+                        print(f"{RED}❌ {e}. Deteniendo; vuelve a ejecutar más tarde.{NC}")
+                    stopped = True
+                    errors += 1
+                    continue
+                
+                if success:
+                    print(f"{GREEN}✅ Creada: {title}{NC}")
+                    if "sin labels" in message:
+                        print(f"   {YELLOW}⚠️  {message}{NC}")
+                    numbers[title] = issue_number_from_url(message)
+                    created += 1
+                else:
+                    print(f"{RED}❌ Error: {title}{NC}")
+                    print(f"   {message}")
+                    errors += 1
+                
+                # Aunque el padre falle, sus hijas se crean (quedan sin vincular)
+                for child in children.get(title, []):
+                    queue.push(child, parse_csv_metadata(child), keys[child['Title'].strip()])
+    
+    pending = len(rows) - attempted
+    
+    # Vincular hijos con sus padres en lotes
+    links, missing = collect_links(rows, numbers, cyclic)
+    for title, parent in missing:
+        print(f"{YELLOW}⚠️  '{title}': no se encontró el padre '{parent}'{NC}")
+    linked = 0
+    if links and not stopped:
+        print(f"\n{BLUE}🔗 Vinculando {len(links)} sub-issues...{NC}")
+        try:
+            linked, link_errors = link_sub_issues(repo, links)
+            errors += link_errors
+        except (CircuitOpenError, GhError) as e:
+            print(f"{RED}❌ Error vinculando sub-issues: {e}{NC}")
+            errors += 1
     
     # Resumen
     print(f"\n{GREEN}✨ Proceso completado{NC}")
     print(f"{GREEN}✅ Issues creadas: {created}{NC}")
+    if links:
+        print(f"{GREEN}🔗 Sub-issues vinculadas: {linked}/{len(links)}{NC}")
     print(f"{RED}❌ Errores: {errors}{NC}")
     print(f"{YELLOW}⚠️  Saltadas: {skipped}{NC}")
+    if pending:
+        print(f"{YELLOW}⏸️  Sin crear por la interrupción: {pending} (las de menor prioridad){NC}")
     print(f"\n{BLUE}💡 Próximos pasos:{NC}")
     print(f"   1. Ve a: https://github.com/{repo}/issues")
     print(f"   2. Crea los labels necesarios si no existen:")
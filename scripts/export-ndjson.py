@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Script para exportar issues, metadatos de planeación e items del proyecto
+en formato NDJSON (un registro JSON por línea) para análisis externo
+
+Es incremental: sólo agrega los registros modificados desde la última
+exportación (marca de agua guardada junto al archivo de salida).
+Requiere: GitHub CLI (gh) instalado y autenticado
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from gh_client import CircuitOpenError, GhError, paginate_graphql
+from planning import parse_issue_metadata
+
+# Colores
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+RED = '\033[0;31m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+PROJECT_NUMBER = 2
+OWNER = "alex9abril"
+REPO_NAME = "localia-admin"
+REPO = f"{OWNER}/{REPO_NAME}"
+
+OUTPUT_DIR = Path("docs/export")
+PAGE_SIZE = 100
+
+ISSUES_QUERY = """
+query($owner: String!, $name: String!, $since: DateTime, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: %d, after: $cursor, filterBy: {since: $since},
+           orderBy: {field: UPDATED_AT, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        id number title body state url
+        createdAt updatedAt closedAt
+        author { login }
+        labels(first: 20) { nodes { name } }
+        assignees(first: 10) { nodes { login } }
+        milestone { title }
+      }
+    }
+  }
+}
+""" % PAGE_SIZE
+
+PROJECT_ITEMS_QUERY = """
+query($owner: String!, $number: Int!, $cursor: String) {
+  user(login: $owner) {
+    projectV2(number: $number) {
+      items(first: %d, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          id type createdAt updatedAt isArchived
+          content {
+            ... on Issue { number }
+            ... on PullRequest { number }
+            ... on DraftIssue { title }
+          }
+          fieldValues(first: 20) {
+            nodes {
+              ... on ProjectV2ItemFieldSingleSelectValue { name field { ... on ProjectV2FieldCommon { name } } }
+              ... on ProjectV2ItemFieldTextValue { text field { ... on ProjectV2FieldCommon { name } } }
+              ... on ProjectV2ItemFieldNumberValue { number field { ... on ProjectV2FieldCommon { name } } }
+              ... on ProjectV2ItemFieldDateValue { date field { ... on ProjectV2FieldCommon { name } } }
+              ... on ProjectV2ItemFieldIterationValue { title field { ... on ProjectV2FieldCommon { name } } }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+""" % PAGE_SIZE
+
+
+def issue_records(issue):
+    """Registros 'issue' y 'metadata' de una issue"""
+    yield {
+        'type': 'issue',
+        'id': issue['id'],
+        'number': issue['number'],
+        'title': issue['title'],
+        'body': issue['body'],
+        'state': issue['state'],
+        'url': issue['url'],
+        'author': (issue.get('author') or {}).get('login'),
+        'labels': [label['name'] for label in issue['labels']['nodes']],
+        'assignees': [user['login'] for user in issue['assignees']['nodes']],
+        'milestone': (issue.get('milestone') or {}).get('title'),
+        'createdAt': issue['createdAt'],
+        'updatedAt': issue['updatedAt'],
+        'closedAt': issue['closedAt'],
+    }
+    meta = parse_issue_metadata(issue['body'])
+    yield {
+        'type': 'metadata',
+        'number': issue['number'],
+        'updatedAt': issue['updatedAt'],
+        **meta,
+    }
+
+
+def project_item_record(item):
+    """Registro 'project_item' con los valores de campos aplanados"""
+    fields = {}
+    for value in item['fieldValues']['nodes']:
+        if not value or not value.get('field'):
+            continue
+        name = value['field'].get('name')
+        for key in ('name', 'text', 'number', 'date', 'title'):
+            if key in value:
+                fields[name] = value[key]
+                break
+    content = item.get('content') or {}
+    return {
+        'type': 'project_item',
+        'id': item['id'],
+        'itemType': item['type'],
+        'number': content.get('number'),
+        'title': content.get('title'),
+        'archived': item['isArchived'],
+        'fields': fields,
+        'createdAt': item['createdAt'],
+        'updatedAt': item['updatedAt'],
+    }
+
+
+def load_state(state_path):
+    """Leer la marca de agua de la exportación anterior"""
+    if not state_path.exists():
+        return {'issues': None, 'project_items': None}
+    return json.loads(state_path.read_text(encoding='utf-8'))
+
+
+def save_state(state_path, state):
+    """Guardar la marca de agua de forma atómica"""
+    tmp_path = state_path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(state, indent=2), encoding='utf-8')
+    os.replace(tmp_path, state_path)
+
+
+def is_new(record_id, updated_at, mark):
+    """El registro cambió después de la marca de agua
+
+    La marca guarda los ids exportados con el mismo updatedAt límite para no
+    perder ni repetir registros modificados en ese mismo segundo.
+    """
+    if not mark or updated_at > mark['updatedAt']:
+        return True
+    return updated_at == mark['updatedAt'] and record_id not in mark['ids']
+
+
+def advance(mark, record_id, updated_at):
+    """Mover la marca de agua al registro recién exportado"""
+    if mark is None or updated_at > mark['updatedAt']:
+        return {'updatedAt': updated_at, 'ids': [record_id]}
+    if updated_at == mark['updatedAt'] and record_id not in mark['ids']:
+        mark['ids'].append(record_id)
+    return mark
+
+
+def export(output, state, include_project):
+    """Escribir los registros nuevos; devuelve (estado actualizado, contadores)"""
+    counts = {'issue': 0, 'metadata': 0, 'project_item': 0}
+
+    def write(record):
+        output.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        output.write('\n')
+        counts[record['type']] += 1
+
+    # Issues: el filtro 'since' del servidor evita descargar el historial completo
+    mark = state.get('issues')
+    since = mark['updatedAt'] if mark else None
+    for issue in paginate_graphql(ISSUES_QUERY, ['repository', 'issues'],
+                                  {'owner': OWNER, 'name': REPO_NAME, 'since': since}):
+        if not is_new(issue['id'], issue['updatedAt'], mark):
+            continue
+        for record in issue_records(issue):
+            write(record)
+        mark = advance(mark, issue['id'], issue['updatedAt'])
+    state['issues'] = mark
+
+    # Items del proyecto: la API no filtra por fecha, se filtra al vuelo
+    if include_project:
+        previous = state.get('project_items')
+        mark = json.loads(json.dumps(previous)) if previous else None
+        for item in paginate_graphql(PROJECT_ITEMS_QUERY, ['user', 'projectV2', 'items'],
+                                     {'owner': OWNER, 'number': PROJECT_NUMBER}):
+            if not is_new(item['id'], item['updatedAt'], previous):
+                continue
+            write(project_item_record(item))
+            mark = advance(mark, item['id'], item['updatedAt'])
+        state['project_items'] = mark
+
+    return state, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exportar issues y proyecto a NDJSON (incremental)")
+    parser.add_argument('--output-dir', default=str(OUTPUT_DIR), help="Carpeta de salida (default: docs/export)")
+    parser.add_argument('--gzip', action='store_true', help="Comprimir la salida (issues.ndjson.gz)")
+    parser.add_argument('--full', action='store_true', help="Ignorar la marca de agua y exportar todo")
+    parser.add_argument('--no-project', action='store_true', help="No exportar los items del proyecto")
+    args = parser.parse_args()
+
+    print(f"{GREEN}🚀 Exportando datos de planeación a NDJSON{NC}\n")
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / ('issues.ndjson.gz' if args.gzip else 'issues.ndjson')
+    state_path = output_dir / '.export-state.json'
+
+    state = {'issues': None, 'project_items': None} if args.full else load_state(state_path)
+    if state.get('issues'):
+        print(f"{BLUE}📋 Exportando cambios desde {state['issues']['updatedAt']}...{NC}")
+    else:
+        print(f"{BLUE}📋 Exportación completa...{NC}")
+
+    # Los registros se escriben en streaming a un archivo parcial que sólo se
+    # agrega a la salida si la exportación termina; así un error no deja
+    # registros duplicados para la siguiente ejecución.
+    part_path = output_path.with_name(output_path.name + '.part')
+    opener = gzip.open if args.gzip else open
+    try:
+        with opener(part_path, 'wt', encoding='utf-8') as output:
+            state, counts = export(output, state, include_project=not args.no_project)
+    except (CircuitOpenError, GhError) as e:
+        # La marca de agua no avanza: la siguiente ejecución retoma desde aquí
+        part_path.unlink(missing_ok=True)
+        print(f"{RED}❌ Error consultando GitHub: {e}{NC}")
+        sys.exit(1)
+
+    # Cada ejecución agrega un miembro gzip nuevo; zcat/gzip leen el archivo completo
+    if any(counts.values()) or args.full:
+        with open(part_path, 'rb') as part, open(output_path, 'wb' if args.full else 'ab') as out:
+            shutil.copyfileobj(part, out)
+    part_path.unlink()
+
+    state['exportedAt'] = datetime.now(timezone.utc).isoformat()
+    save_state(state_path, state)
+
+    print(f"\n{GREEN}✨ Exportación completada: {output_path}{NC}")
+    print(f"{GREEN}✅ Issues: {counts['issue']}{NC}")
+    print(f"{GREEN}✅ Metadatos: {counts['metadata']}{NC}")
+    print(f"{GREEN}✅ Items del proyecto: {counts['project_item']}{NC}")
+    if not any(counts.values()):
+        print(f"{YELLOW}⚠️  Sin cambios desde la última exportación{NC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Reporte de variación: plan conceptual vs Gantt real
+Cruza assets/gantt-conceptual.csv (plan original) con docs/gantt-import.csv
+(generado por create-gantt-chart.py desde las issues) usando índices por
+nombre de tarea / número de issue y por (semana, desarrollador), sin ciclos
+anidados. Calcula desfase en días laborables, alcance agregado/eliminado y
+diferencias de carga por desarrollador.
+
+Genera:
+- docs/gantt-variance.csv: una fila por tarea (plan o real) con su estado
+- docs/gantt-variance-load.csv: horas plan vs real por semana y desarrollador
+- docs/VARIANCE-REPORT.md: resumen legible
+"""
+
+import argparse
+import csv
+import sys
+import unicodedata
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+
+from planning import format_duration, parse_estimate, parse_int, working_days_between
+
+# Colores
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+RED = '\033[0;31m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+PLAN_PATH = Path("assets/gantt-conceptual.csv")
+ACTUAL_PATH = Path("docs/gantt-import.csv")
+OUTPUT_CSV = Path("docs/gantt-variance.csv")
+LOAD_CSV = Path("docs/gantt-variance-load.csv")
+OUTPUT_MD = Path("docs/VARIANCE-REPORT.md")
+
+DEVELOPERS = ['Dev1', 'Dev2', 'Dev3']
+SHARED_DEVELOPER = 'All'
+
+# Límite de filas por tabla del Markdown (el CSV siempre lleva todo)
+MD_LIMIT = 50
+
+# Estado de cada tarea en el cruce
+MATCHED = 'matched'    # misma tarea en plan y real
+REFINED = 'refined'    # desglosada: sin par exacto pero su (semana, dev) sí existe en el otro lado
+ADDED = 'added'        # sólo en el real, en una (semana, dev) sin plan
+REMOVED = 'removed'    # sólo en el plan, su (semana, dev) no tiene tareas reales
+
+STATUS_LABELS = {
+    MATCHED: 'En plan',
+    REFINED: 'Desglosada',
+    ADDED: 'Agregada',
+    REMOVED: 'Eliminada',
+}
+
+
+def normalize_name(name):
+    """Clave de cruce por nombre: sin acentos, minúsculas y espacios simples"""
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.lower().split())
+
+
+def parse_date(text):
+    # fromisoformat es mucho más rápido que strptime en planes grandes
+    try:
+        return date.fromisoformat((text or '').strip())
+    except ValueError:
+        return None
+
+
+def split_developers(text, developers):
+    """'Dev2+Dev3' -> ['Dev2', 'Dev3']; 'All' -> todo el equipo"""
+    text = (text or '').strip()
+    if text == SHARED_DEVELOPER:
+        return list(developers)
+    return [name.strip() for name in text.split('+') if name.strip()]
+
+
+def load_gantt_csv(path, developers):
+    """Tareas del CSV de Gantt con fechas, horas y desarrolladores ya interpretados"""
+    tasks = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            name = (row.get('Task Name') or '').strip()
+            if not name:
+                continue
+            tasks.append({
+                'name': name,
+                'key': normalize_name(name),
+                'issue': parse_int(row.get('Issue Number')),
+                'week': parse_int(row.get('Week')),
+                'developers': split_developers(row.get('Developer'), developers),
+                'developer_label': (row.get('Developer') or '').strip(),
+                'start': parse_date(row.get('Start Date')),
+                'end': parse_date(row.get('End Date')),
+                'hours': parse_estimate(row.get('Duration')) or 0.0,
+            })
+    return tasks
+
+
+def index_by_bucket(tasks):
+    """(semana, desarrollador) -> tareas; las compartidas aparecen en cada bucket"""
+    index = defaultdict(list)
+    for task in tasks:
+        for dev in task['developers']:
+            index[(task['week'], dev)].append(task)
+    return index
+
+
+def bucket_end(tasks):
+    ends = [task['end'] for task in tasks if task['end']]
+    return max(ends) if ends else None
+
+
+def slip_days(planned, actual):
+    if planned is None or actual is None:
+        return None
+    return working_days_between(planned, actual)
+
+
+def compare(plan, actual):
+    """Cruzar plan y real: filas por tarea, carga por (semana, dev) y resumen"""
+    # Invertido para sacar con pop() en el orden original
+    plan_by_key = defaultdict(list)
+    for task in reversed(plan):
+        plan_by_key[task['key']].append(task)
+    # Fin de cada (semana, dev) calculado una sola vez por lado
+    plan_ends = {key: bucket_end(tasks) for key, tasks in index_by_bucket(plan).items()}
+    actual_ends = {key: bucket_end(tasks) for key, tasks in index_by_bucket(actual).items()}
+
+    rows = []
+    matched_plan = set()
+
+    # 1. Tareas reales: par exacto por nombre, si no, por (semana, dev)
+    for task in actual:
+        candidates = plan_by_key.get(task['key'])
+        planned = None
+        if candidates:
+            planned = candidates.pop()
+            matched_plan.add(id(planned))
+            status = MATCHED
+        else:
+            keys = [(task['week'], dev) for dev in task['developers'] if (task['week'], dev) in plan_ends]
+            status = REFINED if keys else ADDED
+
+        if planned:
+            planned_start, planned_end = planned['start'], planned['end']
+        elif status == REFINED:
+            planned_start = None
+            planned_end = max(filter(None, (plan_ends[key] for key in keys)), default=None)
+        else:
+            planned_start = planned_end = None
+
+        rows.append({
+            'Source': 'actual',
+            'Task Name': task['name'],
+            'Issue Number': task['issue'] or '',
+            'Week': task['week'] or '',
+            'Developer': task['developer_label'],
+            'Status': status,
+            'Planned Task': planned['name'] if planned else '',
+            'Planned Start': planned_start or '',
+            'Planned End': planned_end or '',
+            'Actual Start': task['start'] or '',
+            'Actual End': task['end'] or '',
+            'Start Slip Days': _blank(slip_days(planned_start, task['start'])),
+            'End Slip Days': _blank(slip_days(planned_end, task['end'])),
+            'Planned Hours': planned['hours'] if planned else '',
+            'Actual Hours': task['hours'],
+        })
+
+    # 2. Tareas del plan sin par exacto
+    for task in plan:
+        if id(task) in matched_plan:
+            continue
+        keys = [(task['week'], dev) for dev in task['developers'] if (task['week'], dev) in actual_ends]
+        actual_end = max(filter(None, (actual_ends[key] for key in keys)), default=None)
+        rows.append({
+            'Source': 'plan',
+            'Task Name': task['name'],
+            'Issue Number': '',
+            'Week': task['week'] or '',
+            'Developer': task['developer_label'],
+            'Status': REFINED if keys else REMOVED,
+            'Planned Task': task['name'],
+            'Planned Start': task['start'] or '',
+            'Planned End': task['end'] or '',
+            'Actual Start': '',
+            'Actual End': actual_end or '',
+            'Start Slip Days': '',
+            'End Slip Days': _blank(slip_days(task['end'], actual_end)),
+            'Planned Hours': task['hours'],
+            'Actual Hours': '',
+        })
+
+    # 3. Carga por (semana, dev): las tareas compartidas reparten sus horas
+    loads = defaultdict(lambda: [0.0, 0.0])
+    for side, tasks in ((0, plan), (1, actual)):
+        for task in tasks:
+            if not task['developers']:
+                continue
+            share = task['hours'] / len(task['developers'])
+            for dev in task['developers']:
+                loads[(task['week'], dev)][side] += share
+
+    planned_end = bucket_end(plan)
+    actual_end = bucket_end(actual)
+    summary = {
+        'planned_end': planned_end,
+        'actual_end': actual_end,
+        'project_slip': slip_days(planned_end, actual_end),
+        'planned_hours': sum(task['hours'] for task in plan),
+        'actual_hours': sum(task['hours'] for task in actual),
+        # REFINED sale en ambos lados: las tareas del plan desglosadas se cuentan
+        # aparte de las subtareas reales en que se desglosaron
+        'counts': {
+            status: sum(1 for row in rows if row['Status'] == status and (status != REFINED or row['Source'] == 'plan'))
+            for status in (MATCHED, REFINED, ADDED, REMOVED)
+        },
+        'refined_subtasks': sum(1 for row in rows if row['Status'] == REFINED and row['Source'] == 'actual'),
+    }
+    return rows, dict(loads), summary
+
+
+def _blank(value):
+    return '' if value is None else value
+
+
+def write_csv_outputs(rows, loads):
+    OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
+    with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else ['Task Name'])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    with open(LOAD_CSV, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Week', 'Developer', 'Planned Hours', 'Actual Hours', 'Delta Hours'])
+        for (week, dev), (planned, actual) in sorted(loads.items(), key=_load_key):
+            writer.writerow([week or '', dev, round(planned, 2), round(actual, 2), round(actual - planned, 2)])
+
+
+def _load_key(item):
+    (week, dev), _ = item
+    return (week is None, week or 0, dev)
+
+
+def _signed_days(days):
+    if days in ('', None):
+        return '-'
+    return f"+{days}" if days > 0 else str(days)
+
+
+def generate_markdown(rows, loads, summary, plan_path, actual_path):
+    """Resumen en Markdown; las tablas largas se recortan a MD_LIMIT filas"""
+    counts = summary['counts']
+    md = f"""# 📉 Variación Plan vs Real
+
+Plan: `{plan_path}` · Real: `{actual_path}`
+
+## 📅 Resumen
+
+| Métrica | Plan | Real | Variación |
+|---|---|---|---|
+| Fin del proyecto | {summary['planned_end'] or '-'} | {summary['actual_end'] or '-'} | {_signed_days(summary['project_slip'])} días laborables |
+| Horas totales | {summary['planned_hours']:.0f}h | {summary['actual_hours']:.0f}h | {summary['actual_hours'] - summary['planned_hours']:+.0f}h |
+
+- Tareas en plan con par exacto: {counts[MATCHED]}
+- Tareas del plan desglosadas (sin par exacto, misma semana y desarrollador): {counts[REFINED]}, en {summary['refined_subtasks']} subtareas reales
+- Alcance agregado: {counts[ADDED]} tareas
+- Alcance eliminado: {counts[REMOVED]} tareas
+
+"""
+
+    # Carga por desarrollador
+    totals = defaultdict(lambda: [0.0, 0.0])
+    weeks = set()
+    for (week, dev), (planned, actual) in loads.items():
+        totals[dev][0] += planned
+        totals[dev][1] += actual
+        weeks.add(week)
+    md += "## 👥 Carga por Desarrollador\n\n| Desarrollador | Plan | Real | Δ |\n|---|---|---|---|\n"
+    for dev in sorted(totals):
+        planned, actual = totals[dev]
+        md += f"| {dev} | {planned:.0f}h | {actual:.0f}h | {actual - planned:+.0f}h |\n"
+
+    devs = sorted(totals)
+    weeks = sorted(weeks, key=lambda week: (week is None, week or 0))
+    md += "\n### Por semana (plan → real)\n\n"
+    md += "| Semana | " + " | ".join(devs) + " |\n|---|" + "---|" * len(devs) + "\n"
+    for week in weeks:
+        cells = []
+        for dev in devs:
+            planned, actual = loads.get((week, dev), (0.0, 0.0))
+            cells.append(f"{planned:.0f} → {actual:.0f}h ({actual - planned:+.0f})")
+        md += f"| {week if week is not None else '-'} | " + " | ".join(cells) + " |\n"
+
+    # Cambios de alcance
+    md += "\n## 📦 Cambios de Alcance\n"
+    for status, title in ((ADDED, "➕ Agregadas"), (REMOVED, "➖ Eliminadas")):
+        items = [row for row in rows if row['Status'] == status]
+        md += f"\n### {title} ({len(items)})\n\n"
+        if not items:
+            md += "Ninguna.\n"
+        for row in items[:MD_LIMIT]:
+            issue = f"#{row['Issue Number']} " if row['Issue Number'] else ""
+            md += f"- {issue}{row['Task Name']} (Semana {row['Week'] or '-'}, {row['Developer'] or '-'})\n"
+        if len(items) > MD_LIMIT:
+            md += f"- ... y {len(items) - MD_LIMIT} más (ver `{OUTPUT_CSV}`)\n"
+
+    # Desfase
+    slipped = [row for row in rows if row['End Slip Days'] not in ('', None) and row['End Slip Days'] != 0]
+    slipped.sort(key=lambda row: -abs(row['End Slip Days']))
+    md += f"\n## ⏱️ Desfase por Tarea ({len(slipped)} con fecha de fin distinta)\n\n"
+    if slipped:
+        md += "| Tarea | Estado | Fin plan | Fin real | Desfase |\n|---|---|---|---|---|\n"
+        for row in slipped[:MD_LIMIT]:
+            issue = f"#{row['Issue Number']} " if row['Issue Number'] else ""
+            md += (f"| {issue}{row['Task Name']} | {STATUS_LABELS[row['Status']]} | {row['Planned End']} | "
+                   f"{row['Actual End'] or '-'} | {_signed_days(row['End Slip Days'])} días |\n")
+        if len(slipped) > MD_LIMIT:
+            md += f"\n... y {len(slipped) - MD_LIMIT} más (ver `{OUTPUT_CSV}`)\n"
+    else:
+        md += "Todas las tareas terminan en la fecha planeada.\n"
+
+    md += f"""
+## 📝 Notas
+
+- El desfase se mide en días laborables (lunes a viernes); positivo = retraso
+- Las tareas desglosadas se comparan contra el fin de su semana/desarrollador en el otro Gantt
+- Las tareas de `{SHARED_DEVELOPER}` o `DevA+DevB` reparten sus horas entre esos desarrolladores
+- Detalle completo: `{OUTPUT_CSV}` y `{LOAD_CSV}`
+"""
+    return md
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparar el plan conceptual contra el Gantt real")
+    parser.add_argument('--plan', default=str(PLAN_PATH), help="CSV del plan original")
+    parser.add_argument('--actual', default=str(ACTUAL_PATH), help="CSV generado por create-gantt-chart.py")
+    args = parser.parse_args()
+    plan_path, actual_path = Path(args.plan), Path(args.actual)
+
+    print(f"{GREEN}🚀 Generando reporte de variación plan vs real{NC}\n")
+
+    for path in (plan_path, actual_path):
+        if not path.exists():
+            print(f"{RED}❌ No se encontró el archivo: {path}{NC}")
+            if path == actual_path:
+                print(f"{YELLOW}💡 Genera el Gantt real con: python3 scripts/create-gantt-chart.py{NC}")
+            sys.exit(1)
+
+    print(f"{BLUE}📋 Leyendo planes...{NC}")
+    plan = load_gantt_csv(plan_path, DEVELOPERS)
+    actual = load_gantt_csv(actual_path, DEVELOPERS)
+    print(f"{GREEN}✅ Plan: {len(plan)} tareas · Real: {len(actual)} tareas{NC}\n")
+
+    rows, loads, summary = compare(plan, actual)
+    write_csv_outputs(rows, loads)
+    OUTPUT_MD.write_text(generate_markdown(rows, loads, summary, plan_path, actual_path), encoding='utf-8')
+
+    counts = summary['counts']
+    print(f"{GREEN}✅ Creado: {OUTPUT_CSV}{NC}")
+    print(f"{GREEN}✅ Creado: {LOAD_CSV}{NC}")
+    print(f"{GREEN}✅ Creado: {OUTPUT_MD}{NC}\n")
+    print(f"{BLUE}📊 En plan: {counts[MATCHED]} · Desglosadas: {counts[REFINED]} "
+          f"(en {summary['refined_subtasks']} subtareas) · "
+          f"Agregadas: {counts[ADDED]} · Eliminadas: {counts[REMOVED]}{NC}")
+    slip = summary['project_slip']
+    if slip:
+        color = RED if slip > 0 else GREEN
+        print(f"{color}📅 Fin del proyecto: {_signed_days(slip)} días laborables "
+              f"({summary['planned_end']} → {summary['actual_end']}){NC}")
+    print(f"{BLUE}⏱️  Horas: {format_duration(summary['planned_hours'])} plan vs "
+          f"{format_duration(summary['actual_hours'])} real{NC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Renderizador de Gantt en SVG, sin herramientas externas
+Dibuja las tareas calendarizadas por schedule_tasks() en el servidor para no
+depender de Mermaid en el navegador, que se vuelve muy lento con muchas tareas:
+- Páginas: una fila por tarea, agrupadas por desarrollador, con bandas por
+  semana; cada página tiene a lo más `rows_per_page` filas, así que su tamaño
+  no depende del total de tareas
+- Vista general: un carril por desarrollador; las barras que caen en el mismo
+  píxel se fusionan, así que el archivo crece con el ancho, no con las tareas
+"""
+
+import math
+from xml.sax.saxutils import escape
+
+from planning import DAYS_PER_WEEK, HOURS_PER_DAY, WEEK_HOURS, format_duration, working_offset_to_date
+
+ROWS_PER_PAGE = 400
+ROW_HEIGHT = 22
+BAR_HEIGHT = 14
+LANE_HEIGHT = 28
+HEADER_HEIGHT = 44
+LABEL_WIDTH = 340
+LABEL_CHARS = 48
+MARGIN = 12
+MAX_DAY_WIDTH = 28   # px por día laborable en planes cortos
+MIN_DAY_WIDTH = 3    # ... y en páginas que abarcan muchas semanas
+MAX_CHART_WIDTH = 2400
+TICK_MIN_SPACING = 18  # px por día para rotular cada día
+
+PALETTE = ['#0366d6', '#28a745', '#6f42c1', '#e36209', '#17a2b8', '#b08800', '#ea4aaa', '#586069']
+CRITICAL_COLOR = '#d73a49'
+WEEK_BAND_COLOR = '#f6f8fa'
+SECTION_COLOR = '#eaecef'
+FONT = 'font-family="-apple-system,Segoe UI,Helvetica,Arial,sans-serif"'
+
+
+def _developer_order(entries, developers):
+    """Desarrolladores en el orden dado, seguidos de los que sólo aparecen en las tareas"""
+    order = list(developers or [])
+    seen = set(order)
+    for entry in entries:
+        if entry['developer'] not in seen:
+            seen.add(entry['developer'])
+            order.append(entry['developer'])
+    return order
+
+
+class _TimeAxis:
+    """Escala de horas laborables a píxeles entre semanas completas, con bandas y marcas
+
+    Cada página usa sólo la ventana de semanas de sus propias tareas, así que
+    tampoco crece a lo ancho con planes muy largos.
+    """
+
+    def __init__(self, start_date, first_hours, last_hours, min_day_width=MIN_DAY_WIDTH):
+        self.first_week = int(first_hours // WEEK_HOURS)
+        last_week = max(self.first_week + 1, math.ceil(last_hours / WEEK_HOURS - 1e-9))
+        self.weeks = last_week - self.first_week
+        days = self.weeks * DAYS_PER_WEEK
+        self.day_width = max(min_day_width, min(MAX_DAY_WIDTH, MAX_CHART_WIDTH / days))
+        self.width = days * self.day_width
+        self.origin = self.first_week * WEEK_HOURS
+        self.start_date = start_date
+
+    @classmethod
+    def for_entries(cls, start_date, entries, min_day_width=MIN_DAY_WIDTH):
+        return cls(start_date,
+                   min((entry['start_hours'] for entry in entries), default=0.0),
+                   max((entry['finish_hours'] for entry in entries), default=0.0),
+                   min_day_width)
+
+    def x(self, hours):
+        return LABEL_WIDTH + (hours - self.origin) / HOURS_PER_DAY * self.day_width
+
+    def background(self, top, height):
+        """Bandas de semana alternadas, encabezados y marcas de día"""
+        parts = []
+        week_width = DAYS_PER_WEEK * self.day_width
+        # Con semanas angostas sólo se rotula una de cada N para que no se encimen
+        label_every = max(1, math.ceil(90 / week_width))
+        for offset in range(self.weeks):
+            week = self.first_week + offset
+            x = LABEL_WIDTH + offset * week_width
+            if week % 2 == 0:
+                parts.append(f'<rect x="{x:.1f}" y="{top}" width="{week_width:.1f}" height="{height}" '
+                             f'fill="{WEEK_BAND_COLOR}"/>')
+            if offset % label_every == 0:
+                monday = working_offset_to_date(self.start_date, week * WEEK_HOURS)
+                parts.append(f'<text x="{x + 4:.1f}" y="16" font-size="12" font-weight="600">'
+                             f'Semana {week + 1} · {monday.strftime("%d/%m")}</text>')
+        if self.day_width >= TICK_MIN_SPACING:
+            for day in range(self.weeks * DAYS_PER_WEEK):
+                x = LABEL_WIDTH + day * self.day_width
+                date = working_offset_to_date(self.start_date, self.origin + day * HOURS_PER_DAY)
+                parts.append(f'<text x="{x + 2:.1f}" y="36" font-size="10" fill="#586069">'
+                             f'{date.strftime("%d")}</text>')
+        parts.append(f'<line x1="{LABEL_WIDTH}" y1="{top}" x2="{LABEL_WIDTH + self.width:.1f}" y2="{top}" '
+                     f'stroke="#d1d5da"/>')
+        return parts
+
+
+def _svg(width, height, parts, title):
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+            f'viewBox="0 0 {width:.0f} {height:.0f}" {FONT}>\n'
+            f'<title>{escape(title)}</title>\n'
+            f'<rect width="100%" height="100%" fill="#ffffff"/>\n'
+            + '\n'.join(parts) + '\n</svg>\n')
+
+
+def _label(text):
+    text = ' '.join(str(text).split())
+    return text if len(text) <= LABEL_CHARS else text[:LABEL_CHARS - 1] + '…'
+
+
+def _tooltip(entry):
+    return escape(f"#{entry['id']} {entry['title']}\n"
+                  f"{entry['developer']} · {entry['start'].strftime('%d/%m/%Y')} - "
+                  f"{entry['end'].strftime('%d/%m/%Y')} · {format_duration(entry['duration_hours'])}"
+                  + (" · ruta crítica" if entry['critical'] else ''))
+
+
+def _rows_by_developer(entries, developers):
+    """Filas a dibujar: encabezado de cada desarrollador seguido de sus tareas por inicio"""
+    by_dev = {}
+    for entry in entries:
+        by_dev.setdefault(entry['developer'], []).append(entry)
+    rows = []
+    for dev in _developer_order(entries, developers):
+        tasks = by_dev.get(dev)
+        if not tasks:
+            continue
+        tasks.sort(key=lambda entry: (entry['start_hours'], entry['finish_hours']))
+        rows.append((dev, None))
+        rows.extend((dev, entry) for entry in tasks)
+    return rows
+
+
+def render_pages(entries, start_date, developers=None, rows_per_page=ROWS_PER_PAGE, title="Gantt"):
+    """SVGs paginados: [(número de página, svg)], una fila por tarea
+
+    Si una página empieza a mitad de un desarrollador se repite su encabezado.
+    """
+    entries = list(entries)
+    colors = {dev: PALETTE[i % len(PALETTE)] for i, dev in enumerate(_developer_order(entries, developers))}
+    rows = _rows_by_developer(entries, developers)
+    total_pages = max(1, math.ceil(len(rows) / rows_per_page))
+
+    pages = []
+    for page in range(total_pages):
+        page_rows = rows[page * rows_per_page:(page + 1) * rows_per_page]
+        if page_rows and page_rows[0][1] is not None:
+            page_rows.insert(0, (page_rows[0][0], None))
+        axis = _TimeAxis.for_entries(start_date, [entry for _, entry in page_rows if entry is not None])
+        height = HEADER_HEIGHT + len(page_rows) * ROW_HEIGHT + MARGIN
+        parts = axis.background(HEADER_HEIGHT, len(page_rows) * ROW_HEIGHT)
+
+        for index, (dev, entry) in enumerate(page_rows):
+            y = HEADER_HEIGHT + index * ROW_HEIGHT
+            if entry is None:
+                continue_label = '' if index or page == 0 or rows[page * rows_per_page][1] is None else ' (cont.)'
+                parts.append(f'<rect x="0" y="{y}" width="{LABEL_WIDTH + axis.width + MARGIN:.0f}" '
+                             f'height="{ROW_HEIGHT}" fill="{SECTION_COLOR}" fill-opacity="0.7"/>')
+                parts.append(f'<text x="{MARGIN}" y="{y + 15}" font-size="12" font-weight="600">'
+                             f'{escape(dev)}{continue_label}</text>')
+                continue
+            x0 = axis.x(entry['start_hours'])
+            width = max(axis.x(entry['finish_hours']) - x0, 1.0)
+            color = CRITICAL_COLOR if entry['critical'] else colors[dev]
+            label = _label(f"#{entry['id']} {entry['title']}")
+            parts.append(f'<text x="{MARGIN + 8}" y="{y + 15}" font-size="11">{escape(label)}</text>')
+            parts.append(f'<rect x="{x0:.1f}" y="{y + (ROW_HEIGHT - BAR_HEIGHT) / 2:.1f}" width="{width:.1f}" '
+                         f'height="{BAR_HEIGHT}" rx="3" fill="{color}"><title>{_tooltip(entry)}</title></rect>')
+
+        page_title = f"{title} ({page + 1}/{total_pages})" if total_pages > 1 else title
+        pages.append((page + 1, _svg(LABEL_WIDTH + axis.width + MARGIN, height, parts, page_title)))
+    return pages
+
+
+def render_overview(entries, start_date, developers=None, title="Gantt - vista general"):
+    """SVG con un carril por desarrollador; barras contiguas en el mismo píxel se fusionan"""
+    entries = list(entries)
+    # Toda la línea de tiempo en un ancho fijo: en planes largos un día mide menos de un píxel
+    axis = _TimeAxis.for_entries(start_date, entries, min_day_width=0)
+    order = _developer_order(entries, developers)
+    colors = {dev: PALETTE[i % len(PALETTE)] for i, dev in enumerate(order)}
+    by_dev = {}
+    for entry in entries:
+        by_dev.setdefault(entry['developer'], []).append(entry)
+
+    lanes = [dev for dev in order if by_dev.get(dev)]
+    height = HEADER_HEIGHT + len(lanes) * LANE_HEIGHT + MARGIN
+    parts = axis.background(HEADER_HEIGHT, len(lanes) * LANE_HEIGHT)
+    for index, dev in enumerate(lanes):
+        y = HEADER_HEIGHT + index * LANE_HEIGHT
+        bar_y = y + (LANE_HEIGHT - BAR_HEIGHT) / 2
+        tasks = sorted(by_dev[dev], key=lambda entry: entry['start_hours'])
+        parts.append(f'<text x="{MARGIN}" y="{y + 18}" font-size="12" font-weight="600">'
+                     f'{escape(dev)} ({len(tasks)} tareas)</text>')
+
+        # Fusionar barras que se tocan a menos de medio píxel y son del mismo tipo
+        run = None
+        for entry in tasks:
+            x0, x1 = axis.x(entry['start_hours']), axis.x(entry['finish_hours'])
+            if run and entry['critical'] == run[2] and x0 <= run[1] + 0.5:
+                run[1] = max(run[1], x1)
+                run[3] += 1
+                continue
+            if run:
+                parts.append(_overview_bar(run, bar_y, colors[dev]))
+            run = [x0, x1, entry['critical'], 1]
+        if run:
+            parts.append(_overview_bar(run, bar_y, colors[dev]))
+
+    return _svg(LABEL_WIDTH + axis.width + MARGIN, height, parts, title)
+
+
+def _overview_bar(run, y, color):
+    x0, x1, critical, count = run
+    tooltip = f"{count} tareas" if count > 1 else "1 tarea"
+    return (f'<rect x="{x0:.1f}" y="{y:.1f}" width="{max(x1 - x0, 1.0):.1f}" height="{BAR_HEIGHT}" '
+            f'fill="{CRITICAL_COLOR if critical else color}" stroke="#ffffff" stroke-width="0.5">'
+            f'<title>{tooltip}{" en ruta crítica" if critical else ""}</title></rect>')
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Generador de datos sintéticos masivos para database/schema.sql
+Produce usuarios, negocios, productos y pedidos referencialmente consistentes
+en formato COPY de PostgreSQL, por chunks y en paralelo, con memoria constante:
+- Los IDs son UUIDs deterministas derivados del índice de cada fila, así que
+  cualquier chunk calcula sus llaves foráneas sin consultar a los demás
+- Cada chunk usa su propia semilla: la salida es reproducible sin importar
+  cuántos procesos se usen
+- Las ubicaciones son POINT (longitud, latitud) alrededor de la CDMX, como
+  define el esquema; los pedidos se entregan cerca de su negocio
+
+Modos:
+- Archivos (por defecto): docs/bulk-data/<tabla>/NNNNN.copy[.gz] + load.sh
+  para cargarlos en paralelo con psql
+- Directo (--dsn): cada chunk se envía a su propio `psql -c "COPY ... FROM STDIN"`
+
+Uso (desde la raíz del repo):
+    python3 scripts/generate-bulk-data.py --scale 0.01
+    python3 scripts/generate-bulk-data.py --dsn postgres://postgres@localhost/localia --jobs 8
+"""
+
+import argparse
+import gzip
+import itertools
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+# Colores
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+RED = '\033[0;31m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+OUTPUT_DIR = Path("docs/bulk-data")
+
+# Volúmenes de producción por defecto (se multiplican por --scale)
+DEFAULT_BUSINESSES = 100_000
+DEFAULT_CLIENTS = 1_000_000
+DEFAULT_PRODUCTS = 10_000_000
+DEFAULT_ORDERS = 50_000_000
+
+CHUNK_ROWS = 250_000   # filas por chunk (unidad de paralelismo)
+BATCH_ROWS = 10_000    # filas en memoria por escritura dentro de un chunk
+
+# Prefijo de los UUIDs generados: no choca con los seeds escritos a mano
+UUID_PREFIX = 'b01c'
+KIND_USER = 1
+KIND_BUSINESS = 2
+KIND_CATEGORY = 3
+KIND_PRODUCT = 4
+KIND_ORDER = 5
+
+# Centro de la CDMX y radio (en grados) donde caen los negocios
+CENTER_LON = -99.1332
+CENTER_LAT = 19.4326
+SPREAD = 0.25
+DELIVERY_RADIUS = 0.03
+
+# Ventana de fechas de los datos: 2024 completo
+EPOCH_START = 1704067200  # 2024-01-01 00:00:00 UTC
+EPOCH_SPAN = 366 * 24 * 3600
+
+_MASK64 = (1 << 64) - 1
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+NULL = '\\N'
+
+BUSINESS_CATEGORIES = [
+    'Restaurante', 'Cafetería', 'Pizzería', 'Taquería', 'Panadería', 'Heladería',
+    'Comida Rápida', 'Asiático', 'Saludable/Vegano', 'Pollería', 'Sandwich Shop', 'Repostería',
+]
+BUSINESS_TAGS = ['vegano', 'orgánico', 'sin-gluten', 'local', 'eco', 'familiar', 'gourmet', 'económico']
+BUSINESS_WORDS = ['La Roma', 'El Centro', 'Condesa', 'Coyoacán', 'Del Valle', 'Polanco', 'Narvarte', 'Tlalpan']
+PRODUCT_CATEGORIES = [
+    'Entradas', 'Platos Fuertes', 'Bebidas', 'Postres', 'Tacos', 'Pizzas',
+    'Ensaladas', 'Desayunos', 'Sopas', 'Snacks', 'Pan', 'Café',
+]
+PRODUCT_WORDS = ['Especial', 'de la Casa', 'Clásico', 'Picante', 'Vegano', 'Grande', 'Mini', 'Orgánico']
+ALLERGENS = ['gluten', 'lácteos', 'huevo', 'nueces', 'soya', 'mariscos']
+FIRST_NAMES = ['Ana', 'Luis', 'María', 'José', 'Carmen', 'Jorge', 'Sofía', 'Diego', 'Lucía', 'Miguel']
+LAST_NAMES = ['García', 'Hernández', 'López', 'Martínez', 'González', 'Pérez', 'Sánchez', 'Ramírez']
+PACKAGING_TYPES = ['biodegradable', 'reusable', 'kraft', 'traditional']
+PAYMENT_METHODS = ['localcoins', 'card', 'cash']
+CANCELLATION_REASONS = ['Cliente canceló', 'Local cerrado', 'Sin repartidores disponibles', 'Pago rechazado']
+
+# Estados de pedido con su peso relativo (la mayoría ya entregados)
+ORDER_STATUSES = [
+    ('delivered', 80), ('cancelled', 6), ('refunded', 1), ('pending', 3), ('confirmed', 2),
+    ('preparing', 2), ('ready', 1), ('assigned', 1), ('picked_up', 2), ('in_transit', 2),
+]
+
+OPENING_HOURS = json.dumps({
+    day: {'open': '09:00', 'close': '22:00'}
+    for day in ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+})
+
+
+def make_uuid(kind, index):
+    """UUID v4 válido y determinista para la fila `index` de la entidad `kind`"""
+    return f"{UUID_PREFIX}{kind:04x}-0000-4000-8000-{index:012x}"
+
+
+def unit_hash(seed, index):
+    """Número en [0, 1) derivado de (seed, index) con splitmix64: sin estado compartido"""
+    z = (index * 0x9E3779B97F4A7C15 + seed) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return (z ^ (z >> 31)) / 2.0 ** 64
+
+
+def business_location(seed, business):
+    """Ubicación fija del negocio: la recalcula cualquier chunk que la necesite"""
+    lon = CENTER_LON + (unit_hash(seed + 1, business) - 0.5) * 2 * SPREAD
+    lat = CENTER_LAT + (unit_hash(seed + 2, business) - 0.5) * 2 * SPREAD
+    return lon, lat
+
+
+def copy_text(value):
+    return value.translate(_COPY_ESCAPES)
+
+
+def copy_array(values):
+    return '{' + ','.join(values) + '}' if values else '{}'
+
+
+def timestamp(seconds):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(seconds))
+
+
+def flag(value):
+    return 't' if value else 'f'
+
+
+# ----------------------------------------------------------------------------
+# Generadores por tabla: (config, rng, start, stop) -> líneas COPY
+# ----------------------------------------------------------------------------
+
+def user_rows(config, rng, start, stop):
+    """auth.users: primero los dueños (uno por negocio), luego los clientes"""
+    businesses = config['businesses']
+    for index in range(start, stop):
+        prefix = 'owner' if index < businesses else 'client'
+        created = timestamp(EPOCH_START + int(unit_hash(config['seed'] + 3, index) * EPOCH_SPAN))
+        yield (f"{make_uuid(KIND_USER, index)}\tauthenticated\tauthenticated\t"
+               f"{prefix}{index}@bulk.localia.test\t{created}\t"
+               f'{{"provider": "email", "providers": ["email"]}}\t{{}}\t{created}\t{created}\n')
+
+
+def profile_rows(config, rng, start, stop):
+    businesses = config['businesses']
+    for index in range(start, stop):
+        role = 'local' if index < businesses else 'client'
+        created = timestamp(EPOCH_START + int(unit_hash(config['seed'] + 3, index) * EPOCH_SPAN))
+        yield (f"{make_uuid(KIND_USER, index)}\t{role}\t{rng.choice(FIRST_NAMES)}\t{rng.choice(LAST_NAMES)}\t"
+               f"+52{5500000000 + index}\t{flag(rng.random() < 0.7)}\tt\t{created}\t{created}\n")
+
+
+def category_rows(config, rng, start, stop):
+    """Categorías globales de producto (business_id NULL)"""
+    for index in range(start, stop):
+        name = PRODUCT_CATEGORIES[index]
+        created = timestamp(EPOCH_START)
+        yield (f"{make_uuid(KIND_CATEGORY, index)}\t{NULL}\t{name}\tCategoría global: {name}\t"
+               f"{index + 1}\tt\t{created}\t{created}\n")
+
+
+def business_rows(config, rng, start, stop):
+    seed = config['seed']
+    for index in range(start, stop):
+        lon, lat = business_location(seed, index)
+        category = BUSINESS_CATEGORIES[index % len(BUSINESS_CATEGORIES)]
+        tags = copy_array(rng.sample(BUSINESS_TAGS, rng.randint(0, 3)))
+        eco = rng.random() < 0.4
+        packaging = rng.choice(PACKAGING_TYPES[:3]) if eco else 'traditional'
+        pilot = rng.random() < 0.05
+        commission = rng.choice((5.00, 6.50, 8.00)) if pilot else 15.00
+        reviews = rng.randint(0, 500)
+        rating = round(rng.uniform(3.0, 5.0), 2) if reviews else 0.0
+        created = timestamp(EPOCH_START + int(unit_hash(seed + 3, index) * EPOCH_SPAN))
+        yield (f"{make_uuid(KIND_BUSINESS, index)}\t{make_uuid(KIND_USER, index)}\t"
+               f"{category} {rng.choice(BUSINESS_WORDS)} #{index}\t{category}\t{tags}\t"
+               f"+52{5600000000 + index}\tlocal{index}@bulk.localia.test\t({lon:.7f},{lat:.7f})\t"
+               f"{flag(rng.random() < 0.95)}\t{flag(rng.random() < 0.7)}\t{flag(rng.random() < 0.9)}\t"
+               f"{commission:.2f}\t{flag(pilot)}\t{flag(eco)}\t{packaging}\t{copy_text(OPENING_HOURS)}\t"
+               f"{rating:.2f}\t{reviews}\t{reviews * 4}\t{created}\t{created}\n")
+
+
+def product_rows(config, rng, start, stop):
+    """Productos repartidos en bloques contiguos por negocio"""
+    businesses, products = config['businesses'], config['products']
+    for index in range(start, stop):
+        business = index * businesses // products
+        category = rng.randrange(len(PRODUCT_CATEGORIES))
+        allergens = copy_array(rng.sample(ALLERGENS, rng.randint(1, 2))) if rng.random() < 0.3 else NULL
+        created = timestamp(EPOCH_START + int(rng.random() * EPOCH_SPAN))
+        yield (f"{make_uuid(KIND_PRODUCT, index)}\t{make_uuid(KIND_BUSINESS, business)}\t"
+               f"{PRODUCT_CATEGORIES[category]} {rng.choice(PRODUCT_WORDS)} #{index}\t"
+               f"Producto sintético {index}\t{rng.uniform(15, 450):.2f}\t{make_uuid(KIND_CATEGORY, category)}\t"
+               f"{flag(rng.random() < 0.9)}\t{flag(rng.random() < 0.1)}\t{allergens}\t"
+               f"{index % 50}\t{created}\t{created}\n")
+
+
+def order_rows(config, rng, start, stop):
+    """Pedidos con demanda sesgada: pocos negocios concentran muchos pedidos"""
+    seed, businesses, clients = config['seed'], config['businesses'], config['clients']
+    statuses = [status for status, _ in ORDER_STATUSES]
+    cum_weights = list(itertools.accumulate(weight for _, weight in ORDER_STATUSES))
+    for index in range(start, stop):
+        business = min(int(businesses * rng.random() ** 2), businesses - 1)
+        client = businesses + rng.randrange(clients)
+        lon, lat = business_location(seed, business)
+        lon += rng.uniform(-DELIVERY_RADIUS, DELIVERY_RADIUS)
+        lat += rng.uniform(-DELIVERY_RADIUS, DELIVERY_RADIUS)
+
+        status = rng.choices(statuses, cum_weights=cum_weights)[0]
+        # Montos redondeados antes de sumar: el total cuadra al centavo
+        subtotal = round(rng.uniform(60, 900), 2)
+        tax = round(subtotal * 0.16, 2)
+        fee = rng.choice((0.0, 25.0, 35.0, 45.0))
+        discount = round(subtotal * 0.1, 2) if rng.random() < 0.15 else 0.0
+        tip = rng.choice((0.0, 0.0, 10.0, 20.0, 30.0))
+        total = subtotal + tax + fee - discount + tip
+        paid = status not in ('pending', 'cancelled')
+        payment_status = 'refunded' if status == 'refunded' else ('paid' if paid else 'pending')
+
+        created_s = EPOCH_START + int(rng.random() * EPOCH_SPAN)
+        estimated = rng.randint(20, 60)
+        created = timestamp(created_s)
+        confirmed = timestamp(created_s + rng.randint(30, 300)) if status != 'pending' else NULL
+        actual = delivered = cancelled = reason = NULL
+        updated = created
+        if status in ('delivered', 'refunded'):
+            minutes = max(10, int(rng.gauss(estimated, 10)))
+            actual = str(minutes)
+            delivered = updated = timestamp(created_s + minutes * 60)
+        elif status == 'cancelled':
+            confirmed = NULL
+            cancelled = updated = timestamp(created_s + rng.randint(60, 900))
+            reason = rng.choice(CANCELLATION_REASONS)
+
+        yield (f"{make_uuid(KIND_ORDER, index)}\t{make_uuid(KIND_USER, client)}\t"
+               f"{make_uuid(KIND_BUSINESS, business)}\t{status}\tCalle Sintética {index % 1000}, CDMX\t"
+               f"({lon:.7f},{lat:.7f})\t{subtotal:.2f}\t{tax:.2f}\t{fee:.2f}\t{discount:.2f}\t{tip:.2f}\t"
+               f"{total:.2f}\t{rng.choice(PAYMENT_METHODS)}\t{payment_status}\t{estimated}\t{actual}\t"
+               f"{rng.choice(PACKAGING_TYPES)}\t{created}\t{updated}\t{confirmed}\t{delivered}\t"
+               f"{cancelled}\t{reason}\n")
+
+
+# Orden de carga: cada tabla sólo referencia a las anteriores
+TABLES = [
+    ('auth.users', 'users',
+     ['id', 'aud', 'role', 'email', 'email_confirmed_at', 'raw_app_meta_data', 'raw_user_meta_data',
+      'created_at', 'updated_at'], user_rows),
+    ('core.user_profiles', 'users',
+     ['id', 'role', 'first_name', 'last_name', 'phone', 'phone_verified', 'is_active',
+      'created_at', 'updated_at'], profile_rows),
+    ('core.businesses', 'businesses',
+     ['id', 'owner_id', 'name', 'category', 'tags', 'phone', 'email', 'location',
+      'is_active', 'is_verified', 'accepts_orders', 'commission_rate', 'is_pilot_social',
+      'uses_eco_packaging', 'packaging_type', 'opening_hours', 'rating_average',
+      'total_reviews', 'total_orders', 'created_at', 'updated_at'], business_rows),
+    ('catalog.product_categories', 'categories',
+     ['id', 'business_id', 'name', 'description', 'display_order', 'is_active',
+      'created_at', 'updated_at'], category_rows),
+    ('catalog.products', 'products',
+     ['id', 'business_id', 'name', 'description', 'price', 'category_id', 'is_available',
+      'is_featured', 'allergens', 'display_order', 'created_at', 'updated_at'], product_rows),
+    ('orders.orders', 'orders',
+     ['id', 'client_id', 'business_id', 'status', 'delivery_address_text', 'delivery_location',
+      'subtotal', 'tax_amount', 'delivery_fee', 'discount_amount', 'tip_amount', 'total_amount',
+      'payment_method', 'payment_status', 'estimated_delivery_time', 'actual_delivery_time',
+      'packaging_type', 'created_at', 'updated_at', 'confirmed_at', 'delivered_at',
+      'cancelled_at', 'cancellation_reason'], order_rows),
+]
+GENERATORS = {table: generator for table, _, _, generator in TABLES}
+COLUMNS = {table: columns for table, _, columns, _ in TABLES}
+
+
+def copy_command(table):
+    return f"COPY {table} ({', '.join(COLUMNS[table])}) FROM STDIN"
+
+
+def write_chunk(task):
+    """Generar un chunk y escribirlo a su archivo o a su propio psql (proceso worker)"""
+    table, chunk, start, stop, config = task
+    # Semilla por (tabla, chunk): reproducible con cualquier número de procesos
+    rng = random.Random(f"{config['seed']}:{table}:{chunk}")
+    rows = GENERATORS[table](config, rng, start, stop)
+
+    process = None
+    if config['dsn']:
+        process = subprocess.Popen(
+            ['psql', config['dsn'], '-v', 'ON_ERROR_STOP=1', '-q', '-c', copy_command(table)],
+            stdin=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+        out = process.stdin
+    else:
+        path = Path(config['output_dir']) / table / f"{chunk:05d}.copy"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        out = gzip.open(f"{path}.gz", 'wb', compresslevel=3) if config['gzip'] else open(path, 'wb')
+
+    written = 0
+    try:
+        batch = []
+        for line in rows:
+            batch.append(line)
+            if len(batch) >= BATCH_ROWS:
+                data = ''.join(batch).encode('utf-8')
+                out.write(data)
+                written += len(data)
+                batch.clear()
+        data = ''.join(batch).encode('utf-8')
+        out.write(data)
+        written += len(data)
+    finally:
+        out.close()
+
+    if process is not None:
+        stderr = process.stderr.read().decode(errors='replace')
+        if process.wait() != 0:
+            raise RuntimeError(f"{table} chunk {chunk}: {stderr.strip()[:300]}")
+    return table, stop - start, written
+
+
+def clear_chunks(config, table):
+    """Borrar los chunks de corridas anteriores de una tabla
+
+    load.sh carga todo lo que haya en el directorio: un chunk sobrante (otra
+    --scale, otro --chunk-rows o sin --gzip) duplicaría llaves primarias.
+    """
+    removed = 0
+    for path in (Path(config['output_dir']) / table).glob('*.copy*'):
+        path.unlink()
+        removed += 1
+    return removed
+
+
+def table_counts(config):
+    return {
+        'users': config['businesses'] + config['clients'],
+        'businesses': config['businesses'],
+        'categories': len(PRODUCT_CATEGORIES),
+        'products': config['products'],
+        'orders': config['orders'],
+    }
+
+
+def write_load_script(config, tables):
+    """load.sh: carga los chunks de cada tabla en paralelo, tabla por tabla"""
+    reader = 'gzip -dc' if config['gzip'] else 'cat'
+    suffix = '.copy.gz' if config['gzip'] else '.copy'
+    lines = [
+        '#!/usr/bin/env bash',
+        '# Generado por scripts/generate-bulk-data.py',
+        '# Uso: DATABASE_URL=postgres://usuario@localhost/localia ./load.sh [procesos]',
+        'set -euo pipefail',
+        'JOBS="${1:-4}"',
+        'cd "$(dirname "$0")"',
+        '',
+    ]
+    for table in tables:
+        lines.append(f'echo "Cargando {table}..."')
+        lines.append(
+            f"ls {table}/*{suffix} | xargs -P \"$JOBS\" -I{{}} sh -c "
+            f"'{reader} {{}} | psql \"$DATABASE_URL\" -v ON_ERROR_STOP=1 -q -c \"{copy_command(table)}\"'"
+        )
+    path = Path(config['output_dir']) / 'load.sh'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    path.chmod(0o755)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generar datos sintéticos masivos en formato COPY")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Multiplicador de los volúmenes por defecto (ej. 0.01 para pruebas)")
+    parser.add_argument('--businesses', type=int, help=f"Negocios (default {DEFAULT_BUSINESSES:,})")
+    parser.add_argument('--clients', type=int, help=f"Clientes (default {DEFAULT_CLIENTS:,})")
+    parser.add_argument('--products', type=int, help=f"Productos (default {DEFAULT_PRODUCTS:,})")
+    parser.add_argument('--orders', type=int, help=f"Pedidos (default {DEFAULT_ORDERS:,})")
+    parser.add_argument('--tables', help="Sólo estas tablas, separadas por coma (ej. orders.orders)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="Procesos en paralelo")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="Filas por chunk")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla (misma semilla = mismos datos)")
+    parser.add_argument('--output-dir', default=str(OUTPUT_DIR), help="Directorio de los archivos COPY")
+    parser.add_argument('--gzip', action='store_true', help="Comprimir los chunks")
+    parser.add_argument('--dsn', help="Cargar directo con psql en lugar de escribir archivos")
+    args = parser.parse_args()
+
+    def scaled(value, default):
+        return value if value is not None else max(1, int(default * args.scale))
+
+    config = {
+        'seed': args.seed,
+        'businesses': scaled(args.businesses, DEFAULT_BUSINESSES),
+        'clients': scaled(args.clients, DEFAULT_CLIENTS),
+        'products': scaled(args.products, DEFAULT_PRODUCTS),
+        'orders': scaled(args.orders, DEFAULT_ORDERS),
+        'output_dir': args.output_dir,
+        'gzip': args.gzip,
+        'dsn': args.dsn,
+    }
+    counts = table_counts(config)
+
+    tables = [table for table, _, _, _ in TABLES]
+    if args.tables:
+        wanted = [name.strip() for name in args.tables.split(',') if name.strip()]
+        unknown = [name for name in wanted if name not in COLUMNS]
+        if unknown:
+            print(f"{RED}❌ Tablas desconocidas: {', '.join(unknown)}{NC}")
+            sys.exit(1)
+        tables = [table for table in tables if table in wanted]
+
+    print(f"{GREEN}🚀 Generando datos sintéticos ({args.jobs} procesos){NC}\n")
+    for table, kind, _, _ in TABLES:
+        if table in tables:
+            print(f"   {table}: {counts[kind]:,} filas")
+    target = f"psql {args.dsn.split('@')[-1]}" if args.dsn else args.output_dir
+    print(f"\n{BLUE}📦 Destino: {target}{NC}\n")
+
+    if not args.dsn:
+        removed = sum(clear_chunks(config, table) for table in tables)
+        if removed:
+            print(f"{YELLOW}🧹 {removed} chunks de una corrida anterior eliminados{NC}\n")
+
+    started = time.monotonic()
+    total_rows = total_bytes = 0
+    with Pool(args.jobs) as pool:
+        for table, kind, _, _ in TABLES:
+            if table not in tables:
+                continue
+            count = counts[kind]
+            chunks = max(1, math.ceil(count / args.chunk_rows))
+            tasks = [
+                (table, chunk, chunk * args.chunk_rows, min((chunk + 1) * args.chunk_rows, count), config)
+                for chunk in range(chunks)
+            ]
+            table_started = time.monotonic()
+            done = rows = 0
+            try:
+                # Las tablas van en orden (llaves foráneas); sus chunks, en paralelo
+                for _, chunk_rows, written in pool.imap_unordered(write_chunk, tasks):
+                    done += 1
+                    rows += chunk_rows
+                    total_bytes += written
+                    elapsed = max(time.monotonic() - table_started, 1e-9)
+                    print(f"\r   {table}: {done}/{chunks} chunks, {rows:,} filas ({rows / elapsed:,.0f}/s)",
+                          end='', flush=True)
+            except RuntimeError as e:
+                print(f"\n{RED}❌ {e}{NC}")
+                sys.exit(1)
+            total_rows += rows
+            print(f"\r{GREEN}✅ {table}: {rows:,} filas en {time.monotonic() - table_started:.1f}s{' ' * 20}{NC}")
+
+    elapsed = time.monotonic() - started
+    print(f"\n{GREEN}✨ {total_rows:,} filas ({total_bytes / 1e6:,.1f} MB) en {elapsed:.1f}s{NC}")
+    if not args.dsn:
+        script = write_load_script(config, tables)
+        print(f"\n{BLUE}💡 Para cargar en PostgreSQL:{NC}")
+        print(f"   DATABASE_URL=postgres://usuario@localhost/localia {script} {args.jobs}")
+        print(f"   {YELLOW}⚠️  Para cargas grandes conviene crear los índices después de cargar{NC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,726 @@
+#!/usr/bin/env python3
+"""
+Capa de ejecución compartida para llamadas a GitHub CLI (gh)
+Clasifica fallas, reintenta con backoff exponencial + jitter y abre un
+circuit breaker cuando la tasa de errores se dispara. Las lecturas GraphQL
+idénticas que coinciden en el tiempo comparten una sola llamada, y los IDs
+que nunca cambian (proyecto, node IDs de issues, labels) se guardan entre
+corridas en una caché persistente
+"""
+
+import json
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Colores
+YELLOW = '\033[1;33m'
+NC = '\033[0m'
+
+# Tipos de falla
+RETRYABLE = 'retryable'
+RATE_LIMIT = 'rate_limit'
+PERMANENT = 'permanent'
+
+_RATE_LIMIT_PATTERNS = re.compile(
+    r'rate limit|abuse|secondary rate|http 429|too many requests|submitted too quickly',
+    re.IGNORECASE,
+)
+_RETRYABLE_PATTERNS = re.compile(
+    r'http 5\d\d|bad gateway|service unavailable|gateway time-?out|'
+    r'timed? ?out|timeout|connection (reset|refused)|\beof\b|temporar|'
+    r'could not resolve host|tls handshake|something went wrong',
+    re.IGNORECASE,
+)
+_DUPLICATE_PATTERNS = re.compile(r'already (exists|added)|duplicate', re.IGNORECASE)
+_STALE_ID_PATTERNS = re.compile(r'could not resolve to an? \w+ with|not_found', re.IGNORECASE)
+
+ID_CACHE_PATH = Path("docs/.gh-id-cache.json")
+# createdAt de GitHub viene truncado a segundos y el reloj local puede desfasarse
+CLOCK_SKEW = timedelta(seconds=5)
+
+
+class GhError(Exception):
+    """Falla de un comando gh, ya clasificada"""
+
+    def __init__(self, args, returncode, stderr, kind):
+        self.args_list = list(args)
+        self.returncode = returncode
+        self.stderr = (stderr or '').strip()
+        self.kind = kind
+        super().__init__(self.stderr or f"gh terminó con código {returncode}")
+
+
+class CircuitOpenError(GhError):
+    """El circuit breaker sigue abierto: demasiados errores recientes"""
+
+    def __init__(self, args, message):
+        super().__init__(args, None, message, PERMANENT)
+
+
+def classify_error(stderr, returncode=1):
+    """Clasificar una falla de gh como RETRYABLE, RATE_LIMIT o PERMANENT"""
+    text = stderr or ''
+    if _RATE_LIMIT_PATTERNS.search(text):
+        return RATE_LIMIT
+    if returncode is not None and returncode < 0:
+        # Proceso interrumpido por señal (p. ej. timeout)
+        return RETRYABLE
+    if _RETRYABLE_PATTERNS.search(text):
+        return RETRYABLE
+    return PERMANENT
+
+
+def is_duplicate_error(error):
+    """La falla indica que el recurso ya existía (no es un error real)"""
+    return isinstance(error, GhError) and bool(_DUPLICATE_PATTERNS.search(error.stderr))
+
+
+def is_stale_id_error(error):
+    """GitHub ya no reconoce un ID (p. ej. uno de la caché cuyo recurso se borró)
+
+    Acepta un GhError o el texto del error que devuelven los scripts.
+    """
+    text = error.stderr if isinstance(error, GhError) else (error or '')
+    return bool(_STALE_ID_PATTERNS.search(text))
+
+
+class CircuitBreaker:
+    """Circuit breaker por tasa de errores en una ventana deslizante
+
+    Cerrado: deja pasar todo. Si en las últimas `window` llamadas (con al
+    menos `min_calls`) la proporción de errores transitorios supera
+    `threshold`, se abre durante `cooldown` segundos. Al expirar pasa a
+    semiabierto: una llamada de prueba lo cierra o lo vuelve a abrir con el
+    doble de espera (hasta `max_cooldown`).
+    """
+
+    def __init__(self, window=20, min_calls=5, threshold=0.5, cooldown=30.0, max_cooldown=300.0):
+        self.window = window
+        self.min_calls = min_calls
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.results = deque(maxlen=window)
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def before_call(self):
+        """Segundos que hay que esperar antes de llamar (0 si está cerrado)"""
+        with self.lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(self.opened_at + self.cooldown - time.monotonic(), 0.0)
+
+    def record(self, success):
+        with self.lock:
+            if self.opened_at is not None:
+                # Llamada de prueba en estado semiabierto
+                if success:
+                    self.opened_at = None
+                    self.cooldown = self.base_cooldown
+                    self.results.clear()
+                else:
+                    self.opened_at = time.monotonic()
+                    self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                return
+            self.results.append(bool(success))
+            failures = self.results.count(False)
+            if len(self.results) >= self.min_calls and failures / len(self.results) > self.threshold:
+                self.opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+
+DEFAULT_BREAKER = CircuitBreaker()
+
+
+def backoff_delay(attempt, kind, base=1.0, cap=60.0):
+    """Backoff exponencial con full jitter; los rate limits esperan más"""
+    if kind == RATE_LIMIT:
+        base, cap = base * 15, cap * 5
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def run_gh(args, retries=4, idempotent=True, check_landed=None, breaker=None,
+           max_breaker_wait=600.0, timeout=120):
+    """Ejecutar `gh <args>` con reintentos clasificados
+
+    - PERMANENT: se lanza GhError de inmediato.
+    - RETRYABLE / RATE_LIMIT: se reintenta con backoff + jitter.
+    - Si idempotent=False, antes de cada reintento se llama a check_landed();
+      si devuelve algo distinto de None, la operación ya se aplicó y se
+      devuelve ese valor en lugar de repetirla (evita duplicados).
+
+    Devuelve el stdout (str) o el valor de check_landed().
+    """
+    breaker = breaker or DEFAULT_BREAKER
+    cmd = ['gh'] + list(args)
+    waited = 0.0
+    attempt = 0
+
+    while True:
+        wait = breaker.before_call()
+        if wait > 0:
+            if waited + wait > max_breaker_wait:
+                raise CircuitOpenError(args, "Circuit breaker abierto: demasiados errores de GitHub")
+            print(f"{YELLOW}⏸️  Circuit breaker abierto, esperando {wait:.0f}s...{NC}")
+            time.sleep(wait)
+            waited += wait
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+            returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
+        except subprocess.TimeoutExpired as e:
+            returncode, stdout, stderr = -1, '', f"timeout después de {e.timeout}s"
+
+        if returncode == 0:
+            breaker.record(True)
+            return stdout
+
+        kind = classify_error(stderr, returncode)
+        # Los errores permanentes no indican problemas de salud del servicio
+        breaker.record(kind == PERMANENT)
+        if kind == PERMANENT or attempt >= retries:
+            raise GhError(args, returncode, stderr, kind)
+
+        delay = backoff_delay(attempt, kind)
+        label = "Rate limit" if kind == RATE_LIMIT else "Error transitorio"
+        print(f"{YELLOW}⏳ {label}, reintentando en {delay:.1f}s ({attempt + 1}/{retries})...{NC}")
+        time.sleep(delay)
+        attempt += 1
+
+        if not idempotent and check_landed is not None:
+            try:
+                landed = check_landed()
+            except GhError:
+                # Sin poder verificar no se reintenta: podría duplicarse
+                raise GhError(args, returncode, stderr, kind)
+            if landed is not None:
+                return landed
+
+
+def gh_json(args, **kwargs):
+    """run_gh() + decodificar el stdout como JSON"""
+    return json.loads(run_gh(args, **kwargs))
+
+
+class SingleFlight:
+    """Coalescer llamadas idénticas concurrentes en una sola
+
+    La primera llamada con una llave la ejecuta; las que llegan mientras sigue
+    en vuelo esperan y reciben el mismo resultado (o la misma excepción).
+    Sólo para lecturas: compartir una escritura, o la verificación de
+    check_landed(), podría ocultar un cambio hecho después de iniciar la
+    llamada compartida.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+        try:
+            call['result'] = fn()
+            return call['result']
+        except BaseException as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+
+
+DEFAULT_FLIGHT = SingleFlight()
+
+
+def graphql(query, variables=None, **kwargs):
+    """Ejecutar una consulta GraphQL con `gh api graphql`
+
+    Las variables enteras se pasan con -F (tipadas) y el resto con -f. Las
+    consultas (no las mutaciones) idénticas en vuelo se comparten: el
+    resultado puede llegar a varios hilos, así que no hay que modificarlo.
+    """
+    args = ['api', 'graphql', '-f', f'query={query}']
+    for key, value in (variables or {}).items():
+        if value is None:
+            continue
+        flag = '-F' if isinstance(value, int) and not isinstance(value, bool) else '-f'
+        args.extend([flag, f'{key}={value}'])
+    if query.lstrip().startswith('mutation'):
+        return gh_json(args, **kwargs)
+    key = (tuple(args), tuple(sorted(kwargs.items(), key=lambda item: item[0])))
+    return DEFAULT_FLIGHT.do(key, lambda: gh_json(args, **kwargs))
+
+
+class IdCache:
+    """Caché persistente de IDs inmutables: {espacio: {llave: valor}}
+
+    Los node IDs de GitHub no cambian, así que se conservan entre corridas en
+    docs/.gh-id-cache.json y las búsquedas sólo se hacen cuando falta una
+    entrada. Si GitHub rechaza un ID guardado (el recurso se borró), quien lo
+    usó lo invalida y lo vuelve a resolver (ver is_stale_id_error()).
+    """
+
+    def __init__(self, path=ID_CACHE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def _save(self):
+        # Escritura atómica; si no se puede escribir, la caché sólo dura esta corrida
+        try:
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(self._data, ensure_ascii=False, indent=1, sort_keys=True), encoding='utf-8')
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def get(self, space, key):
+        with self._lock:
+            return self._load().get(space, {}).get(str(key))
+
+    def get_many(self, space, keys):
+        """{llave: valor} de las llaves que están en la caché"""
+        with self._lock:
+            bucket = self._load().get(space, {})
+            return {key: bucket[str(key)] for key in keys if str(key) in bucket}
+
+    def update(self, space, mapping):
+        with self._lock:
+            bucket = self._load().setdefault(space, {})
+            changed = {str(key): value for key, value in mapping.items() if bucket.get(str(key)) != value}
+            if changed:
+                bucket.update(changed)
+                self._save()
+
+    def invalidate(self, space, keys):
+        with self._lock:
+            bucket = self._load().get(space, {})
+            removed = [key for key in keys if bucket.pop(str(key), None) is not None]
+            if removed:
+                self._save()
+
+
+ID_CACHE = IdCache()
+
+
+def iter_json_array(stream, chunk_size=STREAM_CHUNK_SIZE):
+    """Decodificar uno o varios arreglos JSON de un stream, elemento por elemento
+
+    Sirve para la salida de `gh api --paginate`, que imprime un arreglo por
+    página. Sólo se mantiene en memoria el elemento que se está decodificando.
+    """
+    state = {'buffer': '', 'pos': 0, 'eof': False}
+
+    def refill():
+        chunk = stream.read(chunk_size)
+        state['buffer'] = state['buffer'][state['pos']:] + chunk
+        state['pos'] = 0
+        state['eof'] = not chunk
+
+    in_array = False
+    while True:
+        buffer, pos = state['buffer'], state['pos']
+        # Saltar espacios y separadores
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE + ',':
+            pos += 1
+        state['pos'] = pos
+        if pos >= len(buffer):
+            if state['eof']:
+                if in_array:
+                    raise ValueError("JSON incompleto: falta ']'")
+                return
+            refill()
+            continue
+
+        char = buffer[pos]
+        if not in_array:
+            if char != '[':
+                raise ValueError(f"Se esperaba un arreglo JSON, se encontró {char!r}")
+            in_array = True
+            state['pos'] = pos + 1
+            continue
+        if char == ']':
+            in_array = False
+            state['pos'] = pos + 1
+            continue
+
+        try:
+            item, end = _DECODER.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if state['eof']:
+                raise
+            # Elemento incompleto: leer más y volver a intentar
+            refill()
+            continue
+        if end == len(buffer) and not state['eof']:
+            # Un número al final del buffer podría seguir en el siguiente bloque
+            refill()
+            continue
+        state['pos'] = end
+        yield item
+
+
+def stream_gh_json(args, retries=4, breaker=None):
+    """Ejecutar `gh <args>` y entregar los elementos de su salida JSON en streaming
+
+    Los reintentos sólo aplican si la falla ocurre antes de entregar el primer
+    elemento; después se lanza GhError para no repetir datos.
+    """
+    breaker = breaker or DEFAULT_BREAKER
+    attempt = 0
+    while True:
+        process = subprocess.Popen(
+            ['gh'] + list(args),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+        )
+        yielded = 0
+        try:
+            for item in iter_json_array(process.stdout):
+                yielded += 1
+                yield item
+        except (ValueError, GeneratorExit):
+            process.kill()
+            raise
+        finally:
+            process.stdout.close()
+            stderr = process.stderr.read()
+            process.stderr.close()
+            returncode = process.wait()
+
+        if returncode == 0:
+            breaker.record(True)
+            return
+
+        kind = classify_error(stderr, returncode)
+        breaker.record(kind == PERMANENT)
+        if kind == PERMANENT or yielded or attempt >= retries:
+            raise GhError(args, returncode, stderr, kind)
+        delay = backoff_delay(attempt, kind)
+        print(f"{YELLOW}⏳ Error transitorio, reintentando en {delay:.1f}s ({attempt + 1}/{retries})...{NC}")
+        time.sleep(delay)
+        attempt += 1
+
+
+# Campos de `gh issue list --json` -> cómo obtenerlos de la API REST
+_REST_ISSUE_FIELDS = {
+    'id': lambda i: i['node_id'],
+    'number': lambda i: i['number'],
+    'title': lambda i: i['title'],
+    'body': lambda i: i.get('body') or '',
+    'state': lambda i: i['state'].upper(),
+    'url': lambda i: i['html_url'],
+    'labels': lambda i: [{'name': label['name']} for label in i.get('labels', [])],
+    'assignees': lambda i: [{'login': user['login']} for user in i.get('assignees', [])],
+    'createdAt': lambda i: i['created_at'],
+    'updatedAt': lambda i: i['updated_at'],
+    'closedAt': lambda i: i['closed_at'],
+}
+
+
+def iter_issues(repo, fields, state='all'):
+    """Recorrer las issues del repositorio página por página
+
+    Usa `gh api --paginate` (REST, 100 por página) y decodifica cada issue al
+    vuelo, conservando sólo los campos pedidos con los mismos nombres que
+    `gh issue list --json`. Los pull requests se descartan y los node IDs
+    vistos quedan en la caché de IDs.
+    """
+    fields = [field.strip() for field in (fields.split(',') if isinstance(fields, str) else fields)]
+    unknown = [field for field in fields if field not in _REST_ISSUE_FIELDS]
+    if unknown:
+        raise ValueError(f"Campos no soportados: {', '.join(unknown)}")
+    getters = [(field, _REST_ISSUE_FIELDS[field]) for field in fields]
+
+    # La API REST siempre incluye el node ID: se aprovecha para llenar la caché
+    node_ids = {}
+    args = ['api', '--paginate', f'repos/{repo}/issues?state={state}&per_page=100']
+    try:
+        for item in stream_gh_json(args):
+            if 'pull_request' in item:
+                continue
+            node_ids[item['number']] = item['node_id']
+            yield {field: getter(item) for field, getter in getters}
+    finally:
+        ID_CACHE.update(f"issue:{repo}", node_ids)
+
+
+def paginate_graphql(query, path, variables=None, **kwargs):
+    """Recorrer una conexión GraphQL página por página, entregando cada nodo
+
+    `query` debe aceptar $cursor y pedir pageInfo { hasNextPage endCursor };
+    `path` es la ruta de llaves desde 'data' hasta la conexión.
+    """
+    cursor = None
+    while True:
+        data = graphql(query, dict(variables or {}, cursor=cursor), **kwargs)['data']
+        for key in path:
+            data = (data or {}).get(key)
+        if not data:
+            return
+        for node in data['nodes']:
+            if node:
+                yield node
+        if not data['pageInfo']['hasNextPage']:
+            return
+        cursor = data['pageInfo']['endCursor']
+
+
+PROJECT_ISSUES_QUERY = """
+query($project: ID!, $cursor: String) {
+  node(id: $project) {
+    ... on ProjectV2 {
+      items(first: 100, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        nodes { content { ... on Issue { id } } }
+      }
+    }
+  }
+}
+"""
+
+
+def get_project_issue_ids(project_id):
+    """Node IDs de las issues que ya están en el proyecto (una lectura paginada)
+
+    Se comparan node IDs y no números: un proyecto de usuario puede tener
+    issues de otros repositorios con el mismo número.
+    """
+    ids = set()
+    for item in paginate_graphql(PROJECT_ISSUES_QUERY, ['node', 'items'], {'project': project_id}):
+        content = item.get('content') or {}
+        if 'id' in content:
+            ids.add(content['id'])
+    return ids
+
+
+def find_recent_issue_by_title(repo, title, created_after, body=None, limit=50):
+    """Buscar entre las issues más recientes una con el título exacto
+
+    Sólo cuentan las creadas a partir de `created_after` (datetime con zona
+    horaria, tomado antes del primer intento): una issue anterior con el mismo
+    título no prueba que el intento fallido haya llegado. Se tolera
+    CLOCK_SKEW de desfase entre el reloj local y el de GitHub. Con `body` se
+    exige también el mismo body, para no confundirla con otra issue del mismo
+    título creada a la vez por otro worker.
+
+    Se listan por fecha de creación en lugar de usar --search porque el
+    índice de búsqueda tarda en reflejar las issues recién creadas.
+    Devuelve la URL de la issue o None.
+    """
+    fields = 'number,title,url,createdAt' + (',body' if body is not None else '')
+    issues = gh_json(
+        ['issue', 'list', '--repo', repo, '--state', 'all', '--limit', str(limit), '--json', fields],
+        retries=2,
+    )
+    threshold = created_after - CLOCK_SKEW
+    for issue in issues:
+        created_at = datetime.fromisoformat(issue['createdAt'].replace('Z', '+00:00'))
+        if issue['title'].strip() != title.strip() or created_at < threshold:
+            continue
+        if body is not None and _normalize_body(issue.get('body')) != _normalize_body(body):
+            continue
+        return issue['url']
+    return None
+
+
+def _normalize_body(body):
+    # GitHub puede devolver el body con \r\n
+    return (body or '').replace('\r\n', '\n').strip()
+
+
+# Sub-issues: la API aún requiere el header de la feature
+SUB_ISSUES_HEADER = 'GraphQL-Features: sub_issues'
+NODE_ID_BATCH = 100
+SUB_ISSUE_BATCH = 50
+
+
+def run_in_batches(items, batch_size, run_batch):
+    """Ejecutar run_batch(lote) por lotes y devolver [(elemento, GhError)] fallidos
+
+    Si un lote falla de forma permanente se parte a la mitad hasta aislar los
+    elementos con error: en el caso normal sólo hay una llamada por lote.
+    """
+    failures = []
+    pending = deque(items[start:start + batch_size] for start in range(0, len(items), batch_size))
+    while pending:
+        batch = pending.popleft()
+        try:
+            run_batch(batch)
+        except CircuitOpenError:
+            raise
+        except GhError as e:
+            if e.kind == PERMANENT and len(batch) > 1:
+                middle = len(batch) // 2
+                pending.appendleft(batch[middle:])
+                pending.appendleft(batch[:middle])
+            else:
+                failures.extend((item, e) for item in batch)
+    return failures
+
+
+def get_issue_node_ids(repo, numbers, batch_size=NODE_ID_BATCH, refresh=False):
+    """Node IDs de varias issues: caché primero, luego una consulta con alias por lote
+
+    Devuelve {número: node ID}; las issues que no existen no aparecen.
+    Con refresh=True se descartan las entradas en caché de esos números.
+    """
+    owner, name = repo.split('/', 1)
+    space = f"issue:{repo}"
+    numbers = set(numbers)
+    if refresh:
+        ID_CACHE.invalidate(space, numbers)
+    ids = ID_CACHE.get_many(space, numbers)
+
+    def run_batch(batch):
+        fields = ' '.join(f"i{number}: issue(number: {number}) {{ id }}" for number in batch)
+        query = f'query {{ repository(owner: "{owner}", name: "{name}") {{ {fields} }} }}'
+        data = graphql(query)['data']['repository']
+        for number in batch:
+            node = data.get(f"i{number}")
+            if node:
+                ids[number] = node['id']
+
+    missing = sorted(numbers - ids.keys())
+    if missing:
+        run_in_batches(missing, batch_size, run_batch)
+        ID_CACHE.update(space, {number: ids[number] for number in missing if number in ids})
+    return ids
+
+
+PROJECT_QUERY = """
+query($owner: String!, $number: Int!) {
+  user(login: $owner) { projectV2(number: $number) { id title } }
+}
+"""
+
+LABELS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    labels(first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes { id name }
+    }
+  }
+}
+"""
+
+
+def get_project(owner, number, refresh=False):
+    """{'id', 'title'} del Project V2 de un usuario (de la caché si ya se buscó)
+
+    Devuelve None si el proyecto no existe; eso no se guarda en la caché.
+    """
+    space, key = 'project', f"{owner}/{number}"
+    if refresh:
+        ID_CACHE.invalidate(space, [key])
+    project = ID_CACHE.get(space, key)
+    if project is None:
+        data = graphql(PROJECT_QUERY, {'owner': owner, 'number': number})
+        project = ((data.get('data') or {}).get('user') or {}).get('projectV2')
+        if project:
+            ID_CACHE.update(space, {key: {'id': project['id'], 'title': project.get('title')}})
+    return project
+
+
+_LABELS_LISTED = set()
+
+
+def get_label_ids(repo, names, refresh=False):
+    """{nombre: ID} de labels del repositorio; los que no existen no aparecen
+
+    Si falta alguno en la caché se leen todos los labels (una consulta
+    paginada) y se guardan. Los nombres no distinguen mayúsculas.
+    """
+    owner, name = repo.split('/', 1)
+    space = f"label:{repo}"
+    wanted = {label.strip().lower(): label.strip() for label in names if label.strip()}
+    if refresh:
+        ID_CACHE.invalidate(space, wanted)
+    ids = ID_CACHE.get_many(space, wanted)
+    # Los labels que no existen no se guardan: se listan a lo más una vez por corrida
+    if len(ids) < len(wanted) and (refresh or repo not in _LABELS_LISTED):
+        labels = {
+            node['name'].lower(): node['id']
+            for node in paginate_graphql(LABELS_QUERY, ['repository', 'labels'], {'owner': owner, 'name': name})
+        }
+        ID_CACHE.update(space, labels)
+        _LABELS_LISTED.add(repo)
+        ids = {key: labels[key] for key in wanted if key in labels}
+    return {wanted[key]: label_id for key, label_id in ids.items()}
+
+
+def add_sub_issues(links, batch_size=SUB_ISSUE_BATCH, replace_parent=False):
+    """Vincular sub-issues con mutaciones addSubIssue con alias, un lote por llamada
+
+    `links` es una lista de (node ID del padre, node ID del hijo). Un vínculo
+    que ya existía (p. ej. al reintentar un lote aplicado a medias) cuenta
+    como éxito. Con replace_parent=True el hijo se mueve aunque ya tenga otro
+    padre. Devuelve [(vínculo, GhError)] de los que fallaron.
+    """
+    replace = ', replaceParent: true' if replace_parent else ''
+
+    def run_batch(batch):
+        fields = ' '.join(
+            f'l{i}: addSubIssue(input: {{issueId: "{parent}", subIssueId: "{child}"{replace}}}) {{ subIssue {{ id }} }}'
+            for i, (parent, child) in enumerate(batch)
+        )
+        run_gh(['api', 'graphql', '-H', SUB_ISSUES_HEADER, '-f', f'query=mutation {{ {fields} }}'])
+
+    return [
+        (link, error)
+        for link, error in run_in_batches(list(links), batch_size, run_batch)
+        if not is_duplicate_error(error)
+    ]
+
+
+def remove_sub_issues(links, batch_size=SUB_ISSUE_BATCH):
+    """Desvincular sub-issues (removeSubIssue con alias); mismo formato que add_sub_issues
+
+    Devuelve [(vínculo, GhError)] de los que fallaron. Un error de ID obsoleto
+    puede venir de la caché de IDs: quien llama decide si refrescar y reintentar.
+    """
+    def run_batch(batch):
+        fields = ' '.join(
+            f'l{i}: removeSubIssue(input: {{issueId: "{parent}", subIssueId: "{child}"}}) {{ subIssue {{ id }} }}'
+            for i, (parent, child) in enumerate(batch)
+        )
+        run_gh(['api', 'graphql', '-H', SUB_ISSUES_HEADER, '-f', f'query=mutation {{ {fields} }}'])
+
+    return run_in_batches(list(links), batch_size, run_batch)
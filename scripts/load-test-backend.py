@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Generador de carga para la API REST del backend (apps/backend)
+Reproduce escenarios ponderados (listar negocios, paginar productos, crear
+pedidos, ...) con asyncio y reporta latencias p50/p95/p99, throughput y
+tasa de errores por escenario
+
+Uso (con el backend corriendo en local: cd apps/backend && npm run start:dev):
+    python scripts/load-test-backend.py --token $LOCALIA_JWT --api-key $LOCALIA_API_KEY \\
+        --concurrency 50 --duration 60
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import ssl
+import sys
+import time
+from array import array
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+# Colores
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+RED = '\033[0;31m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+DEFAULT_BASE_URL = "http://localhost:3000/api"
+SAMPLE_UUID = "11111111-1111-1111-1111-111111111111"  # El mismo ejemplo que usa Swagger
+
+
+def page_query(max_page=10, limit=20, **extra):
+    """Query string de paginación (page/limit de los DTOs List*Dto)"""
+    return '?' + urlencode(dict(page=random.randint(1, max_page), limit=limit, **extra))
+
+
+def order_body():
+    """Body de ejemplo para POST /orders (mismo esquema que el @ApiBody)"""
+    return {
+        'businessId': SAMPLE_UUID,
+        'items': [
+            {'productId': SAMPLE_UUID, 'quantity': random.randint(1, 4)}
+            for _ in range(random.randint(1, 5))
+        ],
+        'deliveryAddressId': SAMPLE_UUID,
+    }
+
+
+# Escenarios: (nombre, peso, método, función que arma el path, función que arma el body)
+SCENARIOS = [
+    ('list_businesses', 25, 'GET', lambda: '/businesses' + page_query(), None),
+    ('business_categories', 5, 'GET', lambda: '/businesses/categories', None),
+    ('page_products', 30, 'GET', lambda: '/catalog/products' + page_query(max_page=50), None),
+    ('search_products', 5, 'GET',
+     lambda: '/catalog/products' + page_query(search=random.choice(['taco', 'café', 'pan', 'pizza'])), None),
+    ('list_categories', 10, 'GET', lambda: '/catalog/categories' + page_query(max_page=3), None),
+    ('list_repartidores', 5, 'GET', lambda: '/repartidores' + page_query(isAvailable='true'), None),
+    ('list_clients', 5, 'GET', lambda: '/clients' + page_query(), None),
+    ('list_service_regions', 5, 'GET', lambda: '/service-regions' + page_query(max_page=2), None),
+    ('create_order', 8, 'POST', lambda: '/orders', order_body),
+    ('orders_stats', 2, 'GET', lambda: '/orders/stats', None),
+]
+
+
+class HttpConnection:
+    """Conexión HTTP/1.1 keep-alive mínima sobre asyncio streams (sin dependencias)"""
+
+    def __init__(self, host, port, use_tls, timeout):
+        self.host = host
+        self.port = port
+        self.ssl = ssl.create_default_context() if use_tls else None
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout
+        )
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers, body=None):
+        """Enviar una petición y leer la respuesta completa; devuelve (status, body)"""
+        if self.writer is None:
+            await self.connect()
+        payload = b'' if body is None else json.dumps(body).encode('utf-8')
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        lines += [f"{key}: {value}" for key, value in headers.items()]
+        if body is not None:
+            lines += ["Content-Type: application/json", f"Content-Length: {len(payload)}"]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + payload)
+        await self.writer.drain()
+        return await asyncio.wait_for(self._read_response(), self.timeout)
+
+    async def _read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("conexión cerrada por el servidor")
+        version, status = status_line.split()[:2]
+        status = int(status)
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            body = b''.join(chunks)
+        else:
+            body = await self.reader.readexactly(int(headers.get('content-length', 0)))
+
+        keep_alive = version == b'HTTP/1.1' or headers.get('connection', '').lower() == 'keep-alive'
+        if headers.get('connection', '').lower() == 'close' or not keep_alive:
+            await self.close()
+        return status, body
+
+
+class Stats:
+    """Latencias y códigos de estado por escenario"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = Counter()
+        self.statuses = {}
+
+    def record(self, scenario, latency, status):
+        self.latencies.setdefault(scenario, array('d')).append(latency)
+        self.statuses.setdefault(scenario, Counter())[status] += 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors[scenario] += 1
+
+
+def percentile(sorted_values, pct):
+    """Percentil por rango más cercano sobre valores ya ordenados"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+async def worker(conn_factory, prefix, headers, stats, deadline, counter, limiter):
+    """Cliente en lazo cerrado: elige un escenario ponderado y lo ejecuta hasta el deadline"""
+    conn = conn_factory()
+    names = [s[0] for s in SCENARIOS]
+    weights = [s[1] for s in SCENARIOS]
+    by_name = {s[0]: s for s in SCENARIOS}
+    try:
+        while time.monotonic() < deadline and counter['remaining'] != 0:
+            if counter['remaining'] > 0:
+                counter['remaining'] -= 1
+            if limiter:
+                await limiter()
+            name = random.choices(names, weights)[0]
+            _, _, method, make_path, make_body = by_name[name]
+            path = prefix + make_path()
+            body = make_body() if make_body else None
+            started = time.perf_counter()
+            try:
+                status, _ = await conn.request(method, path, headers, body)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+                status = type(e).__name__
+                await conn.close()
+            stats.record(name, time.perf_counter() - started, status)
+    finally:
+        await conn.close()
+
+
+def make_rate_limiter(rate):
+    """Limitador global de peticiones por segundo (None = sin límite)"""
+    if not rate:
+        return None
+    interval = 1.0 / rate
+    state = {'next': time.monotonic()}
+
+    async def wait():
+        now = time.monotonic()
+        slot = max(state['next'], now)
+        state['next'] = slot + interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    return wait
+
+
+async def run_load(args):
+    url = urlsplit(args.base_url)
+    use_tls = url.scheme == 'https'
+    host = url.hostname
+    port = url.port or (443 if use_tls else 80)
+
+    def conn_factory():
+        return HttpConnection(host, port, use_tls, args.timeout)
+    prefix = url.path.rstrip('/')
+
+    headers = {'Accept': 'application/json', 'User-Agent': 'localia-load-test'}
+    if args.api_key:
+        headers['X-API-Key'] = args.api_key
+    if args.token:
+        headers['Authorization'] = f"Bearer {args.token}"
+
+    stats = Stats()
+    counter = {'remaining': args.requests if args.requests else -1}
+    limiter = make_rate_limiter(args.rate)
+    started = time.monotonic()
+    deadline = started + args.duration
+    await asyncio.gather(*[
+        worker(conn_factory, prefix, headers, stats, deadline, counter, limiter)
+        for _ in range(args.concurrency)
+    ])
+    return stats, time.monotonic() - started
+
+
+def summarize(stats, elapsed):
+    """Resumen por escenario y total"""
+    rows = []
+    all_latencies = array('d')
+    total_errors = 0
+    for name, latencies in sorted(stats.latencies.items()):
+        values = sorted(latencies)
+        all_latencies.extend(latencies)
+        errors = stats.errors[name]
+        total_errors += errors
+        rows.append({
+            'scenario': name,
+            'requests': len(values),
+            'errors': errors,
+            'error_rate': errors / len(values),
+            'rps': len(values) / elapsed,
+            'p50_ms': percentile(values, 50) * 1000,
+            'p95_ms': percentile(values, 95) * 1000,
+            'p99_ms': percentile(values, 99) * 1000,
+            'statuses': {str(k): v for k, v in stats.statuses[name].items()},
+        })
+    values = sorted(all_latencies)
+    total = {
+        'scenario': 'TOTAL',
+        'requests': len(values),
+        'errors': total_errors,
+        'error_rate': total_errors / len(values) if values else 0.0,
+        'rps': len(values) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(values, 50) * 1000,
+        'p95_ms': percentile(values, 95) * 1000,
+        'p99_ms': percentile(values, 99) * 1000,
+    }
+    return rows, total
+
+
+def print_report(rows, total, elapsed):
+    header = f"{'Escenario':<22} {'Reqs':>7} {'RPS':>8} {'Err%':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(f"\n{BLUE}📊 Resultados ({elapsed:.1f}s){NC}\n")
+    print(header)
+    print('-' * len(header))
+    for row in rows + [total]:
+        color = RED if row['error_rate'] > 0.05 else (YELLOW if row['error_rate'] > 0 else GREEN)
+        print(f"{color}{row['scenario']:<22} {row['requests']:>7} {row['rps']:>8.1f} "
+              f"{row['error_rate'] * 100:>5.1f}% {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}{NC}")
+    for row in rows:
+        if row['errors']:
+            codes = ', '.join(f"{code}×{count}" for code, count in sorted(row['statuses'].items()))
+            print(f"   {YELLOW}⚠️  {row['scenario']}: {codes}{NC}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga para la API del backend LOCALIA")
+    parser.add_argument('--base-url', default=os.environ.get('LOCALIA_API_URL', DEFAULT_BASE_URL),
+                        help=f"URL base de la API (default: {DEFAULT_BASE_URL})")
+    parser.add_argument('--api-key', default=os.environ.get('LOCALIA_API_KEY'),
+                        help="API Key (header X-API-Key); también LOCALIA_API_KEY")
+    parser.add_argument('--token', default=os.environ.get('LOCALIA_JWT'),
+                        help="JWT de Supabase (Authorization: Bearer); también LOCALIA_JWT")
+    parser.add_argument('--concurrency', type=int, default=20, help="Clientes concurrentes (default: 20)")
+    parser.add_argument('--duration', type=float, default=30, help="Duración en segundos (default: 30)")
+    parser.add_argument('--requests', type=int, default=0, help="Detener después de N peticiones (0 = sin límite)")
+    parser.add_argument('--rate', type=float, default=0, help="Peticiones por segundo en total (0 = sin límite)")
+    parser.add_argument('--timeout', type=float, default=10, help="Timeout por petición en segundos")
+    parser.add_argument('--only', help="Escenarios a ejecutar, separados por coma")
+    parser.add_argument('--json', dest='json_path', help="Guardar el resumen en un archivo JSON")
+    args = parser.parse_args()
+
+    if args.only:
+        wanted = {name.strip() for name in args.only.split(',')}
+        SCENARIOS[:] = [s for s in SCENARIOS if s[0] in wanted]
+        if not SCENARIOS:
+            print(f"{RED}❌ Ningún escenario coincide con: {args.only}{NC}")
+            sys.exit(1)
+
+    print(f"{GREEN}🚀 Prueba de carga contra {args.base_url}{NC}\n")
+    print(f"{BLUE}📋 {args.concurrency} clientes, {args.duration:.0f}s, escenarios: "
+          f"{', '.join(s[0] for s in SCENARIOS)}{NC}")
+    if not args.token:
+        print(f"{YELLOW}⚠️  Sin --token: los endpoints protegidos responderán 401{NC}")
+
+    stats, elapsed = asyncio.run(run_load(args))
+    if not stats.latencies:
+        print(f"{RED}❌ No se completó ninguna petición{NC}")
+        sys.exit(1)
+
+    rows, total = summarize(stats, elapsed)
+    print_report(rows, total, elapsed)
+
+    if args.json_path:
+        Path(args.json_path).write_text(
+            json.dumps({'base_url': args.base_url, 'concurrency': args.concurrency,
+                        'elapsed_s': elapsed, 'scenarios': rows, 'total': total}, indent=2),
+            encoding='utf-8'
+        )
+        print(f"\n{GREEN}✅ Resumen guardado en: {args.json_path}{NC}")
+
+    print(f"\n{GREEN}✨ Proceso completado{NC}")
+
+
+if __name__ == "__main__":
+    main()
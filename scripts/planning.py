@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+"""
+Utilidades de planeación compartidas por los scripts del proyecto
+Lectura de metadatos de issues/CSV, motor de calendarización para el Gantt,
+asignación de desarrolladores por capacidad y cola de escrituras por prioridad
+"""
+
+import bisect
+import heapq
+import re
+import threading
+from collections import defaultdict
+from datetime import timedelta
+
+HOURS_PER_DAY = 8
+DAYS_PER_WEEK = 5
+WEEK_HOURS = HOURS_PER_DAY * DAYS_PER_WEEK
+WORKDAY_START_HOUR = 9  # Las horas laborables de cada día empiezan a las 9:00
+
+PRIORITY_RANK = {'high': 0, 'medium': 1, 'low': 2}
+_NO_WEEK = 10 ** 6  # Las escrituras sin semana van después de cualquier semana
+
+# Secciones que create-issues.py escribe en el body de cada issue
+SECTION_WEEK = 'Semana'
+SECTION_DEVELOPER = 'Desarrollador'
+SECTION_PRIORITY = 'Prioridad'
+SECTION_ESTIMATE = 'Estimación'
+SECTION_DEPENDENCIES = 'Dependencias'
+
+# Labels que exigen una habilidad concreta del desarrollador
+SKILL_LABELS = ('backend', 'mobile', 'web')
+
+# Peso del exceso de capacidad frente al simple desbalance de carga
+OVERLOAD_PENALTY = 10.0
+
+_ESTIMATE_RE = re.compile(r'^\s*(\d+(?:[.,]\d+)?)\s*([a-zA-Z]*)\s*$')
+_ISSUE_REF_RE = re.compile(r'^#(\d+)$')
+
+
+def parse_body_sections(body):
+    """Separar el body de una issue en secciones '## Título' -> contenido"""
+    sections = {}
+    current = None
+    for line in (body or '').split('\n'):
+        if line.startswith('## '):
+            current = line[3:].strip()
+            sections[current] = []
+        elif line.strip() == '---':
+            current = None
+        elif current is not None:
+            sections[current].append(line)
+    return {name: '\n'.join(lines).strip() for name, lines in sections.items()}
+
+
+def set_body_section(body, name, value):
+    """Reemplazar el contenido de la sección '## name' (o agregarla antes del '---')"""
+    lines = (body or '').split('\n')
+    start = next((i for i, line in enumerate(lines) if line.startswith('## ') and line[3:].strip() == name), None)
+    if start is None:
+        footer = next((i for i, line in enumerate(lines) if line.strip() == '---'), len(lines))
+        return '\n'.join(lines[:footer] + [f"## {name}", value, ''] + lines[footer:])
+    end = start + 1
+    while end < len(lines) and not lines[end].startswith('## ') and lines[end].strip() != '---':
+        end += 1
+    return '\n'.join(lines[:start + 1] + [value, ''] + lines[end:])
+
+
+def parse_estimate(text):
+    """Convertir '16h', '2d', '1w' o '16' a horas (None si no es válido)"""
+    if not text:
+        return None
+    match = _ESTIMATE_RE.match(str(text).split('\n')[0])
+    if not match:
+        return None
+    value = float(match.group(1).replace(',', '.'))
+    unit = match.group(2).lower()
+    if unit in ('', 'h', 'hr', 'hrs', 'hora', 'horas', 'hour', 'hours'):
+        return value
+    if unit in ('d', 'dia', 'dias', 'día', 'días', 'day', 'days'):
+        return value * HOURS_PER_DAY
+    if unit in ('w', 'sem', 'semana', 'semanas', 'week', 'weeks'):
+        return value * WEEK_HOURS
+    return None
+
+
+def parse_dependencies(text):
+    """Leer referencias de dependencias: '#12' (número de issue) o títulos
+
+    Se aceptan separadas por ';', ',' o saltos de línea. Los títulos pueden
+    contener comas, así que cuando hay ';' o saltos de línea sólo se usan esos.
+    """
+    if not text:
+        return []
+    text = text.strip()
+    if ';' in text or '\n' in text:
+        parts = re.split(r'[;\n]', text)
+    else:
+        parts = text.split(',') if all(
+            _ISSUE_REF_RE.match(p.strip().lstrip('- ')) for p in text.split(',') if p.strip()
+        ) else [text]
+
+    refs = []
+    for part in parts:
+        part = part.strip().lstrip('- ').strip()
+        if not part:
+            continue
+        match = _ISSUE_REF_RE.match(part)
+        refs.append(int(match.group(1)) if match else part)
+    return refs
+
+
+def parse_int(text):
+    """Primer entero de un texto (None si no hay)"""
+    try:
+        return int(str(text).strip().split('\n')[0])
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_issue_metadata(body):
+    """Extraer semana, desarrollador, prioridad, estimación y dependencias del body"""
+    sections = parse_body_sections(body)
+    return {
+        'week': parse_int(sections.get(SECTION_WEEK)),
+        'developer': (sections.get(SECTION_DEVELOPER) or '').split('\n')[0].strip() or None,
+        'priority': (sections.get(SECTION_PRIORITY) or '').split('\n')[0].strip() or None,
+        'estimate': parse_estimate(sections.get(SECTION_ESTIMATE)),
+        'depends_on': parse_dependencies(sections.get(SECTION_DEPENDENCIES)),
+    }
+
+
+def parse_csv_metadata(row):
+    """Extraer los mismos metadatos de una fila del CSV de importación
+
+    Las columnas 'Estimate' y 'Depends On' son opcionales.
+    """
+    return {
+        'week': parse_int(row.get('Week')),
+        'developer': (row.get('Developer') or '').strip() or None,
+        'priority': (row.get('Priority') or '').strip() or None,
+        'estimate': parse_estimate(row.get('Estimate')),
+        'depends_on': parse_dependencies(row.get('Depends On')),
+    }
+
+
+def priority_rank(priority):
+    """Orden numérico de la prioridad (High primero, sin prioridad al final)"""
+    return PRIORITY_RANK.get((priority or '').strip().lower(), len(PRIORITY_RANK))
+
+
+def make_task(task_id, title, meta):
+    """Construir la tarea que consume schedule_tasks()"""
+    return {
+        'id': task_id,
+        'title': title,
+        'week': meta.get('week'),
+        'developer': meta.get('developer'),
+        'priority': meta.get('priority'),
+        'estimate': meta.get('estimate'),
+        'depends_on': list(meta.get('depends_on') or []),
+    }
+
+
+def _fill_default_estimates(tasks):
+    """Repartir las horas libres de la semana entre las tareas sin estimación
+
+    Sin estimaciones explícitas cada (semana, desarrollador) sigue ocupando
+    exactamente una semana laboral, como en el plan original.
+    """
+    known = defaultdict(float)
+    missing = defaultdict(list)
+    for task in tasks:
+        key = (task['week'], task['developer'])
+        if task['estimate']:
+            known[key] += task['estimate']
+        else:
+            missing[key].append(task)
+
+    durations = {}
+    for key, bucket in missing.items():
+        free = WEEK_HOURS - known[key]
+        share = max(free / len(bucket), HOURS_PER_DAY / 2) if free > 0 else HOURS_PER_DAY
+        for task in bucket:
+            durations[task['id']] = share
+    for task in tasks:
+        if task['estimate']:
+            durations[task['id']] = float(task['estimate'])
+    return durations
+
+
+def _resolve_dependencies(tasks):
+    """Traducir referencias (id o título) a ids de tarea; ignora las desconocidas"""
+    by_id = {task['id']: task for task in tasks}
+    by_title = {}
+    for task in tasks:
+        by_title.setdefault(task['title'].strip().lower(), task['id'])
+
+    preds = {}
+    unknown = []
+    for task in tasks:
+        resolved = []
+        for ref in task['depends_on']:
+            if ref in by_id:
+                dep_id = ref
+            elif isinstance(ref, str):
+                dep_id = by_title.get(ref.strip().lower())
+            else:
+                dep_id = None
+            if dep_id is None:
+                unknown.append((task['id'], ref))
+            elif dep_id != task['id'] and dep_id not in resolved:
+                resolved.append(dep_id)
+        preds[task['id']] = resolved
+    return preds, unknown
+
+
+def _topological_order(task_ids, preds):
+    """Orden topológico (Kahn); los nodos en ciclos se devuelven aparte"""
+    succs = defaultdict(list)
+    indegree = {task_id: len(preds[task_id]) for task_id in task_ids}
+    for task_id in task_ids:
+        for dep in preds[task_id]:
+            succs[dep].append(task_id)
+
+    queue = [task_id for task_id in task_ids if indegree[task_id] == 0]
+    order = []
+    head = 0
+    while head < len(queue):
+        task_id = queue[head]
+        head += 1
+        order.append(task_id)
+        for nxt in succs[task_id]:
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
+                queue.append(nxt)
+
+    in_order = set(order)
+    cyclic = [task_id for task_id in task_ids if task_id not in in_order]
+    return order, cyclic, succs
+
+
+def working_offset_to_date(start_date, hours):
+    """Convertir horas laborables desde start_date a fecha (saltando fines de semana)"""
+    day = int(hours // HOURS_PER_DAY)
+    weeks, weekday = divmod(day, DAYS_PER_WEEK)
+    return start_date + timedelta(weeks=weeks, days=weekday)
+
+
+def working_offset_to_datetime(start_date, hours, end=False):
+    """Como working_offset_to_date() pero con la hora del día (jornada desde WORKDAY_START_HOUR)
+
+    Con end=True un fin justo al cerrar la jornada queda ese día a las 17:00
+    y no al inicio del siguiente día laborable.
+    """
+    day = int(hours // HOURS_PER_DAY)
+    if end and day > 0 and hours == day * HOURS_PER_DAY:
+        day -= 1
+    weeks, weekday = divmod(day, DAYS_PER_WEEK)
+    within = hours - day * HOURS_PER_DAY
+    return start_date + timedelta(weeks=weeks, days=weekday, hours=WORKDAY_START_HOUR + within)
+
+
+def working_days_between(start, end):
+    """Días laborables de start a end (negativo si end es anterior); O(1)
+
+    El ordinal 1 (0001-01-01) fue lunes: se cuentan semanas completas más los
+    días de lunes a viernes de la semana parcial.
+    """
+    def index(day):
+        weeks, weekday = divmod(day.toordinal() - 1, 7)
+        return weeks * DAYS_PER_WEEK + min(weekday, DAYS_PER_WEEK)
+    return index(end) - index(start)
+
+
+def _resource_critical_path(schedule, sequence, preds, succs, makespan):
+    """Holgura sobre el calendario con recursos; marca 'slack_hours'/'critical' y devuelve la ruta
+
+    Los sucesores de una tarea son sus dependientes y la siguiente tarea de
+    su desarrollador. La ruta va desde la tarea que termina al final hacia
+    atrás por el predecesor (dependencia o tarea anterior del mismo
+    desarrollador) que termina justo cuando ella empieza.
+    """
+    previous_on_dev, next_on_dev = {}, {}
+    last_by_dev = {}
+    for task_id in sequence:
+        developer = schedule[task_id]['developer']
+        if developer in last_by_dev:
+            previous_on_dev[task_id] = last_by_dev[developer]
+            next_on_dev[last_by_dev[developer]] = task_id
+        last_by_dev[developer] = task_id
+
+    # El calendario es un orden topológico de ambos tipos de arista
+    latest_start = {}
+    for task_id in reversed(sequence):
+        entry = schedule[task_id]
+        nexts = list(succs[task_id]) + ([next_on_dev[task_id]] if task_id in next_on_dev else [])
+        latest_finish = min((latest_start[nxt] for nxt in nexts), default=makespan)
+        latest_start[task_id] = latest_finish - entry['duration_hours']
+        entry['slack_hours'] = latest_start[task_id] - entry['start_hours']
+        entry['critical'] = abs(entry['slack_hours']) < 1e-6
+
+    critical_path = []
+    ends = [t for t in sequence if abs(schedule[t]['finish_hours'] - makespan) < 1e-6]
+    current = ends[0] if ends else None
+    while current is not None:
+        critical_path.append(current)
+        start = schedule[current]['start_hours']
+        # Primero las dependencias; si no, la tarea anterior del desarrollador
+        candidates = list(preds[current]) + ([previous_on_dev[current]] if current in previous_on_dev else [])
+        binding = [dep for dep in candidates if abs(schedule[dep]['finish_hours'] - start) < 1e-6]
+        current = binding[0] if binding else None
+    critical_path.reverse()
+    return critical_path
+
+
+def schedule_tasks(tasks, start_date, developers=None):
+    """Calendarizar tareas respetando dependencias y la carga de cada desarrollador
+
+    Scheduler de lista de prioridades: las tareas listas (todas sus dependencias
+    ya calendarizadas) salen de un heap ordenado por inicio más temprano posible,
+    longitud de la cadena restante (ruta crítica primero) y prioridad. Cada
+    desarrollador trabaja una tarea a la vez; ninguna tarea empieza antes de su
+    semana planeada. Las tareas sin desarrollador van al que se libere primero.
+    Complejidad O((V + E) log V).
+
+    La holgura y la ruta crítica se calculan sobre el calendario resultante,
+    no sólo sobre las dependencias: el sucesor de una tarea también es la
+    siguiente tarea de su desarrollador, así que una tarea es crítica si
+    retrasarla retrasa el fin del proyecto con los recursos que hay.
+
+    Devuelve un dict con 'tasks' (id -> calendario), 'order', 'critical_path',
+    'makespan' (horas), 'cycles' y 'unknown_dependencies'.
+    """
+    tasks = list(tasks)
+    task_ids = [task['id'] for task in tasks]
+    by_id = {task['id']: task for task in tasks}
+    durations = _fill_default_estimates(tasks)
+    preds, unknown = _resolve_dependencies(tasks)
+
+    order, cyclic, succs = _topological_order(task_ids, preds)
+    if cyclic:
+        # Romper los ciclos: las tareas involucradas ignoran sus dependencias
+        # pendientes y se calendarizan al final del orden topológico.
+        cyclic_set = set(cyclic)
+        for task_id in cyclic:
+            preds[task_id] = [dep for dep in preds[task_id] if dep not in cyclic_set]
+        order, _, succs = _topological_order(task_ids, preds)
+
+    # Ninguna tarea empieza antes de su semana; `tail` (cadena de dependencias
+    # restante) da prioridad a las tareas con más trabajo detrás
+    release = {
+        task_id: max((by_id[task_id]['week'] or 1) - 1, 0) * WEEK_HOURS
+        for task_id in task_ids
+    }
+    tail = {}
+    for task_id in reversed(order):
+        tail[task_id] = durations[task_id] + max((tail[nxt] for nxt in succs[task_id]), default=0.0)
+
+    # Scheduler de lista con recursos (un desarrollador = una tarea a la vez)
+    developers = list(developers or [])
+    for task in tasks:
+        if task['developer'] and task['developer'] not in developers:
+            developers.append(task['developer'])
+    dev_free = {dev: 0.0 for dev in developers}
+
+    remaining = {task_id: len(preds[task_id]) for task_id in task_ids}
+    dep_ready = dict(release)
+    position = {task_id: i for i, task_id in enumerate(order)}
+    ready = []
+
+    def push(task_id):
+        task = by_id[task_id]
+        heapq.heappush(ready, (
+            dep_ready[task_id],
+            -tail[task_id],
+            priority_rank(task['priority']),
+            position[task_id],
+            task_id,
+        ))
+
+    for task_id in order:
+        if remaining[task_id] == 0:
+            push(task_id)
+
+    schedule = {}
+    sequence = []
+    while ready:
+        *_, task_id = heapq.heappop(ready)
+        task = by_id[task_id]
+        developer = task['developer']
+        if not developer:
+            developer = min(dev_free, key=dev_free.get) if dev_free else 'Sin asignar'
+            dev_free.setdefault(developer, 0.0)
+
+        start = max(dep_ready[task_id], dev_free[developer])
+        finish = start + durations[task_id]
+        dev_free[developer] = finish
+        sequence.append(task_id)
+
+        schedule[task_id] = {
+            'id': task_id,
+            'title': task['title'],
+            'developer': developer,
+            'week': task['week'],
+            'start_hours': start,
+            'finish_hours': finish,
+            'duration_hours': durations[task_id],
+            'start': working_offset_to_date(start_date, start),
+            'end': working_offset_to_date(start_date, max(finish - 1e-9, start)),
+            'depends_on': list(preds[task_id]),
+        }
+
+        for nxt in succs[task_id]:
+            dep_ready[nxt] = max(dep_ready[nxt], finish)
+            remaining[nxt] -= 1
+            if remaining[nxt] == 0:
+                push(nxt)
+
+    makespan = max((entry['finish_hours'] for entry in schedule.values()), default=0.0)
+    critical_path = _resource_critical_path(schedule, sequence, preds, succs, makespan)
+
+    return {
+        'tasks': schedule,
+        'order': sequence,
+        'critical_path': critical_path,
+        'makespan': makespan,
+        'cycles': cyclic,
+        'unknown_dependencies': unknown,
+    }
+
+
+def required_skills(labels):
+    """Habilidades que exige una tarea según sus labels ('backend,auth' -> {'backend'})"""
+    if isinstance(labels, str):
+        labels = labels.split(',')
+    return frozenset(
+        name for name in (label.strip().lower() for label in labels or [])
+        if name in SKILL_LABELS
+    )
+
+
+def _load_cost(load, capacity):
+    # Convexa: premia repartir la carga y castiga fuerte pasarse de capacidad
+    over = max(load - capacity, 0.0)
+    return (load * load + OVERLOAD_PENALTY * over * over) / capacity
+
+
+def _fill_team_estimates(tasks, developers):
+    """Horas de cada tarea; sin estimación, las horas libres del equipo en la semana
+
+    Igual que _fill_default_estimates() pero a nivel equipo, porque todavía no
+    se sabe a quién le tocará cada tarea.
+    """
+    team_hours = sum(profile['capacity'] for profile in developers.values())
+    known = defaultdict(float)
+    missing = defaultdict(list)
+    for task in tasks:
+        if task.get('hours'):
+            known[task['week']] += task['hours']
+        else:
+            missing[task['week']].append(task)
+
+    hours = {task['id']: float(task['hours']) for task in tasks if task.get('hours')}
+    for week, bucket in missing.items():
+        free = team_hours - known[week]
+        share = max(free / len(bucket), HOURS_PER_DAY / 2) if free > 0 else HOURS_PER_DAY
+        for task in bucket:
+            hours[task['id']] = share
+    return hours
+
+
+class _WeekBins:
+    """Carga de cada desarrollador en una semana y sus tareas movibles ordenadas por horas"""
+
+    def __init__(self, developers):
+        self.capacity = {name: profile['capacity'] for name, profile in developers.items()}
+        self.load = {name: 0.0 for name in developers}
+        self.members = {name: [] for name in developers}
+        self.where = {}
+
+    def delta(self, dev, hours):
+        """Cambio de costo de sumar `hours` (negativo: quitar) a `dev`"""
+        load, capacity = self.load[dev], self.capacity[dev]
+        return _load_cost(load + hours, capacity) - _load_cost(load, capacity)
+
+    def add(self, dev, hours, task_id=None):
+        self.load[dev] += hours
+        if task_id is not None:
+            bisect.insort(self.members[dev], (hours, task_id))
+            self.where[task_id] = dev
+
+    def remove(self, dev, hours, task_id):
+        self.load[dev] -= hours
+        members = self.members[dev]
+        del members[bisect.bisect_left(members, (hours, task_id))]
+
+
+def _improve_week(bins, eligible, max_rounds, neighbors=4):
+    """Búsqueda local: mover o intercambiar tareas mientras baje el costo total
+
+    Los intercambios sólo prueban, con bisect, las tareas del otro
+    desarrollador cuyas horas están cerca de la diferencia ideal, así que cada
+    ronda cuesta O(N · D · log N) en lugar de O(N²).
+    """
+    moves = 0
+    for _ in range(max_rounds):
+        improved = False
+        devs = sorted(bins.load, key=lambda dev: bins.load[dev] / bins.capacity[dev], reverse=True)
+        for src in devs:
+            for h, task_id in sorted(bins.members[src], reverse=True):
+                if bins.where[task_id] != src:
+                    continue  # ya se intercambió en esta ronda
+                remove_cost = bins.delta(src, -h)
+                best = (-1e-9, None, None)
+
+                for dst in eligible[task_id]:
+                    if dst == src:
+                        continue
+                    # Mover la tarea completa
+                    gain = remove_cost + bins.delta(dst, h)
+                    if gain < best[0]:
+                        best = (gain, dst, None)
+
+                    # Intercambiar por una tarea más chica de dst
+                    ideal = h - (bins.load[src] - bins.load[dst]) / 2
+                    members = bins.members[dst]
+                    pos = bisect.bisect_left(members, (ideal,))
+                    for other_h, other_id in members[max(pos - neighbors, 0):pos + neighbors]:
+                        if other_h >= h or src not in eligible[other_id]:
+                            continue
+                        diff = h - other_h
+                        gain = bins.delta(src, -diff) + bins.delta(dst, diff)
+                        if gain < best[0]:
+                            best = (gain, dst, (other_h, other_id))
+
+                _, dst, swap = best
+                if dst is None:
+                    continue
+                bins.remove(src, h, task_id)
+                bins.add(dst, h, task_id)
+                if swap:
+                    bins.remove(dst, *swap)
+                    bins.add(src, *swap)
+                moves += 1
+                improved = True
+        if not improved:
+            break
+    return moves
+
+
+def _pack_week(week_tasks, developers, eligible, hours, max_rounds, keep_current):
+    """Bin packing de una semana: (bins, asignación de las fijadas, movimientos)
+
+    keep_current=True parte de la asignación actual (las tareas cuyo
+    desarrollador sigue siendo elegible se quedan donde están) y sólo la
+    búsqueda local las mueve, cuando baja el costo. Si no, greedy desde cero;
+    en un empate de costo gana el desarrollador actual de la tarea.
+    """
+    names = list(developers)
+    bins = _WeekBins(developers)
+    pinned = {}
+    movable = []
+    for task in week_tasks:
+        if task.get('pinned') and task.get('developer') in bins.load:
+            bins.add(task['developer'], hours[task['id']])
+            pinned[task['id']] = task['developer']
+        elif keep_current and task.get('developer') in eligible[task['id']]:
+            bins.add(task['developer'], hours[task['id']], task['id'])
+        else:
+            movable.append(task)
+
+    # Greedy: las forzadas primero, después LPT (mayor duración primero)
+    movable.sort(key=lambda task: (len(eligible[task['id']]) > 1, -hours[task['id']], str(task['id'])))
+    for task in movable:
+        h = hours[task['id']]
+        dev = min(eligible[task['id']],
+                  key=lambda name: (bins.delta(name, h), name != task.get('developer'), names.index(name)))
+        bins.add(dev, h, task['id'])
+
+    return bins, pinned, _improve_week(bins, eligible, max_rounds)
+
+
+def assign_developers(tasks, developers, max_rounds=20):
+    """Asignar desarrolladores por capacidad semanal y habilidades (bin packing)
+
+    `tasks`: dicts con 'id', 'week', 'hours' (None = sin estimación),
+    'skills' (frozenset de required_skills) y opcionalmente 'developer' +
+    'pinned' para las que no se deben mover. `developers`: nombre ->
+    {'skills': set, 'capacity': horas por semana}.
+
+    Cada semana es un bin packing independiente: primero un greedy (las
+    tareas con un solo candidato, luego las demás de mayor a menor duración,
+    cada una al desarrollador donde menos sube el costo) y después búsqueda
+    local con movimientos e intercambios. También se prueba partir de la
+    asignación actual; gana el costo menor y, si empatan, la que cambia menos
+    tareas de desarrollador (cada cambio se escribe al CSV o a la issue).
+    Devuelve un dict con 'assignment'
+    (id -> desarrollador), 'hours', 'loads' ((semana, dev) -> horas),
+    'overloaded', 'unskilled' (tareas sin desarrollador con sus habilidades)
+    y 'moves' de la búsqueda local.
+    """
+    tasks = list(tasks)
+    hours = _fill_team_estimates(tasks, developers)
+    names = list(developers)
+    current = {task['id']: task.get('developer') for task in tasks}
+
+    eligible = {}
+    unskilled = []
+    by_week = defaultdict(list)
+    for task in tasks:
+        skills = task.get('skills') or frozenset()
+        candidates = [name for name in names if skills <= set(developers[name]['skills'])]
+        if not candidates:
+            unskilled.append(task['id'])
+            candidates = names
+        eligible[task['id']] = candidates
+        by_week[task['week']].append(task)
+
+    assignment = {}
+    loads = {}
+    moves = 0
+    for week, week_tasks in by_week.items():
+        def rank(packed):
+            bins = packed[0]
+            cost = sum(_load_cost(load, bins.capacity[dev]) for dev, load in bins.load.items())
+            changed = sum(1 for task_id, dev in bins.where.items() if dev != current[task_id])
+            # Redondear el costo: diferencias de punto flotante no cuentan como mejora
+            return round(cost, 6), changed
+
+        bins, pinned, week_moves = min(
+            (_pack_week(week_tasks, developers, eligible, hours, max_rounds, keep_current)
+             for keep_current in (True, False)),
+            key=rank,
+        )
+        moves += week_moves
+
+        assignment.update(pinned)
+        assignment.update(bins.where)
+        for dev, load in bins.load.items():
+            loads[(week, dev)] = load
+
+    overloaded = [
+        (week, dev, load, developers[dev]['capacity'])
+        for (week, dev), load in loads.items()
+        if load > developers[dev]['capacity'] + 1e-9
+    ]
+    return {
+        'assignment': assignment,
+        'hours': hours,
+        'loads': loads,
+        'overloaded': overloaded,
+        'unskilled': unskilled,
+        'moves': moves,
+    }
+
+
+def write_priority_key(meta):
+    """Clave de orden de una escritura: prioridad y luego semana (sin semana al final)"""
+    week = meta.get('week')
+    return priority_rank(meta.get('priority')), week if week is not None else _NO_WEEK
+
+
+class WriteQueue:
+    """Cola de escrituras a GitHub por prioridad y semana, alternando desarrolladores
+
+    Lo urgente sale primero (High de la semana 1 antes que Low de la semana 4),
+    así que una corrida que se corta por rate limits deja el tablero usable.
+    Dentro de la misma prioridad y semana se reparte por turnos entre
+    desarrolladores para que nadie se quede sin sus tareas. Es segura entre
+    hilos: varios workers pueden sacar trabajo a la vez.
+    """
+
+    def __init__(self, items=()):
+        self._heap = []
+        self._turns = defaultdict(int)  # (prioridad, semana, desarrollador) -> siguiente turno
+        self._seq = 0
+        self._lock = threading.Lock()
+        for item, meta in items:
+            self.push(item, meta)
+
+    def push(self, item, meta, key=None):
+        """Encolar `item`; `key` reemplaza a write_priority_key(meta) (ej. prioridad heredada)"""
+        rank, week = key or write_priority_key(meta)
+        with self._lock:
+            bucket = (rank, week, meta.get('developer') or '')
+            turn = self._turns[bucket]
+            self._turns[bucket] += 1
+            heapq.heappush(self._heap, (rank, week, turn, self._seq, item))
+            self._seq += 1
+
+    def pop(self):
+        """Siguiente item más urgente, o None si la cola está vacía"""
+        with self._lock:
+            return heapq.heappop(self._heap)[-1] if self._heap else None
+
+    def __len__(self):
+        return len(self._heap)
+
+
+def format_duration(hours):
+    """Duración legible en días laborables ('2 days', '0.5 days')"""
+    days = hours / HOURS_PER_DAY
+    text = f"{days:.2f}".rstrip('0').rstrip('.')
+    return f"{text} day" if text == '1' else f"{text} days"
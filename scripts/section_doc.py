@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Generador de documentos Markdown por secciones direccionables
+Cada sección va entre marcadores con un hash de sus datos de entrada; al
+regenerar sólo se vuelven a renderizar las secciones cuyo hash cambió y el
+resto se copia tal cual del documento anterior (diffs mínimos)
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+_SECTION_RE = re.compile(
+    r'<!-- section:(?P<id>[\w.-]+) hash:(?P<hash>[0-9a-f]+) -->\n'
+    r'(?P<body>.*?)'
+    r'<!-- /section:(?P=id) -->\n',
+    re.DOTALL,
+)
+
+
+class Section:
+    """Sección del documento: id estable, datos que la definen y cómo renderizarla"""
+
+    def __init__(self, section_id, data, render):
+        self.id = section_id
+        self.data = data
+        self.render = render
+
+    @property
+    def hash(self):
+        payload = json.dumps(self.data, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def parse_sections(text):
+    """Secciones de un documento existente: id -> (hash, bloque completo con marcadores)"""
+    return {
+        match.group('id'): (match.group('hash'), match.group(0))
+        for match in _SECTION_RE.finditer(text or '')
+    }
+
+
+def render_document(parts, previous_text=None):
+    """Armar el documento en una sola pasada
+
+    `parts` es una lista de textos fijos y objetos Section. Las secciones
+    cuyo hash coincide con el del documento anterior no se renderizan.
+    Devuelve (texto, renderizadas, reutilizadas).
+    """
+    previous = parse_sections(previous_text)
+    chunks = []
+    rendered = reused = 0
+    for part in parts:
+        if not isinstance(part, Section):
+            chunks.append(part)
+            continue
+        digest = part.hash
+        old = previous.get(part.id)
+        if old and old[0] == digest:
+            chunks.append(old[1])
+            reused += 1
+            continue
+        body = part.render()
+        if body and not body.endswith('\n'):
+            body += '\n'
+        chunks.append(f"<!-- section:{part.id} hash:{digest} -->\n{body}<!-- /section:{part.id} -->\n")
+        rendered += 1
+    return ''.join(chunks), rendered, reused
+
+
+def update_document(path, parts):
+    """Regenerar `path` reutilizando sus secciones sin cambios
+
+    Sólo se escribe el archivo si el contenido cambió. Devuelve
+    (renderizadas, reutilizadas, escrito).
+    """
+    path = Path(path)
+    previous_text = path.read_text(encoding='utf-8') if path.exists() else None
+    text, rendered, reused = render_document(parts, previous_text)
+    if text == previous_text:
+        return rendered, reused, False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return rendered, reused, True
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Script para medir el avance real del proyecto LOCALIA
+Calcula burndown semanal, percentiles de cycle time por desarrollador y
+label, y throughput planeado vs real a partir del historial de issues
+Requiere: GitHub CLI (gh) instalado y autenticado, y NumPy
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    print("❌ Este script requiere NumPy")
+    print("Instala con: pip install numpy")
+    sys.exit(1)
+
+from gh_client import CircuitOpenError, GhError, paginate_graphql
+from planning import parse_issue_metadata
+
+# Colores
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+RED = '\033[0;31m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+OWNER = "alex9abril"
+REPO_NAME = "localia-admin"
+REPO = f"{OWNER}/{REPO_NAME}"
+START_DATE = datetime(2025, 1, 13, tzinfo=timezone.utc)  # Lunes de la semana 1 (igual que create-gantt-chart.py)
+REPORT_PATH = Path("docs/VELOCITY-REPORT.md")
+
+WEEK_SECONDS = 7 * 24 * 3600
+PERCENTILES = [50, 75, 90]
+UNASSIGNED = 'Sin asignar'
+# Labels que marcan que el trabajo empezó (se comparan en minúsculas)
+IN_PROGRESS_LABELS = {'in progress', 'en progreso', 'doing', 'wip'}
+
+HISTORY_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number body createdAt closedAt
+        labels(first: 20) { nodes { name } }
+        assignees(first: 5) { nodes { login } }
+        timelineItems(first: 50, itemTypes: [ASSIGNED_EVENT, LABELED_EVENT]) {
+          nodes {
+            __typename
+            ... on AssignedEvent { createdAt assignee { ... on User { login } } }
+            ... on LabeledEvent { createdAt label { name } }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def to_epoch(timestamp):
+    """ISO 8601 de GitHub -> segundos epoch (NaN si no hay fecha)"""
+    if not timestamp:
+        return np.nan
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+
+
+class Codes:
+    """Diccionario nombre -> código entero para agrupar con NumPy"""
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+
+    def code(self, name):
+        if name not in self.index:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+        return self.index[name]
+
+
+def load_history():
+    """Descargar el historial y cargarlo en arreglos columnares
+
+    Cada issue se procesa al vuelo; sólo se guardan números en listas
+    planas que al final se convierten en arreglos de NumPy.
+    """
+    created, closed, started, planned_week, dev_codes = [], [], [], [], []
+    label_issue, label_codes, label_applied = [], [], []
+    developers, labels = Codes(), Codes()
+
+    for row, issue in enumerate(paginate_graphql(
+            HISTORY_QUERY, ['repository', 'issues'], {'owner': OWNER, 'name': REPO_NAME})):
+        meta = parse_issue_metadata(issue.get('body') or '')
+        created_at = to_epoch(issue['createdAt'])
+
+        # Inicio del trabajo: primera asignación o primer label "en progreso"
+        # (o la creación si no hubo ninguno)
+        events = issue['timelineItems']['nodes']
+        assigned = [to_epoch(e['createdAt']) for e in events if e and e['__typename'] == 'AssignedEvent']
+        first_labeled = {}
+        for e in events:
+            if e and e['__typename'] == 'LabeledEvent' and e.get('label'):
+                name, at = e['label']['name'], to_epoch(e['createdAt'])
+                first_labeled[name] = min(first_labeled.get(name, at), at)
+        assigned += [at for name, at in first_labeled.items() if name.lower() in IN_PROGRESS_LABELS]
+        assignees = [a['login'] for a in issue['assignees']['nodes']]
+        if not assignees:
+            assignees = [
+                (e.get('assignee') or {}).get('login') for e in events
+                if e and e['__typename'] == 'AssignedEvent' and e.get('assignee')
+            ]
+
+        created.append(created_at)
+        closed.append(to_epoch(issue['closedAt']))
+        started.append(min(assigned) if assigned else created_at)
+        planned_week.append(meta['week'] or 0)
+        dev_codes.append(developers.code(meta['developer'] or (assignees[0] if assignees else UNASSIGNED)))
+
+        for label in issue['labels']['nodes']:
+            label_issue.append(row)
+            label_codes.append(labels.code(label['name']))
+            label_applied.append(first_labeled.get(label['name'], np.nan))
+
+    return {
+        'created': np.asarray(created, dtype=np.float64),
+        'closed': np.asarray(closed, dtype=np.float64),
+        'started': np.asarray(started, dtype=np.float64),
+        'planned_week': np.asarray(planned_week, dtype=np.int64),
+        'developer': np.asarray(dev_codes, dtype=np.int64),
+        'label_issue': np.asarray(label_issue, dtype=np.int64),
+        'label': np.asarray(label_codes, dtype=np.int64),
+        'label_applied': np.asarray(label_applied, dtype=np.float64),
+        'developers': developers.names,
+        'labels': labels.names,
+    }
+
+
+def week_boundaries(history, now):
+    """Fin de cada semana del proyecto, desde START_DATE hasta la última actividad o el plan"""
+    start = START_DATE.timestamp()
+    planned_weeks = int(history['planned_week'].max(initial=0))
+    last_activity = min(np.nanmax(np.concatenate([history['created'], history['closed']])), now)
+    elapsed_weeks = int(np.ceil((last_activity - start) / WEEK_SECONDS))
+    n_weeks = max(planned_weeks, min(elapsed_weeks, 520), 1)
+    return start + WEEK_SECONDS * np.arange(1, n_weeks + 1, dtype=np.float64)
+
+
+def compute_burndown(history, boundaries):
+    """Issues abiertas al cierre de cada semana (alcance total y planeado)"""
+    created = np.sort(history['created'])
+    closed = history['closed']
+    closed = np.sort(closed[~np.isnan(closed)])
+    total = np.searchsorted(created, boundaries, side='right')
+    done = np.searchsorted(closed, boundaries, side='right')
+
+    planned_mask = history['planned_week'] > 0
+    planned_scope = int(planned_mask.sum())
+    planned_closed = history['closed'][planned_mask]
+    planned_closed = np.sort(planned_closed[~np.isnan(planned_closed)])
+    planned_remaining = planned_scope - np.searchsorted(planned_closed, boundaries, side='right')
+
+    # Línea ideal: el alcance planeado cae según el plan semanal
+    planned_per_week = np.bincount(history['planned_week'][planned_mask], minlength=len(boundaries) + 1)[1:]
+    ideal = planned_scope - np.cumsum(planned_per_week[:len(boundaries)])
+
+    return {
+        'open': total - done,
+        'planned_remaining': planned_remaining,
+        'ideal': ideal,
+    }
+
+
+def compute_throughput(history, boundaries):
+    """Issues cerradas por semana contra las planeadas para esa semana"""
+    n_weeks = len(boundaries)
+    start = START_DATE.timestamp()
+    closed = history['closed']
+    closed = closed[~np.isnan(closed)]
+    week_index = np.floor((closed - start) / WEEK_SECONDS).astype(np.int64)
+    week_index = week_index[(week_index >= 0) & (week_index < n_weeks)]
+    actual = np.bincount(week_index, minlength=n_weeks)
+
+    planned_week = history['planned_week']
+    planned = np.bincount(planned_week[(planned_week > 0) & (planned_week <= n_weeks)] - 1, minlength=n_weeks)
+    return {'planned': planned, 'actual': actual}
+
+
+def group_percentiles(values, groups, names):
+    """Percentiles de `values` agrupados por código, ordenando una sola vez"""
+    order = np.argsort(groups, kind='stable')
+    values, groups = values[order], groups[order]
+    codes, starts, counts = np.unique(groups, return_index=True, return_counts=True)
+    results = []
+    for code, start, count in zip(codes, starts, counts):
+        chunk = values[start:start + count]
+        results.append((names[code], int(count), np.percentile(chunk, PERCENTILES)))
+    return sorted(results, key=lambda r: (-r[1], r[0]))
+
+
+def compute_cycle_times(history):
+    """Cycle time (días, del inicio del trabajo al cierre) por desarrollador y por label
+
+    Por label se cuenta desde que el label se aplicó si fue después del
+    inicio: una issue que pasa a `bug` a mitad del trabajo sólo suma a `bug`
+    el tiempo que estuvo con ese label.
+    """
+    cycle = (history['closed'] - history['started']) / 86400.0
+    done = ~np.isnan(cycle)
+    cycle = np.clip(cycle, 0, None)
+
+    by_developer = group_percentiles(cycle[done], history['developer'][done], history['developers'])
+
+    label_issue = history['label_issue']
+    # fmax ignora NaN: sin evento de label queda el inicio de la issue
+    label_started = np.fmax(history['started'][label_issue], history['label_applied'])
+    label_cycle = np.clip((history['closed'][label_issue] - label_started) / 86400.0, 0, None)
+    label_done = done[label_issue]
+    by_label = group_percentiles(
+        label_cycle[label_done], history['label'][label_done], history['labels']
+    )
+    overall = np.percentile(cycle[done], PERCENTILES) if done.any() else None
+    return {'by_developer': by_developer, 'by_label': by_label, 'overall': overall, 'closed': int(done.sum())}
+
+
+def format_days(value):
+    return f"{value:.1f} d"
+
+
+def generate_markdown(history, boundaries, burndown, throughput, cycle_times, now):
+    """Generar el reporte en el mismo formato que docs/GANTT-CHART.md"""
+    total = len(history['created'])
+    closed = cycle_times['closed']
+    lines = [
+        "# 📈 Reporte de Velocidad - LOCALIA MVP",
+        "",
+        f"*Generado el {datetime.fromtimestamp(now, timezone.utc).strftime('%d/%m/%Y %H:%M')} UTC*",
+        "",
+        "## 📊 Resumen",
+        "",
+        f"- Issues totales: **{total}**",
+        f"- Issues cerradas: **{closed}**",
+        f"- Issues abiertas: **{total - closed}**",
+    ]
+    if cycle_times['overall'] is not None:
+        p50, p75, p90 = cycle_times['overall']
+        lines.append(f"- Cycle time: p50 {format_days(p50)} · p75 {format_days(p75)} · p90 {format_days(p90)}")
+
+    lines += [
+        "",
+        "## 📉 Burndown Semanal",
+        "",
+        "| Semana | Cierre | Abiertas (total) | Pendientes del plan | Ideal |",
+        "|--------|--------|------------------|---------------------|-------|",
+    ]
+    for week, boundary in enumerate(boundaries):
+        end = datetime.fromtimestamp(boundary, timezone.utc) - timedelta(days=3)  # Viernes
+        ideal = burndown['ideal'][week] if week < len(burndown['ideal']) else 0
+        lines.append(
+            f"| {week + 1} | {end.strftime('%d/%m/%Y')} | {burndown['open'][week]} | "
+            f"{burndown['planned_remaining'][week]} | {ideal} |"
+        )
+
+    lines += [
+        "",
+        "## 🚀 Throughput Planeado vs Real",
+        "",
+        "| Semana | Planeadas | Cerradas | Diferencia |",
+        "|--------|-----------|----------|------------|",
+    ]
+    diff = throughput['actual'] - throughput['planned']
+    for week in range(len(boundaries)):
+        lines.append(
+            f"| {week + 1} | {throughput['planned'][week]} | {throughput['actual'][week]} | {diff[week]:+d} |"
+        )
+
+    header = "| {} | Cerradas | p50 | p75 | p90 |"
+    separator = "|------|----------|-----|-----|-----|"
+    for title, column, rows in (
+        ("## ⏱️ Cycle Time por Desarrollador", "Desarrollador", cycle_times['by_developer']),
+        ("## 🏷️ Cycle Time por Label", "Label", cycle_times['by_label']),
+    ):
+        lines += ["", title, "", header.format(column), separator]
+        if not rows:
+            lines.append("| - | 0 | - | - | - |")
+        for name, count, (p50, p75, p90) in rows:
+            lines.append(f"| {name} | {count} | {format_days(p50)} | {format_days(p75)} | {format_days(p90)} |")
+
+    lines += [
+        "",
+        "## 📝 Notas",
+        "",
+        "- El cycle time va de la primera asignación o el primer label de trabajo en curso "
+        f"({', '.join(f'`{label}`' for label in sorted(IN_PROGRESS_LABELS))}) al cierre; "
+        "sin ninguno, desde la creación",
+        "- Por label se cuenta desde que se aplicó el label, si fue después del inicio del trabajo",
+        "- \"Pendientes del plan\" sólo cuenta issues con sección `## Semana`; \"Ideal\" sigue el plan semanal",
+        "- El desarrollador se toma de la sección `## Desarrollador` o, si no existe, del primer asignado",
+        "",
+        "## 🔗 Enlaces",
+        "",
+        f"- [Issues en GitHub](https://github.com/{REPO}/issues)",
+        "- [Diagrama de Gantt](./GANTT-CHART.md)",
+        "",
+    ]
+    return '\n'.join(lines)
+
+
+def main():
+    print(f"{GREEN}🚀 Generando reporte de velocidad{NC}\n")
+
+    print(f"{BLUE}📋 Obteniendo historial de issues...{NC}")
+    try:
+        history = load_history()
+    except (CircuitOpenError, GhError) as e:
+        print(f"{RED}❌ Error obteniendo issues: {e}{NC}")
+        sys.exit(1)
+
+    if len(history['created']) == 0:
+        print(f"{YELLOW}⚠️  No hay issues para analizar{NC}")
+        sys.exit(0)
+    print(f"{GREEN}✅ Procesando {len(history['created'])} issues{NC}\n")
+
+    now = datetime.now(timezone.utc).timestamp()
+    boundaries = week_boundaries(history, now)
+    burndown = compute_burndown(history, boundaries)
+    throughput = compute_throughput(history, boundaries)
+    cycle_times = compute_cycle_times(history)
+
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(
+        generate_markdown(history, boundaries, burndown, throughput, cycle_times, now),
+        encoding='utf-8'
+    )
+    print(f"{GREEN}✅ Creado: {REPORT_PATH}{NC}")
+    print(f"\n{GREEN}✨ Proceso completado{NC}")
+
+
+if __name__ == "__main__":
+    main()
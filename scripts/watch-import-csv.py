@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+Modo watch para docs/github-projects-import.csv
+Vigila el CSV (inotify, o sondeo del archivo si no está disponible) y, tras
+cada cambio, compara fila por fila contra la última versión aplicada:
+- Filas nuevas: se crea la issue, se vincula a su padre (columna Parent) y
+  se agrega al proyecto; estos dos pasos se guardan como pendientes y se
+  reintentan por separado, sin volver a crear la issue
+- Filas modificadas: se actualizan título, body y labels con un solo
+  `gh issue edit`; si cambia Parent se vuelve a vincular (o se desvincula)
+- Filas renombradas: la identidad de una fila es su número de issue; una fila
+  nueva con el mismo Body que una eliminada se toma como la misma issue
+- Filas eliminadas: sólo se avisa (no se cierran issues automáticamente)
+Después se recalendariza en memoria y se reescriben sólo los archivos del
+Gantt que cambiaron, sin volver a descargar las issues.
+
+Uso (desde la raíz del repo):
+    python3 scripts/watch-import-csv.py [--once] [--poll] [--no-project]
+"""
+
+import argparse
+import csv
+import ctypes
+import ctypes.util
+import importlib
+import json
+import os
+import re
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from gh_client import (
+    PERMANENT,
+    CircuitOpenError,
+    GhError,
+    get_issue_node_ids,
+    is_stale_id_error,
+    iter_issues,
+    remove_sub_issues,
+    run_gh,
+)
+from planning import parse_issue_metadata
+
+# Los scripts con guiones no se pueden importar con `import`
+create_issues = importlib.import_module('create-issues')
+gantt = importlib.import_module('create-gantt-chart')
+project_direct = importlib.import_module('add-to-project-direct')
+
+# Colores
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+RED = '\033[0;31m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+REPO = "alex9abril/localia-admin"
+CSV_PATH = Path("docs/github-projects-import.csv")
+STATE_PATH = Path("docs/.import-csv-state.json")
+
+# Columnas que se aplican a GitHub (el resto del CSV se ignora)
+ROW_FIELDS = ['Title', 'Body', 'Labels', 'Week', 'Developer', 'Priority', 'Estimate', 'Depends On', 'Parent']
+
+DEBOUNCE_SECONDS = 1.5
+POLL_INTERVAL = 1.0
+RETRY_SECONDS = 60
+
+# inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def read_csv_rows(path=CSV_PATH):
+    """Filas válidas del CSV normalizadas e indexadas por título"""
+    rows = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            row = {field: (row.get(field) or '').strip() for field in ROW_FIELDS}
+            if row['Title'] and row['Body']:
+                rows[row['Title']] = row
+    return rows
+
+
+def split_labels(labels):
+    return {label.strip() for label in labels.split(',') if label.strip()}
+
+
+def load_state():
+    """Última versión aplicada: {'rows': {título: fila}, 'numbers': {título: número},
+    'pending': {número: [pasos]}}
+
+    Pasos: 'link' (vincular con el padre de la fila), 'project' (agregar al
+    proyecto) y 'unlink:N' (desvincular del padre anterior #N).
+    """
+    if STATE_PATH.exists():
+        return json.loads(STATE_PATH.read_text(encoding='utf-8'))
+    return None
+
+
+def save_state(state):
+    # Escritura atómica: un corte a mitad no deja el estado corrupto
+    tmp = STATE_PATH.with_suffix('.tmp')
+    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True), encoding='utf-8')
+    os.replace(tmp, STATE_PATH)
+
+
+def _without_title(row):
+    return {field: value for field, value in row.items() if field != 'Title'}
+
+
+def match_renames(applied, current, added, removed):
+    """Pares (título anterior, título nuevo) de filas renombradas
+
+    El CSV no tiene columna de número, así que una fila nueva es la renombrada
+    de una eliminada si tienen el mismo Body; si varias comparten Body deben
+    coincidir todas las columnas salvo el título. Lo ambiguo queda como alta
+    y baja.
+    """
+    def candidates(row, titles, rows):
+        found = [title for title in titles if rows[title]['Body'] == row['Body']]
+        if len(found) > 1:
+            found = [title for title in found if _without_title(rows[title]) == _without_title(row)]
+        return found
+
+    renames = []
+    for new in added:
+        old = candidates(current[new], removed, applied)
+        if len(old) == 1 and candidates(applied[old[0]], added, current) == [new]:
+            renames.append((old[0], new))
+    return renames
+
+
+def diff_rows(applied, current):
+    """Comparar dos versiones del CSV: (nuevas, modificadas, eliminadas, renombradas)
+
+    Las renombradas [(título anterior, título nuevo)] no aparecen en las demás listas.
+    """
+    added = [title for title in current if title not in applied]
+    changed = [title for title in current if title in applied and current[title] != applied[title]]
+    removed = [title for title in applied if title not in current]
+    renamed = match_renames(applied, current, added, removed)
+    added = [title for title in added if title not in {new for _, new in renamed}]
+    removed = [title for title in removed if title not in {old for old, _ in renamed}]
+    return added, changed, removed, renamed
+
+
+class CsvWatcher:
+    """Espera cambios del CSV con inotify; si no hay inotify, sondea mtime/tamaño"""
+
+    def __init__(self, path, poll=False, interval=POLL_INTERVAL):
+        self.path = Path(path)
+        self.interval = interval
+        self.fd = None
+        if not poll:
+            self.fd = self._inotify_watch()
+        self.stamp = self._stamp()
+
+    @property
+    def mode(self):
+        return 'inotify' if self.fd is not None else f'sondeo cada {self.interval:g}s'
+
+    def _inotify_watch(self):
+        # Se vigila el directorio: los editores suelen guardar con rename,
+        # lo que cambia el inode del archivo
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK)
+            if fd < 0:
+                return None
+            mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+            directory = str(self.path.parent.resolve()).encode()
+            if libc.inotify_add_watch(fd, directory, mask) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _stamp(self):
+        try:
+            stat = self.path.stat()
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _drain_events(self):
+        """Leer eventos pendientes; True si alguno es del CSV"""
+        touched = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return touched
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+                offset += length
+                if name == self.path.name:
+                    touched = True
+
+    def wait(self, timeout=None):
+        """Bloquear hasta un cambio del CSV (True) o hasta `timeout` (False)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self.fd is not None:
+                ready, _, _ = select.select([self.fd], [], [], remaining)
+                if ready and self._drain_events():
+                    return True
+            else:
+                time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+                stamp = self._stamp()
+                if stamp != self.stamp:
+                    self.stamp = stamp
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def wait_quiet(self, debounce):
+        """Debounce: esperar a que el CSV deje de cambiar durante `debounce` segundos"""
+        while self.wait(debounce):
+            pass
+
+
+class CsvSync:
+    """Aplica a GitHub las diferencias del CSV y mantiene el Gantt en memoria"""
+
+    def __init__(self, use_project=True):
+        self.use_project = use_project
+        self.project_id = None
+        self.state = load_state()
+        self.issues = {}
+
+    def bootstrap(self):
+        """Descargar las issues una sola vez: títulos -> números y metadatos del Gantt"""
+        print(f"{BLUE}📋 Obteniendo issues...{NC}")
+        for issue in iter_issues(REPO, 'number,title,body'):
+            issue['meta'] = parse_issue_metadata(issue.pop('body'))
+            self.issues[issue['number']] = issue
+        print(f"{GREEN}✅ {len(self.issues)} issues en memoria{NC}")
+
+        if self.state is None:
+            # Primera ejecución: las filas que ya tienen issue se dan por
+            # aplicadas; las que no, se crearán en la primera sincronización
+            numbers = {issue['title'].strip(): number for number, issue in self.issues.items()}
+            rows = read_csv_rows() if CSV_PATH.exists() else {}
+            self.state = {
+                'rows': {title: row for title, row in rows.items() if title in numbers},
+                'numbers': {title: numbers[title] for title in rows if title in numbers},
+                'pending': {},
+            }
+            save_state(self.state)
+            print(f"{GREEN}✅ Estado inicial: {len(self.state['rows'])} filas ya en GitHub{NC}")
+        self.state.setdefault('pending', {})
+
+    def _ensure_project(self):
+        if self.project_id is None:
+            self.project_id, _ = project_direct.get_project_id()
+        return self.project_id
+
+    def _create(self, row):
+        """Crear la issue y registrar sus pasos pendientes; devuelve el número
+
+        Vincular con el padre y agregar al proyecto no se hacen aquí: apply()
+        guarda primero el número (un fallo posterior no debe crear otra issue)
+        y después _run_pending() ejecuta los pasos.
+        """
+        success, message = create_issues.create_issue(row['Title'], create_issues.build_issue_body(row), row['Labels'], REPO)
+        if not success:
+            raise GhError(['issue', 'create'], 1, message, PERMANENT)
+        number = create_issues.issue_number_from_url(message)
+
+        if create_issues.parent_reference(row):
+            self._add_step(number, 'link')
+        if self.use_project:
+            self._add_step(number, 'project')
+        return number
+
+    def _link_parent(self, title, current):
+        """Paso 'link': True si quedó vinculada o ya no hay nada que vincular"""
+        row = self.state['rows'].get(title)
+        parent = create_issues.parent_reference(row) if row else ''
+        if not parent:
+            return True
+        links, missing = create_issues.collect_links([row], self.state['numbers'], [])
+        if missing:
+            # Si el padre está en el CSV se creará más adelante: se espera
+            if parent in current:
+                return False
+            print(f"   {YELLOW}⚠️  No se encontró el padre '{parent}' de '{title}'{NC}")
+            return True
+        # replaceParent: si la fila cambió de padre, la issue se mueve
+        if create_issues.link_sub_issues(REPO, links, replace_parent=True)[1]:
+            print(f"   {YELLOW}⚠️  No se pudo vincular '{title}' con su padre '{parent}'{NC}")
+            return False
+        return True
+
+    def _add_to_project(self, number):
+        """Paso 'project': True si la issue quedó en el proyecto"""
+        if not self._ensure_project():
+            return False
+        node_id = project_direct.get_issue_node_id(number)
+        added, error = project_direct.add_issue_to_project(self.project_id, node_id) if node_id else (False, 'sin node ID')
+        if not added:
+            print(f"   {YELLOW}⚠️  #{number} no se agregó al proyecto: {(error or '')[:100]}{NC}")
+        return added
+
+    def _unlink_parent(self, number, parent_number):
+        """Paso 'unlink:N': True si la issue ya no es sub-issue de #N"""
+        node_ids = get_issue_node_ids(REPO, [parent_number, number])
+        for refresh in (False, True):
+            if refresh:
+                # IDs de la caché que GitHub ya no reconoce: buscarlos de nuevo una vez
+                node_ids = get_issue_node_ids(REPO, [parent_number, number], refresh=True)
+            if parent_number not in node_ids or number not in node_ids:
+                # Alguna de las dos ya no existe: no queda vínculo que quitar
+                return True
+            failures = remove_sub_issues([(node_ids[parent_number], node_ids[number])])
+            if not any(is_stale_id_error(error) for _, error in failures):
+                break
+        for _, error in failures:
+            print(f"   {YELLOW}⚠️  No se pudo desvincular #{number} de #{parent_number}: {error.stderr[:100]}{NC}")
+        return not failures
+
+    def _add_step(self, number, step):
+        steps = self.state['pending'].setdefault(str(number), [])
+        if step not in steps:
+            steps.append(step)
+
+    def _run_pending(self, current):
+        """Ejecutar los pasos pendientes de las issues ya creadas; devuelve cuántas siguen pendientes
+
+        Cada paso completado se guarda de inmediato. CircuitOpenError se propaga.
+        """
+        pending = self.state['pending']
+        titles = {number: title for title, number in self.state['numbers'].items()}
+        for key in list(pending):
+            title = titles.get(int(key))
+            for step in list(pending[key]):
+                if step == 'link':
+                    done = self._link_parent(title, current)
+                elif step == 'project':
+                    done = self._add_to_project(int(key))
+                else:
+                    done = self._unlink_parent(int(key), int(step.split(':', 1)[1]))
+                if done:
+                    pending[key].remove(step)
+                    if not pending[key]:
+                        del pending[key]
+                    save_state(self.state)
+        return len(pending)
+
+    def _update(self, number, old, new):
+        """Un solo `gh issue edit` con título, body y el delta de labels
+
+        Si cambió Parent, el nuevo vínculo (o la desvinculación) queda como
+        paso pendiente.
+        """
+        cmd = ['issue', 'edit', str(number), '--repo', REPO]
+        if old['Title'] != new['Title']:
+            cmd += ['--title', new['Title']]
+        if create_issues.build_issue_body(old) != create_issues.build_issue_body(new):
+            cmd += ['--body', create_issues.build_issue_body(new)]
+        old_labels, new_labels = split_labels(old['Labels']), split_labels(new['Labels'])
+        for label in sorted(new_labels - old_labels):
+            cmd += ['--add-label', label]
+        for label in sorted(old_labels - new_labels):
+            cmd += ['--remove-label', label]
+        if len(cmd) > 5:
+            # Editar es idempotente: reintentar no duplica nada
+            run_gh(cmd)
+
+        old_parent, new_parent = create_issues.parent_reference(old), create_issues.parent_reference(new)
+        if old_parent == new_parent:
+            return
+        if new_parent:
+            self._add_step(number, 'link')
+            return
+        steps = self.state['pending'].get(str(number), [])
+        if 'link' in steps:
+            # El vínculo anterior nunca se aplicó: basta con descartarlo
+            steps.remove('link')
+            if not steps:
+                del self.state['pending'][str(number)]
+            return
+        match = re.fullmatch(r'#(\d+)', old_parent)
+        parent_number = int(match.group(1)) if match else self.state['numbers'].get(old_parent)
+        if parent_number is not None:
+            self._add_step(number, f'unlink:{parent_number}')
+
+    def _refresh_issue(self, number, row):
+        # El body que acabamos de escribir es la fuente de los metadatos
+        self.issues[number] = {
+            'number': number,
+            'title': row['Title'],
+            'meta': parse_issue_metadata(create_issues.build_issue_body(row)),
+        }
+
+    def apply(self):
+        """Aplicar una versión del CSV; devuelve cuántas filas o issues con pasos quedaron pendientes"""
+        current = read_csv_rows()
+        applied, numbers = self.state['rows'], self.state['numbers']
+        added, changed, removed, renamed = diff_rows(applied, current)
+
+        for old, new in renamed:
+            # La identidad de la fila es su número: renombrar es una modificación
+            print(f"{BLUE}🔀 Fila renombrada (#{numbers.get(old, '?')}): {old} → {new}{NC}")
+            numbers[new] = numbers.pop(old)
+            applied[new] = applied.pop(old)
+            changed.append(new)
+        for title in removed:
+            print(f"{YELLOW}⚠️  Fila eliminada del CSV (la issue #{numbers.get(title, '?')} se conserva): {title}{NC}")
+        pending = 0
+        touched = False
+        circuit_open = False
+        if added or changed:
+            print(f"{BLUE}🔄 {len(added)} filas nuevas, {len(changed)} modificadas, {len(removed)} eliminadas{NC}")
+        rows = added + changed
+        for index, title in enumerate(rows):
+            row = current[title]
+            try:
+                number = numbers.get(title)
+                if number is None:
+                    print(f"{YELLOW}📝 Creando: {title}{NC}")
+                    number = self._create(row)
+                    numbers[title] = number
+                else:
+                    print(f"{YELLOW}✏️  Actualizando #{number}: {title}{NC}")
+                    self._update(number, applied.get(title, row), row)
+            except CircuitOpenError as e:
+                print(f"{RED}❌ {e}. Se reintentará más tarde.{NC}")
+                # Esta fila y las que faltan; las anteriores ya se aplicaron o ya se contaron
+                pending += len(rows) - index
+                circuit_open = True
+                break
+            except GhError as e:
+                print(f"{RED}❌ Error en '{title}': {str(e.stderr or e)[:100]}{NC}")
+                pending += 1
+                continue
+
+            applied[title] = row
+            self._refresh_issue(number, row)
+            touched = True
+            # Guardar tras cada fila: un fallo posterior no repite lo ya aplicado
+            save_state(self.state)
+
+        if touched:
+            self.regenerate_gantt()
+
+        if circuit_open:
+            return pending + len(self.state['pending'])
+        # Vínculos y altas en el proyecto de issues ya creadas (de esta u otras corridas)
+        try:
+            pending += self._run_pending(current)
+        except CircuitOpenError as e:
+            print(f"{RED}❌ {e}. Se reintentará más tarde.{NC}")
+            pending += len(self.state['pending'])
+        return pending
+
+    def regenerate_gantt(self):
+        issues_by_week_dev = gantt.group_issues_by_week_dev(self.issues.values())
+        schedule = gantt.build_schedule(issues_by_week_dev)
+        written = gantt.write_gantt_outputs(issues_by_week_dev, schedule)
+        if written:
+            print(f"{GREEN}📊 Gantt actualizado: {', '.join(str(path) for path in written)}{NC}")
+        else:
+            print(f"{GREEN}📊 Gantt sin cambios{NC}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sincronizar continuamente el CSV de importación con GitHub")
+    parser.add_argument('--once', action='store_true', help="Aplicar los cambios pendientes y salir")
+    parser.add_argument('--poll', action='store_true', help="Sondear el archivo en lugar de usar inotify")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help="Segundos entre sondeos")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS, help="Segundos sin cambios antes de aplicar")
+    parser.add_argument('--no-project', action='store_true', help="No agregar las issues nuevas al proyecto")
+    args = parser.parse_args()
+
+    print(f"{GREEN}🚀 Modo watch: {CSV_PATH}{NC}\n")
+
+    if not CSV_PATH.exists():
+        print(f"{RED}❌ No se encontró el archivo: {CSV_PATH}{NC}")
+        sys.exit(1)
+
+    sync = CsvSync(use_project=not args.no_project)
+    try:
+        sync.bootstrap()
+    except GhError as e:
+        print(f"{RED}❌ Error obteniendo issues: {e}{NC}")
+        sys.exit(1)
+
+    pending = sync.apply()
+    if args.once:
+        sys.exit(1 if pending else 0)
+
+    watcher = CsvWatcher(CSV_PATH, poll=args.poll, interval=args.interval)
+    print(f"\n{BLUE}👀 Esperando cambios ({watcher.mode}); Ctrl+C para salir{NC}\n")
+    try:
+        while True:
+            # Con filas pendientes se reintenta aunque el CSV no cambie
+            if not watcher.wait(RETRY_SECONDS if pending else None) and not pending:
+                continue
+            watcher.wait_quiet(args.debounce)
+            if not CSV_PATH.exists():
+                # Guardado con rename: el archivo reaparece en el siguiente evento
+                continue
+            try:
+                pending = sync.apply()
+            except (OSError, csv.Error) as e:
+                print(f"{RED}❌ No se pudo leer el CSV: {e}{NC}")
+    except KeyboardInterrupt:
+        print(f"\n{GREEN}👋 Modo watch detenido{NC}")
+
+
+if __name__ == "__main__":
+    main()